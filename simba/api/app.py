@@ -1,5 +1,6 @@
 """FastAPI application."""
 
+import asyncio
 import logging
 from contextlib import asynccontextmanager
 
@@ -17,8 +18,10 @@ from simba.api.routes import (
     metrics,
     organizations,
 )
+from simba.core import thread_budget
 from simba.core.config import settings
 from simba.models import init_db
+from simba.services import warmup_service
 from simba.services.chat_service import shutdown_checkpointer
 
 # Configure logging for application modules
@@ -42,8 +45,17 @@ async def lifespan(app: FastAPI):
         settings.parser_backend,
     )
     init_db()
+    thread_budget.check_thread_budget()
+    # Warm models in the background so liveness stays up; readiness waits for it
+    warmup_task = None
+    if settings.warmup_on_startup:
+        warmup_task = asyncio.create_task(asyncio.to_thread(warmup_service.warmup))
+    else:
+        warmup_service.mark_ready()
     yield
     # Shutdown
+    if warmup_task is not None and not warmup_task.done():
+        warmup_task.cancel()
     await shutdown_checkpointer()
 
 
@@ -98,4 +110,9 @@ def create_app() -> FastAPI:
     return app
 
 
+# With gunicorn --preload this runs once in the master before workers fork,
+# so workers share the loaded models copy-on-write
+if settings.preload_models:
+    warmup_service.preload_models()
+
 app = create_app()
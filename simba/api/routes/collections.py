@@ -1,6 +1,8 @@
 """Collection management routes."""
 
+from dataclasses import asdict
 from datetime import datetime
+from typing import Any
 from uuid import uuid4
 
 from fastapi import APIRouter, Depends, HTTPException, Query
@@ -9,7 +11,13 @@ from sqlalchemy.orm import Session
 
 from simba.api.middleware.auth import OrganizationContext, get_current_org
 from simba.models import Collection, Document, get_db
-from simba.services import qdrant_service, storage_service
+from simba.services import (
+    answer_cache_service,
+    profile_service,
+    routing_service,
+    storage_service,
+    vector_store_service,
+)
 
 router = APIRouter(prefix="/collections")
 
@@ -39,6 +47,31 @@ class CollectionListResponse(BaseModel):
     total: int
 
 
+class ProfileUpdate(BaseModel):
+    """Profile fields to override; null resets a field to the global setting."""
+
+    chunking_mode: str | None = None
+    chunk_size: int | None = None
+    chunk_overlap: int | None = None
+    sparse_backend: str | None = None
+    quantization: str | None = None
+    retrieval_limit: int | None = None
+    retrieval_min_score: float | None = None
+    retrieval_rerank: bool | None = None
+    retrieval_hybrid: bool | None = None
+    rerank_candidates: int | None = None
+    rerank_group_size: int | None = None
+    rerank_mode: str | None = None
+    cascade_candidates: int | None = None
+    answer_cache_ttl_seconds: float | None = None
+
+
+class ProfileResponse(BaseModel):
+    collection_id: str
+    overrides: dict[str, Any]  # Fields set on the collection
+    effective: dict[str, Any]  # Overrides applied over the global settings
+
+
 def get_qdrant_collection_name(org_id: str, collection_name: str) -> str:
     """Generate Qdrant collection name with org namespace."""
     return f"{org_id}_{collection_name}"
@@ -113,7 +146,7 @@ async def create_collection(
 
     # Create corresponding Qdrant collection with org namespace
     qdrant_collection_name = get_qdrant_collection_name(org.organization_id, data.name)
-    qdrant_service.create_collection(qdrant_collection_name)
+    vector_store_service.create_collection(qdrant_collection_name)
 
     return CollectionResponse(
         id=collection.id,
@@ -182,9 +215,16 @@ async def delete_collection(
     # Delete Qdrant collection with org namespace
     try:
         qdrant_collection_name = get_qdrant_collection_name(org.organization_id, collection.name)
-        qdrant_service.delete_collection(qdrant_collection_name)
+        vector_store_service.delete_collection(qdrant_collection_name)
+        for companion in (
+            routing_service.summary_collection_name(qdrant_collection_name),
+            answer_cache_service.answer_collection_name(qdrant_collection_name),
+        ):
+            if vector_store_service.collection_exists(companion):
+                vector_store_service.delete_collection(companion)
     except Exception:
         pass
+    profile_service.invalidate(get_qdrant_collection_name(org.organization_id, collection.name))
 
     # Delete from database (cascade will delete documents)
     db.delete(collection)
@@ -193,6 +233,72 @@ async def delete_collection(
     return {"deleted": True, "id": collection_id}
 
 
+def _profile_response(collection: Collection) -> ProfileResponse:
+    overrides = collection.profile
+    return ProfileResponse(
+        collection_id=collection.id,
+        overrides={
+            name: getattr(overrides, name)
+            for name in profile_service.PROFILE_FIELDS
+            if overrides is not None and getattr(overrides, name) is not None
+        },
+        effective=asdict(profile_service.resolve(overrides)),
+    )
+
+
+@router.get("/{collection_id}/profile", response_model=ProfileResponse)
+async def get_collection_profile(
+    collection_id: str,
+    db: Session = Depends(get_db),
+    org: OrganizationContext = Depends(get_current_org),
+):
+    """Get a collection's chunking and retrieval profile."""
+    collection = (
+        db.query(Collection)
+        .filter(
+            Collection.id == collection_id,
+            Collection.organization_id == org.organization_id,
+        )
+        .first()
+    )
+    if not collection:
+        raise HTTPException(status_code=404, detail="Collection not found")
+
+    return _profile_response(collection)
+
+
+@router.patch("/{collection_id}/profile", response_model=ProfileResponse)
+async def update_collection_profile(
+    collection_id: str,
+    data: ProfileUpdate,
+    db: Session = Depends(get_db),
+    org: OrganizationContext = Depends(get_current_org),
+):
+    """Override chunking and retrieval settings for one collection.
+
+    Only fields present in the request are changed. Chunking changes apply to
+    documents ingested afterwards.
+    """
+    collection = (
+        db.query(Collection)
+        .filter(
+            Collection.id == collection_id,
+            Collection.organization_id == org.organization_id,
+        )
+        .first()
+    )
+    if not collection:
+        raise HTTPException(status_code=404, detail="Collection not found")
+
+    try:
+        profile_service.update_profile(db, collection, data.model_dump(exclude_unset=True))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e)) from e
+
+    db.refresh(collection)
+    return _profile_response(collection)
+
+
 @router.get("/{collection_id}/stats")
 async def get_collection_stats(
     collection_id: str,
@@ -233,8 +339,8 @@ async def get_collection_stats(
     qdrant_info = None
     try:
         qdrant_collection_name = get_qdrant_collection_name(org.organization_id, collection.name)
-        if qdrant_service.collection_exists(qdrant_collection_name):
-            qdrant_info = qdrant_service.get_collection_info(qdrant_collection_name)
+        if vector_store_service.collection_exists(qdrant_collection_name):
+            qdrant_info = vector_store_service.get_collection_info(qdrant_collection_name)
     except Exception:
         pass
 
@@ -37,6 +37,8 @@ class MessageRequest(BaseModel):
     content: str
     conversation_id: str | None = None
     collection: str | None = None
+    # Several collections searched together (combined with `collection` if both are set)
+    collections: list[str] | None = None
 
 
 class SourceReference(BaseModel):
@@ -81,6 +83,17 @@ def extract_conversation_id(org_prefixed_id: str, org_id: str) -> str | None:
     return None
 
 
+def get_org_collections(org_id: str, request: MessageRequest) -> str | list[str] | None:
+    """Resolve the request's collection(s) to org-namespaced collection names for RAG."""
+    names = [request.collection] if request.collection else []
+    names += [name for name in request.collections or [] if name not in names]
+    if not names:
+        return None
+    if len(names) == 1:
+        return f"{org_id}_{names[0]}"
+    return [f"{org_id}_{name}" for name in names]
+
+
 # --- Routes ---
 
 
@@ -130,10 +143,8 @@ async def chat(
     # Use org-prefixed thread ID for storage
     thread_id = get_org_prefixed_thread_id(org.organization_id, conversation_id)
 
-    # Use org-namespaced collection name for RAG
-    collection = None
-    if request.collection:
-        collection = f"{org.organization_id}_{request.collection}"
+    # Use org-namespaced collection name(s) for RAG
+    collection = get_org_collections(org.organization_id, request)
 
     response_content = await chat_service(
         message=request.content,
@@ -161,10 +172,8 @@ async def chat_stream(
     # Use org-prefixed thread ID for storage
     thread_id = get_org_prefixed_thread_id(org.organization_id, conversation_id)
 
-    # Use org-namespaced collection name for RAG
-    collection = None
-    if request.collection:
-        collection = f"{org.organization_id}_{request.collection}"
+    # Use org-namespaced collection name(s) for RAG
+    collection = get_org_collections(org.organization_id, request)
 
     return StreamingResponse(
         chat_stream_service(
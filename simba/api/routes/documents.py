@@ -10,7 +10,12 @@ from sqlalchemy.orm import Session
 from simba.api.middleware.auth import OrganizationContext, get_current_org
 from simba.api.routes.collections import get_qdrant_collection_name
 from simba.models import Collection, Document, get_db
-from simba.services import ingestion_service, parser_service, qdrant_service, storage_service
+from simba.services import (
+    ingestion_service,
+    parser_service,
+    storage_service,
+    vector_store_service,
+)
 from simba.tasks import process_document
 
 router = APIRouter(prefix="/documents")
@@ -363,7 +368,7 @@ async def get_document_chunks(
     qdrant_collection_name = get_qdrant_collection_name(
         org.organization_id, document.collection.name
     )
-    chunks = qdrant_service.get_document_chunks(qdrant_collection_name, document_id)
+    chunks = vector_store_service.get_document_chunks(qdrant_collection_name, document_id)
 
     return {
         "document_id": document_id,
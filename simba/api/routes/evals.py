@@ -12,7 +12,7 @@ from sqlalchemy.orm import Session
 
 from simba.core.config import settings
 from simba.models import EvalItem, get_db
-from simba.services import qdrant_service, retrieval_service
+from simba.services import retrieval_service, vector_store_service
 
 logger = logging.getLogger(__name__)
 
@@ -254,31 +254,26 @@ async def generate_questions(
     try:
         from qdrant_client.http.exceptions import UnexpectedResponse
 
-        client = qdrant_service.get_qdrant_client()
+        from simba.services.numpy_store_service import CollectionNotFoundError
 
         try:
-            results, _ = client.scroll(
-                collection_name=data.collection_name,
-                limit=50,
-                with_payload=True,
-                with_vectors=False,
-            )
-        except UnexpectedResponse:
+            results = vector_store_service.sample_chunks(data.collection_name, limit=50)
+        except (UnexpectedResponse, CollectionNotFoundError):
             return GenerateQuestionsResponse(questions=[])
 
         if not results:
             return GenerateQuestionsResponse(questions=[])
 
         doc_chunks: dict[str, list[dict]] = {}
-        for point in results:
-            doc_name = point.payload.get("document_name", "unknown")
-            chunk_text = point.payload.get("chunk_text", "")
+        for payload in results:
+            doc_name = payload.get("document_name", "unknown")
+            chunk_text = payload.get("chunk_text", "")
             if doc_name not in doc_chunks:
                 doc_chunks[doc_name] = []
             doc_chunks[doc_name].append(
                 {
                     "text": chunk_text,
-                    "position": point.payload.get("chunk_position", 0),
+                    "position": payload.get("chunk_position", 0),
                 }
             )
 
@@ -1,6 +1,9 @@
 """Health check routes."""
 
 from fastapi import APIRouter
+from fastapi.responses import JSONResponse
+
+from simba.services import warmup_service
 
 router = APIRouter()
 
@@ -13,12 +16,21 @@ async def health_check():
 
 @router.get("/health/ready")
 async def readiness_check():
-    """Readiness check - verify all dependencies are available."""
+    """Readiness check - verify all dependencies are available.
+
+    Returns 503 until model warmup has completed in this process, so load
+    balancers don't route traffic to a cold worker.
+    """
     # TODO: Add actual checks for DB, vector store, etc.
-    return {
-        "ready": True,
-        "checks": {
-            "database": True,
-            "vector_store": True,
+    models_ready = warmup_service.is_ready()
+    return JSONResponse(
+        status_code=200 if models_ready else 503,
+        content={
+            "ready": models_ready,
+            "checks": {
+                "database": True,
+                "vector_store": True,
+                "models": models_ready,
+            },
         },
-    }
+    )
@@ -50,6 +50,14 @@ def main():
     server_parser.add_argument("--port", type=int, default=8000, help="Port to bind to")
     server_parser.add_argument("--reload", action="store_true", help="Enable auto-reload")
 
+    # Inference server command
+    inference_parser = subparsers.add_parser(
+        "inference", help="Run the local inference server shared by API and workers"
+    )
+    inference_parser.add_argument(
+        "--socket", default=None, help="Unix socket path (defaults to INFERENCE_SOCKET_PATH)"
+    )
+
     # Orgs command
     orgs_parser = subparsers.add_parser("orgs", help="Manage organizations")
     orgs_subparsers = orgs_parser.add_subparsers(dest="orgs_command", help="Organization commands")
@@ -64,6 +72,10 @@ def main():
             port=args.port,
             reload=args.reload,
         )
+    elif args.command == "inference":
+        from simba.services import inference_server
+
+        inference_server.main(args.socket)
     elif args.command == "orgs":
         if args.orgs_command == "list":
             list_organizations()
@@ -3,6 +3,7 @@
 import ssl
 
 from celery import Celery
+from celery.signals import worker_init, worker_process_init
 
 from simba.core.config import settings
 
@@ -52,3 +53,34 @@ celery_app.conf.update(
     broker_use_ssl=ssl_config,
     redis_backend_use_ssl=ssl_config,
 )
+
+
+@worker_init.connect
+def _preload_models(**kwargs) -> None:
+    """Load models in the main worker process before the prefork pool starts.
+
+    Pool children are forked afterwards and share the weights copy-on-write.
+    """
+    from simba.core import thread_budget
+
+    if settings.process_role == "api":
+        settings.process_role = "worker"
+    thread_budget.check_thread_budget()
+
+    if settings.preload_models:
+        from simba.services import warmup_service
+
+        warmup_service.preload_models()
+
+
+@worker_process_init.connect
+def _warmup_models(**kwargs) -> None:
+    """Run warmup inference in each pool child after fork.
+
+    Only done when models were preloaded: loading them here could exceed the
+    pool's child startup timeout (worker_proc_alive_timeout).
+    """
+    if settings.preload_models and settings.warmup_on_startup:
+        from simba.services import warmup_service
+
+        warmup_service.warmup()
@@ -3,13 +3,20 @@
 from functools import lru_cache
 
 from dotenv import load_dotenv
-from pydantic import AliasChoices, Field
+from pydantic import AliasChoices, BaseModel, Field
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 # Load .env into actual environment variables (required for init_chat_model)
 load_dotenv()
 
 
+class ThreadBudget(BaseModel):
+    """ONNX/torch thread pool sizes for one model (0 = library default: all cores)."""
+
+    intra_op: int = 0
+    inter_op: int = 0
+
+
 class Settings(BaseSettings):
     """Application settings loaded from environment variables."""
 
@@ -43,6 +50,18 @@ class Settings(BaseSettings):
     llm_reasoning_effort: str | None = None
     # Anthropic thinking budget (only used when provider is anthropic and reasoning is enabled)
     llm_thinking_budget: int = 10000
+    # Compiled chat agents kept per (llm_model, system prompt version)
+    chat_agent_cache_size: int = 8
+    # Speculative retrieval: chat_stream starts retrieval on the raw message when the
+    # request arrives; the rag tool reuses it if its query embedding reaches this
+    # cosine similarity to the message's, overlapping retrieval with the LLM round trip.
+    # Off by default: a message the LLM answers without searching still pays for a
+    # full retrieval. At most chat_speculative_workers run at once (further messages
+    # aren't speculated on), and only for messages of chat_speculative_min_words words
+    chat_speculative_retrieval: bool = False
+    chat_speculative_min_similarity: float = 0.85
+    chat_speculative_workers: int = 4
+    chat_speculative_min_words: int = 4
 
     # Embedding (FastEmbed - local, free, fast)
     embedding_model: str = "sentence-transformers/all-MiniLM-L6-v2"
@@ -53,18 +72,178 @@ class Settings(BaseSettings):
     retrieval_limit: int = 8
     retrieval_rerank: bool = True
     retrieval_hybrid: bool = (
-        False  # Disabled: SPLADE model is English-only, corrupts French queries
+        False  # Disabled: SPLADE model is English-only, corrupts French queries (or use bm25)
     )
     retrieval_sparse_model: str = "prithvida/Splade_PP_en_v1"
+    # Sparse leg of hybrid search: "splade" (retrieval_sparse_model, English-only)
+    # or "bm25" (local, language-agnostic, IDF maintained per collection by Qdrant)
+    retrieval_sparse_backend: str = "splade"
+    retrieval_bm25_k1: float = 1.2  # Term-frequency saturation (no length normalization, b=0)
+    # Query-language routing: detect the query language and only run the sparse leg
+    # for languages the sparse model supports (all for bm25), restricting its
+    # prefetch to chunks tagged with the same language at ingestion
+    retrieval_language_routing: bool = True
+    retrieval_sparse_languages: list[str] = ["en"]  # Languages supported by SPLADE
+    # Exact-identifier fast path: order numbers, SKUs and error codes in the query are
+    # looked up in the chunk_text full-text index; verbatim hits rank first and skip
+    # reranking, and identifier-only queries skip vector search entirely
+    retrieval_identifier_lookup: bool = True
+    # Federated retrieval: searches over several collections run concurrently
+    retrieval_federated_max_workers: int = 8
+    # Neighbors fetched on each side of a small search unit (see chunking_mode)
+    retrieval_expand_neighbors: int = 1
+    # Document routing for large collections: each document's mean chunk embedding is
+    # stored in a companion collection at ingestion; collections with at least
+    # retrieval_routing_min_documents documents are then only searched within the
+    # retrieval_routing_documents documents closest to the query
+    retrieval_document_routing: bool = True
+    retrieval_routing_min_documents: int = 2000
+    retrieval_routing_documents: int = 50
+    # Search hits passed to the reranker (0 = 4 x the result limit)
+    retrieval_rerank_candidates: int = 0
+    # Rerank stage: "cross_encoder"; "late_interaction" (ColBERT-style MaxSim over
+    # per-token vectors stored at ingestion, scored by the vector store); or "cascade"
+    # (MaxSim narrows the candidates to retrieval_cascade_candidates for the
+    # cross-encoder). Token vectors are only stored for collections whose rerank mode
+    # needs them; use simba.scripts.migrate_sparse --late-interaction to backfill.
+    retrieval_rerank_mode: str = "cross_encoder"
+    retrieval_cascade_candidates: int = 10
+    retrieval_late_interaction_model: str = "answerdotai/answerai-colbert-small-v1"
+    retrieval_late_interaction_dimensions: int = 96
+    # Cap on rerank candidates from one document (Qdrant grouped query on document_id),
+    # so a long document can't fill the pool with near-identical chunks (0 = no cap)
+    retrieval_rerank_group_size: int = 0
+
+    # Collection profiles: per-collection overrides of the chunking, sparse backend,
+    # quantization, retrieval and answer cache settings, stored in collection_profiles
+    # and cached per process for this long
+    collection_profile_ttl_seconds: float = 30.0
+    answer_cache_ttl_seconds: float = 86400.0  # How long a cached answer may be served
+
+    # Semantic answer cache: final answers (and their sources) of first messages in new
+    # conversations, stored under the message's embedding in a companion collection per
+    # chat collection ("{collection}__answers"). A new conversation whose first message
+    # reaches answer_cache_threshold cosine similarity to a cached one is answered from
+    # the cache. Entries citing a document are dropped when it is re-ingested or deleted.
+    # Off by default: answers are shared between users of a collection. Messages with
+    # identifiers (order numbers, SKUs) are never cached, since "order 48213" and
+    # "order 48214" embed almost alike.
+    answer_cache_enabled: bool = False
+    answer_cache_threshold: float = 0.95
+    answer_cache_max_entries: int = 1000  # Per collection; the oldest entries are evicted
+
+    # Context assembly: overlapping chunks of a document are merged and the result is
+    # packed into this many LLM input tokens (0 = no limit)
+    context_token_budget: int = 3000
+    context_tokenizer: str | None = None  # tiktoken encoding; None picks llm_model's
+
+    # Request coalescing: identical concurrent retrievals share one computation
+    retrieval_coalesce: bool = True
+    # Optional Redis URL to also coalesce across processes (e.g. uvicorn workers)
+    retrieval_coalesce_redis_url: str | None = None
+    retrieval_coalesce_lock_ttl_ms: int = 5000  # Max time a leader may hold the lock
+    retrieval_coalesce_result_ttl_ms: int = 2000  # How long a shared result stays readable
 
     # Reranker settings
     reranker_model: str = "cross-encoder/ms-marco-MiniLM-L-6-v2"
     reranker_top_k: int = 5
 
+    # Local inference server (optional sidecar owning embedding/sparse/reranker models)
+    # When set, API and Celery processes send inference requests over this Unix socket
+    # instead of loading their own model copies, and fall back to in-process models
+    # if the server is unreachable.
+    inference_socket_path: str | None = None
+    inference_batch_wait_ms: float = 2.0  # How long the server waits to fill a batch
+    inference_max_batch_size: int = 64  # Max texts (or pairs) per batched model call
+    inference_timeout_s: float = 30.0
+    inference_retry_interval_s: float = 5.0  # Back-off before retrying an unreachable server
+
+    # Model preloading and warmup
+    # preload_models: load models at import time in the parent process so forked
+    # workers share them copy-on-write (gunicorn --preload, Celery worker_init)
+    preload_models: bool = False
+    # Run one inference per model at startup; /health/ready is 503 until it completes
+    warmup_on_startup: bool = True
+
+    # Thread budgets per process role and model, to avoid oversubscribing cores
+    # when several API workers, Celery children and models share one host.
+    # Roles: "api", "worker", "inference".
+    # Models: "embedding", "sparse", "reranker", "late_interaction".
+    # e.g. THREAD_BUDGETS='{"api": {"embedding": {"intra_op": 1}, "reranker": {"intra_op": 2}}}'
+    thread_budgets: dict[str, dict[str, ThreadBudget]] = {}
+    process_role: str = "api"  # Set by the Celery worker and inference server entrypoints
+    # Processes per role on this host, used to check the total against available cores
+    api_processes: int = 1
+    worker_processes: int = 1
+
+    # Ingestion embedding: documents with at least ingestion_parallel_threshold chunks
+    # are embedded with FastEmbed data-parallel workers (one single-threaded ONNX
+    # session per worker). parallel=0 uses one worker per available core. Daemonic
+    # processes (Celery prefork pool children) can't start the workers and always
+    # embed serially; use a threads or solo pool (celery worker -P threads) instead.
+    ingestion_parallel_threshold: int = 1000  # 0 disables data-parallel embedding
+    ingestion_embed_batch_size: int = 256
+    ingestion_embed_parallel: int = 0
+    ingestion_sparse_batch_size: int = 32  # SPLADE is heavier per text than the dense model
+    ingestion_sparse_parallel: int = 0
+    ingestion_late_interaction_batch_size: int = 32
+    ingestion_late_interaction_parallel: int = 0
+
+    # Chunking
+    # "standard": chunk_size/chunk_overlap chunks are both searched and returned.
+    # "small_to_big": small units (chunk_small_size) are embedded, searched and
+    #   reranked; each hit is then expanded with retrieval_expand_neighbors units on
+    #   each side of the same document, so the LLM still gets coherent passages.
+    chunking_mode: str = "standard"
+    chunk_size: int = 1000
+    chunk_overlap: int = 200
+    chunk_small_size: int = 300
+    chunk_small_overlap: int = 0
+    # Chunks are also capped at the embedding model's input length in tokens, counted
+    # with its tokenizer (all-MiniLM-L6-v2 truncates after 256, incl. special tokens)
+    chunk_max_tokens: int = 256  # 0 = no token limit
+    # Follow the markdown structure of parser output: chunks don't cross headings,
+    # tables and code blocks are only split between rows, and each chunk's payload
+    # has its heading path ("heading_path", keyword-indexed for filtering)
+    chunk_markdown: bool = True
+
+    # Duplicate removal at ingestion: header/footer lines repeated at least
+    # ingestion_boilerplate_min_repeats times are stripped from parsed text, and chunks
+    # whose MinHash similarity to a chunk already in the collection (or earlier in the
+    # document) reaches ingestion_dedup_threshold are not embedded or stored. A shared
+    # chunk is kept under the first document that had it and passes to the next one
+    # when that document is deleted.
+    ingestion_strip_boilerplate: bool = True
+    ingestion_boilerplate_min_repeats: int = 3
+    ingestion_dedup: bool = True
+    ingestion_dedup_threshold: float = 0.85  # Estimated Jaccard similarity of word shingles
+
+    # Vector store backend
+    # "qdrant": all collections in Qdrant.
+    # "numpy": all collections in the in-process NumPy store (no Qdrant needed; for
+    #   tests, local benchmarks and small single-host deployments).
+    # "auto": Qdrant is the source of truth; collections with at most
+    #   vector_store_auto_max_points points are mirrored to the NumPy store on write
+    #   and searched in-process. API and worker processes must share vector_store_path.
+    vector_store_backend: str = "qdrant"
+    vector_store_path: str = "./data/vector_store"
+    vector_store_auto_max_points: int = 5000
+
     # Qdrant
     qdrant_host: str = "localhost"
     qdrant_port: int = 6333
     qdrant_api_key: str | None = None
+    # gRPC sends vectors as packed floats instead of JSON (faster bulk upserts)
+    qdrant_prefer_grpc: bool = False
+    qdrant_grpc_port: int = 6334
+    qdrant_upsert_batch_size: int = 256
+    # HNSW index defaults for new collections. Per-collection values (set by
+    # simba.evaluation.tune_hnsw) live in the collection's Qdrant config and metadata.
+    qdrant_hnsw_m: int = 16
+    qdrant_hnsw_ef_construct: int = 100
+    qdrant_hnsw_ef: int | None = None  # Search-time ef; None uses Qdrant's default
+    qdrant_search_params_ttl_seconds: float = 60.0  # Cache of per-collection search params
+    qdrant_quantization: str | None = None  # Default for new collections: "scalar" or "binary"
 
     # MinIO (S3-compatible storage)
     minio_endpoint: str = "localhost:9000"
@@ -0,0 +1,106 @@
+"""Thread budgeting for co-located inference models.
+
+FastEmbed (ONNX Runtime) and sentence-transformers (torch) size their thread
+pools to all cores by default. With several API workers, Celery children and
+models on one host that oversubscribes the CPU and shows up as tail-latency
+spikes. Budgets come from settings.thread_budgets, keyed by process role and
+model; check_thread_budget() warns when the host-wide total exceeds the cores.
+"""
+
+import logging
+import os
+
+from simba.core.config import ThreadBudget, settings
+
+logger = logging.getLogger(__name__)
+
+MODELS = ("embedding", "sparse", "reranker", "late_interaction")
+
+
+def available_cores() -> int:
+    """Number of cores this process may run on (respects CPU affinity)."""
+    try:
+        return len(os.sched_getaffinity(0))
+    except AttributeError:
+        return os.cpu_count() or 1
+
+
+def get_budget(model: str, role: str | None = None) -> ThreadBudget:
+    """Get the thread budget of a model for a process role.
+
+    Args:
+        model: "embedding", "sparse", "reranker" or "late_interaction".
+        role: Process role. Defaults to settings.process_role.
+
+    Returns:
+        The configured budget, or the library defaults (0) when unset.
+    """
+    role = role or settings.process_role
+    return settings.thread_budgets.get(role, {}).get(model, ThreadBudget())
+
+
+def onnx_threads(model: str) -> int | None:
+    """FastEmbed `threads` argument for a model (None = library default)."""
+    return get_budget(model).intra_op or None
+
+
+def apply_torch_budget(model: str) -> None:
+    """Apply a model's budget to torch's process-wide thread pools.
+
+    Must run before the first torch inference: the inter-op pool can only be
+    sized once per process.
+    """
+    budget = get_budget(model)
+    if not budget.intra_op and not budget.inter_op:
+        return
+
+    import torch
+
+    if budget.intra_op:
+        torch.set_num_threads(budget.intra_op)
+    if budget.inter_op:
+        try:
+            torch.set_num_interop_threads(budget.inter_op)
+        except RuntimeError as e:
+            logger.warning(f"Could not set torch inter-op threads for {model}: {e}")
+
+
+def _role_processes() -> dict[str, int]:
+    """Processes per role expected on this host."""
+    counts = {"api": settings.api_processes, "worker": settings.worker_processes}
+    if settings.inference_socket_path:
+        counts["inference"] = 1
+    return counts
+
+
+def total_threads() -> int:
+    """Worst-case number of busy compute threads across all processes on the host.
+
+    Each model in each process counts its intra-op threads plus inter-op
+    threads beyond the first; unset budgets count as all cores.
+    """
+    cores = available_cores()
+    total = 0
+    for role, processes in _role_processes().items():
+        # Models served by the inference server don't run in API/worker processes
+        if role != "inference" and settings.inference_socket_path:
+            continue
+        for model in MODELS:
+            budget = get_budget(model, role)
+            threads = (budget.intra_op or cores) + max((budget.inter_op or 1) - 1, 0)
+            total += threads * processes
+    return total
+
+
+def check_thread_budget() -> None:
+    """Warn at startup when thread budgets oversubscribe the available cores."""
+    cores = available_cores()
+    total = total_threads()
+    if total > cores:
+        logger.warning(
+            f"Thread budget oversubscribed: up to {total} inference threads across "
+            f"processes {_role_processes()} on {cores} cores. "
+            "Set THREAD_BUDGETS (see simba.scripts.benchmark_threads) to avoid p99 spikes."
+        )
+    else:
+        logger.info(f"Thread budget: up to {total} inference threads on {cores} cores")
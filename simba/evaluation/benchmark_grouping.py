@@ -0,0 +1,181 @@
+"""Benchmark grouped rerank pools against plain top-k pools.
+
+A plain top-k pool for a long document is often filled with near-identical
+chunks of that one document, so the reranker spends its budget on them and
+other relevant documents never reach it. A grouped pool (Qdrant's grouped
+query on document_id) keeps at most group_size chunks per document.
+
+For every combination of candidate count and group size (0 = no grouping)
+the test queries are searched, the pool is reranked down to --limit chunks,
+and the following are reported:
+
+- pool recall: expected documents present in the pool;
+- Recall@K and MRR of the reranked documents;
+- rerank latency.
+
+The best combination is the smallest candidate count whose Recall@K matches
+the ungrouped pool at the largest candidate count. Set it per collection
+with PATCH /collections/{id}/profile (rerank_candidates, rerank_group_size).
+
+Usage:
+    uv run python -m simba.evaluation.benchmark_grouping --test-file test_queries.json --collection default
+    uv run python -m simba.evaluation.benchmark_grouping --test-file test_queries.json \\
+        --collection default --candidates 40 20 10 --group-sizes 0 1 2
+"""
+
+import argparse
+import json
+import time
+from pathlib import Path
+
+import numpy as np
+
+from simba.evaluation.evaluate import recall_at_k, reciprocal_rank
+from simba.services import embedding_service, vector_store_service
+from simba.services.retrieval_service import RetrievedChunk
+
+
+def _document_ids(chunks: list[RetrievedChunk]) -> list[str]:
+    """Document IDs of chunks in rank order, without repeats."""
+    return list(dict.fromkeys(chunk.document_id for chunk in chunks))
+
+
+def _pool(
+    collection_name: str, vector: np.ndarray, candidates: int, group_size: int
+) -> list[RetrievedChunk]:
+    """Search one rerank pool."""
+    results = vector_store_service.search(
+        collection_name, vector, limit=candidates, group_size=group_size or None
+    )
+    return [
+        RetrievedChunk(
+            document_id=result["payload"].get("document_id", ""),
+            document_name=result["payload"].get("document_name", ""),
+            chunk_text=result["payload"].get("chunk_text", ""),
+            chunk_position=result["payload"].get("chunk_position", 0),
+            score=result["score"],
+            collection_name=collection_name,
+        )
+        for result in results
+    ]
+
+
+def benchmark(
+    collection_name: str,
+    test_cases: list[dict],
+    candidates: list[int],
+    group_sizes: list[int],
+    limit: int = 5,
+) -> list[dict]:
+    """Measure recall and rerank latency per (candidates, group size) combination.
+
+    Args:
+        collection_name: Name of the collection.
+        test_cases: Items with "query" and "expected_doc_ids".
+        candidates: Rerank pool sizes to try.
+        group_sizes: Max chunks per document in the pool (0 = no grouping).
+        limit: Chunks kept after reranking (K for Recall@K).
+
+    Returns:
+        One dict of averaged metrics per combination.
+    """
+    from simba.services.reranker_service import rerank_chunks
+
+    queries = [case["query"] for case in test_cases]
+    vectors = embedding_service.get_embeddings(queries)
+
+    rows = []
+    for group_size in group_sizes:
+        for pool_size in candidates:
+            pool_recalls, recalls, rrs, pool_docs, latencies = [], [], [], [], []
+            for query, vector, case in zip(queries, vectors, test_cases):
+                expected = case["expected_doc_ids"]
+                pool = _pool(collection_name, vector, pool_size, group_size)
+                pool_ids = _document_ids(pool)
+
+                start = time.perf_counter()
+                reranked = rerank_chunks(query, pool, top_k=limit) if pool else []
+                latencies.append((time.perf_counter() - start) * 1000)
+
+                retrieved = _document_ids(reranked)
+                pool_recalls.append(recall_at_k(expected, pool_ids))
+                recalls.append(recall_at_k(expected, retrieved))
+                rrs.append(reciprocal_rank(expected, retrieved))
+                pool_docs.append(len(pool_ids))
+
+            rows.append(
+                {
+                    "group_size": group_size,
+                    "candidates": pool_size,
+                    "pool_documents": float(np.mean(pool_docs)),
+                    "pool_recall": float(np.mean(pool_recalls)),
+                    "recall_at_k": float(np.mean(recalls)),
+                    "mrr": float(np.mean(rrs)),
+                    "rerank_p50_ms": float(np.percentile(latencies, 50)),
+                }
+            )
+    return rows
+
+
+def best_configuration(rows: list[dict]) -> dict | None:
+    """Smallest pool matching the Recall@K of the largest ungrouped pool."""
+    ungrouped = [row for row in rows if row["group_size"] == 0]
+    if not ungrouped:
+        return None
+    baseline = max(ungrouped, key=lambda row: row["candidates"])
+    matching = [row for row in rows if row["recall_at_k"] >= baseline["recall_at_k"]]
+    return min(matching, key=lambda row: (row["candidates"], -row["recall_at_k"]))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark grouped rerank pools")
+    parser.add_argument("--test-file", type=Path, required=True, help="Test queries JSON")
+    parser.add_argument("--collection", type=str, default="default", help="Collection to search")
+    parser.add_argument(
+        "--candidates", type=int, nargs="+", default=[40, 20, 10], help="Rerank pool sizes"
+    )
+    parser.add_argument(
+        "--group-sizes",
+        type=int,
+        nargs="+",
+        default=[0, 1, 2, 3],
+        help="Max chunks per document (0 = no grouping)",
+    )
+    parser.add_argument("--limit", type=int, default=5, help="K for Recall@K after reranking")
+    parser.add_argument("--output", type=Path, help="Output file for results (JSON)")
+    args = parser.parse_args()
+
+    with open(args.test_file) as f:
+        test_cases = json.load(f)
+
+    rows = benchmark(args.collection, test_cases, args.candidates, args.group_sizes, args.limit)
+
+    print(f"Benchmarking {args.collection} with {len(test_cases)} queries (K={args.limit})")
+    print(
+        f"{'Group':>6} {'Candidates':>11} {'Pool docs':>10} {'Pool recall':>12} "
+        f"{'Recall@K':>9} {'MRR':>6} {'Rerank P50':>11}"
+    )
+    print("-" * 71)
+    for row in rows:
+        group = row["group_size"] or "-"
+        print(
+            f"{group:>6} {row['candidates']:>11} {row['pool_documents']:>10.1f} "
+            f"{row['pool_recall']:>12.1%} {row['recall_at_k']:>9.1%} {row['mrr']:>6.3f} "
+            f"{row['rerank_p50_ms']:>9.1f}ms"
+        )
+
+    best = best_configuration(rows)
+    if best is not None:
+        print(
+            f"\nSmallest pool matching the ungrouped baseline: "
+            f"rerank_candidates={best['candidates']} rerank_group_size={best['group_size']}"
+        )
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump({"rows": rows, "best": best}, f, indent=2)
+        print(f"\nFull results saved to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -2,6 +2,7 @@
 
 Usage:
     uv run python -m simba.evaluation.evaluate --test-file test_queries.json --collection default
+    uv run python -m simba.evaluation.evaluate --test-file test_queries.json --compare-rerank-modes
 """
 
 import argparse
@@ -11,6 +12,7 @@ from dataclasses import dataclass
 from pathlib import Path
 
 from simba.services import retrieval_service
+from simba.services.profile_service import RERANK_MODES
 
 
 @dataclass
@@ -59,6 +61,7 @@ def evaluate_query(
     collection_name: str,
     limit: int = 5,
     rerank: bool = False,
+    rerank_mode: str | None = None,
 ) -> EvaluationResult:
     """Evaluate a single query."""
     start = time.perf_counter()
@@ -68,6 +71,7 @@ def evaluate_query(
         collection_name=collection_name,
         limit=limit,
         rerank=rerank,
+        rerank_mode=rerank_mode,
     )
 
     latency_ms = (time.perf_counter() - start) * 1000
@@ -90,6 +94,7 @@ def run_evaluation(
     collection_name: str,
     limit: int = 5,
     rerank: bool = False,
+    rerank_mode: str | None = None,
 ) -> dict:
     """Run evaluation on a test file.
 
@@ -114,6 +119,7 @@ def run_evaluation(
             collection_name=collection_name,
             limit=limit,
             rerank=rerank,
+            rerank_mode=rerank_mode,
         )
         results.append(result)
 
@@ -142,6 +148,7 @@ def run_evaluation(
             "collection": collection_name,
             "limit": limit,
             "rerank": rerank,
+            "rerank_mode": rerank_mode,
         },
         "per_query": [
             {
@@ -156,6 +163,38 @@ def run_evaluation(
     }
 
 
+def compare_rerank_modes(
+    test_file: Path, collection_name: str, limit: int = 5, output: Path | None = None
+) -> dict[str, dict]:
+    """Evaluate the test file with every rerank mode.
+
+    Each mode first runs once untimed, so query embeddings are cached and the
+    latencies compare the rerank stages. Late-interaction modes need token
+    vectors stored for the collection (see migrate_sparse --late-interaction).
+    """
+    print(f"Comparing rerank modes on {test_file} (collection: {collection_name})")
+    results = {}
+    for mode in RERANK_MODES:
+        run_evaluation(test_file, collection_name, limit, rerank=True, rerank_mode=mode)
+        results[mode] = run_evaluation(
+            test_file, collection_name, limit, rerank=True, rerank_mode=mode
+        )
+
+    print(f"{'Mode':<18} {'Recall@K':>9} {'MRR':>7} {'P50':>9} {'P99':>9}")
+    print("-" * 56)
+    for mode, result in results.items():
+        print(
+            f"{mode:<18} {result['metrics']['recall@k']:>9.2%} {result['metrics']['mrr']:>7.4f} "
+            f"{result['latency']['p50_ms']:>7.1f}ms {result['latency']['p99_ms']:>7.1f}ms"
+        )
+
+    if output:
+        with open(output, "w") as f:
+            json.dump(results, f, indent=2)
+        print(f"\nFull results saved to {output}")
+    return results
+
+
 def main():
     parser = argparse.ArgumentParser(description="Evaluate RAG retrieval accuracy")
     parser.add_argument(
@@ -181,6 +220,16 @@ def main():
         action="store_true",
         help="Enable cross-encoder reranking",
     )
+    parser.add_argument(
+        "--rerank-mode",
+        choices=RERANK_MODES,
+        help="Rerank stage (default: the collection's profile)",
+    )
+    parser.add_argument(
+        "--compare-rerank-modes",
+        action="store_true",
+        help="Evaluate every rerank mode and print a comparison",
+    )
     parser.add_argument(
         "--output",
         type=Path,
@@ -189,6 +238,10 @@ def main():
 
     args = parser.parse_args()
 
+    if args.compare_rerank_modes:
+        compare_rerank_modes(args.test_file, args.collection, args.limit, args.output)
+        return
+
     print(f"Running evaluation on {args.test_file}")
     print(f"Collection: {args.collection}, Limit: {args.limit}, Rerank: {args.rerank}")
     print("-" * 50)
@@ -198,6 +251,7 @@ def main():
         collection_name=args.collection,
         limit=args.limit,
         rerank=args.rerank,
+        rerank_mode=args.rerank_mode,
     )
 
     print(f"\nResults ({results['num_queries']} queries):")
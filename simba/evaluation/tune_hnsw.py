@@ -0,0 +1,176 @@
+"""Pick the search-time HNSW ef of a collection from a target recall.
+
+Runs the test queries against an exact (brute-force) search baseline, then
+measures Recall@K of the HNSW results against that baseline for increasing
+ef values and picks the lowest ef that meets the target. With --apply the
+result (and optionally new m / ef_construct) is stored on the collection;
+no documents need to be re-uploaded. After changing m or ef_construct, re-run
+the tuning once Qdrant has rebuilt the index (collection status green).
+
+Usage:
+    uv run python -m simba.evaluation.tune_hnsw --test-file test_queries.json --collection default
+    uv run python -m simba.evaluation.tune_hnsw --collection default --target-recall 0.98 --apply
+"""
+
+import argparse
+import json
+import time
+from pathlib import Path
+
+import numpy as np
+from qdrant_client.models import SearchParams
+
+from simba.evaluation.evaluate import recall_at_k
+from simba.services import embedding_service, qdrant_service
+
+DEFAULT_EF_CANDIDATES = [16, 32, 64, 128, 256, 512]
+
+
+def load_queries(test_file: Path | None, collection_name: str, sample: int) -> list[str]:
+    """Load tuning queries from an evaluation test file, or sample chunk texts.
+
+    Sampled chunks are truncated to their first sentence-sized prefix so they
+    behave like queries rather than exact copies of stored chunks.
+    """
+    if test_file:
+        with open(test_file) as f:
+            return [item["query"] for item in json.load(f)]
+    chunks = qdrant_service.sample_chunks(collection_name, limit=sample)
+    return [chunk.get("chunk_text", "")[:200] for chunk in chunks if chunk.get("chunk_text")]
+
+
+def search_ids(
+    collection_name: str, vectors: np.ndarray, limit: int, params: SearchParams
+) -> tuple[list[list[str]], list[float]]:
+    """Run every query with the given search params; returns result ids and latencies."""
+    ids, latencies = [], []
+    for vector in vectors:
+        start = time.perf_counter()
+        results = qdrant_service.search(collection_name, vector, limit, search_params=params)
+        latencies.append((time.perf_counter() - start) * 1000)
+        ids.append([str(result["id"]) for result in results])
+    return ids, latencies
+
+
+def tune_ef(
+    collection_name: str,
+    queries: list[str],
+    limit: int = 10,
+    target_recall: float = 0.95,
+    candidates: list[int] | None = None,
+) -> dict:
+    """Measure recall and latency per ef candidate against exact search.
+
+    Args:
+        collection_name: Name of the collection.
+        queries: Tuning queries.
+        limit: K for Recall@K (use the retrieval limit, or the rerank candidate count).
+        target_recall: Minimum average Recall@K against exact search.
+        candidates: ef values to try, ascending. Values below limit are skipped.
+
+    Returns:
+        Dict with the chosen hnsw_ef (None if no candidate met the target) and
+        per-candidate recall and latency.
+    """
+    candidates = sorted(ef for ef in (candidates or DEFAULT_EF_CANDIDATES) if ef >= limit)
+    vectors = embedding_service.get_embeddings(queries)
+
+    exact_ids, exact_latencies = search_ids(
+        collection_name, vectors, limit, SearchParams(exact=True)
+    )
+
+    results = []
+    chosen = None
+    for ef in candidates:
+        ann_ids, latencies = search_ids(collection_name, vectors, limit, SearchParams(hnsw_ef=ef))
+        recall = float(np.mean([recall_at_k(e, a) for e, a in zip(exact_ids, ann_ids)]))
+        results.append(
+            {
+                "hnsw_ef": ef,
+                "recall": round(recall, 4),
+                "p50_ms": round(float(np.percentile(latencies, 50)), 2),
+                "p99_ms": round(float(np.percentile(latencies, 99)), 2),
+            }
+        )
+        if recall >= target_recall:
+            chosen = ef
+            break
+
+    return {
+        "collection": collection_name,
+        "num_queries": len(queries),
+        "limit": limit,
+        "target_recall": target_recall,
+        "hnsw_ef": chosen,
+        "exact_p50_ms": round(float(np.percentile(exact_latencies, 50)), 2),
+        "candidates": results,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Tune HNSW search ef for a target recall")
+    parser.add_argument("--collection", type=str, default="default", help="Collection to tune")
+    parser.add_argument(
+        "--test-file",
+        type=Path,
+        help="Evaluation test queries JSON (see evaluate.py); samples chunk texts if omitted",
+    )
+    parser.add_argument(
+        "--sample", type=int, default=100, help="Chunks to sample as queries without --test-file"
+    )
+    parser.add_argument("--limit", type=int, default=10, help="K for Recall@K")
+    parser.add_argument("--target-recall", type=float, default=0.95, help="Minimum recall")
+    parser.add_argument(
+        "--ef", type=int, nargs="+", help=f"ef candidates (default: {DEFAULT_EF_CANDIDATES})"
+    )
+    parser.add_argument("--m", type=int, help="Also set the index m (rebuilds the index)")
+    parser.add_argument(
+        "--ef-construct", type=int, help="Also set the index ef_construct (rebuilds the index)"
+    )
+    parser.add_argument("--apply", action="store_true", help="Store the result on the collection")
+    parser.add_argument("--output", type=Path, help="Output file for results (JSON)")
+
+    args = parser.parse_args()
+
+    queries = load_queries(args.test_file, args.collection, args.sample)
+    if not queries:
+        parser.error(f"No queries available for collection {args.collection}")
+
+    current = qdrant_service.get_hnsw_config(args.collection)
+    print(f"Tuning {args.collection} with {len(queries)} queries")
+    print(
+        f"Current: m={current['m']}, ef_construct={current['ef_construct']}, ef={current['hnsw_ef']}"
+    )
+    print("-" * 50)
+
+    results = tune_ef(args.collection, queries, args.limit, args.target_recall, args.ef)
+
+    print(f"Exact search P50: {results['exact_p50_ms']:.1f}ms")
+    for candidate in results["candidates"]:
+        print(
+            f"  ef={candidate['hnsw_ef']:<5} Recall@{args.limit}: {candidate['recall']:.2%}  "
+            f"P50: {candidate['p50_ms']:.1f}ms  P99: {candidate['p99_ms']:.1f}ms"
+        )
+
+    hnsw_ef = results["hnsw_ef"]
+    if hnsw_ef is None:
+        print(
+            f"\nNo ef reached {args.target_recall:.0%} recall; consider a larger --m/--ef-construct"
+        )
+    else:
+        print(f"\nLowest ef meeting {args.target_recall:.0%} recall: {hnsw_ef}")
+
+    if args.apply and (hnsw_ef is not None or args.m or args.ef_construct):
+        qdrant_service.update_hnsw_config(
+            args.collection, m=args.m, ef_construct=args.ef_construct, hnsw_ef=hnsw_ef
+        )
+        print("Applied to collection")
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+        print(f"\nFull results saved to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
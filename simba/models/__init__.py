@@ -1,12 +1,13 @@
 """SQLAlchemy models."""
 
 from simba.models.base import Base, SessionLocal, engine, get_db, init_db
-from simba.models.document import Collection, Document
+from simba.models.document import Collection, CollectionProfile, Document
 from simba.models.eval import EvalItem
 
 __all__ = [
     "Base",
     "Collection",
+    "CollectionProfile",
     "Document",
     "EvalItem",
     "SessionLocal",
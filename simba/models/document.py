@@ -3,7 +3,17 @@
 from datetime import datetime
 from uuid import uuid4
 
-from sqlalchemy import DateTime, ForeignKey, Index, Integer, String, Text, UniqueConstraint
+from sqlalchemy import (
+    Boolean,
+    DateTime,
+    Float,
+    ForeignKey,
+    Index,
+    Integer,
+    String,
+    Text,
+    UniqueConstraint,
+)
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
@@ -37,11 +47,52 @@ class Collection(Base):
     documents: Mapped[list["Document"]] = relationship(
         "Document", back_populates="collection", cascade="all, delete-orphan"
     )
+    profile: Mapped["CollectionProfile | None"] = relationship(
+        "CollectionProfile", back_populates="collection", cascade="all, delete-orphan"
+    )
 
     def __repr__(self) -> str:
         return f"<Collection(id={self.id}, name={self.name}, org={self.organization_id})>"
 
 
+class CollectionProfile(Base):
+    """Per-collection chunking and retrieval settings.
+
+    NULL columns fall back to the global settings (see profile_service).
+    """
+
+    __tablename__ = "collection_profiles"
+
+    collection_id: Mapped[str] = mapped_column(
+        UUID(as_uuid=False), ForeignKey("collections.id", ondelete="CASCADE"), primary_key=True
+    )
+    # Indexing (applies to documents ingested after a change)
+    chunking_mode: Mapped[str | None] = mapped_column(String(20), nullable=True)
+    chunk_size: Mapped[int | None] = mapped_column(Integer, nullable=True)
+    chunk_overlap: Mapped[int | None] = mapped_column(Integer, nullable=True)
+    sparse_backend: Mapped[str | None] = mapped_column(String(20), nullable=True)
+    quantization: Mapped[str | None] = mapped_column(String(20), nullable=True)
+    # Retrieval
+    retrieval_limit: Mapped[int | None] = mapped_column(Integer, nullable=True)
+    retrieval_min_score: Mapped[float | None] = mapped_column(Float, nullable=True)
+    retrieval_rerank: Mapped[bool | None] = mapped_column(Boolean, nullable=True)
+    retrieval_hybrid: Mapped[bool | None] = mapped_column(Boolean, nullable=True)
+    rerank_candidates: Mapped[int | None] = mapped_column(Integer, nullable=True)
+    rerank_group_size: Mapped[int | None] = mapped_column(Integer, nullable=True)
+    rerank_mode: Mapped[str | None] = mapped_column(String(20), nullable=True)
+    cascade_candidates: Mapped[int | None] = mapped_column(Integer, nullable=True)
+    answer_cache_ttl_seconds: Mapped[float | None] = mapped_column(Float, nullable=True)
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime, default=datetime.utcnow, onupdate=datetime.utcnow
+    )
+
+    # Relationships
+    collection: Mapped["Collection"] = relationship("Collection", back_populates="profile")
+
+    def __repr__(self) -> str:
+        return f"<CollectionProfile(collection_id={self.collection_id})>"
+
+
 class Document(Base):
     """Document model - represents an uploaded file."""
 
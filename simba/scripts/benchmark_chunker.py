@@ -0,0 +1,126 @@
+"""Benchmark chunking: LangChain splitter vs the single-pass token-aware chunker.
+
+Compares the previous chunker (RecursiveCharacterTextSplitter, then
+text.find() to locate each chunk) with chunker_service.chunk_text on
+synthetic documents of increasing size. For each it reports the time,
+chunk count, and how many chunks exceed the embedding model's input
+length, along with the characters that would be cut off and never embedded.
+
+Usage:
+    uv run python -m simba.scripts.benchmark_chunker
+    uv run python -m simba.scripts.benchmark_chunker --sizes-mb 1 10 --chunk-size 1000
+"""
+
+import argparse
+import time
+
+import numpy as np
+
+from simba.core.config import settings
+from simba.services import chunker_service
+
+
+def _synthetic_text(size: int, seed: int = 0) -> str:
+    """Generate about size characters of prose-like paragraphs."""
+    rng = np.random.default_rng(seed)
+    vocabulary = [
+        "".join(rng.choice(list("abcdefghijklmnopqrstuvwxyz"), rng.integers(2, 12)))
+        for _ in range(5000)
+    ]
+    words = rng.choice(vocabulary, size // 6)
+    parts = []
+    for i, word in enumerate(words):
+        parts.append(word)
+        if i % 997 == 996:
+            parts.append(".\n\n")
+        elif i % 17 == 16:
+            parts.append(". ")
+        else:
+            parts.append(" ")
+    return "".join(parts)
+
+
+def _chunk_langchain(text: str, chunk_size: int, chunk_overlap: int) -> list[tuple[int, int]]:
+    """Previous chunker: character splitter plus text.find() to recover offsets."""
+    from langchain_text_splitters import RecursiveCharacterTextSplitter
+
+    splitter = RecursiveCharacterTextSplitter(
+        chunk_size=chunk_size,
+        chunk_overlap=chunk_overlap,
+        length_function=len,
+        separators=["\n\n", "\n", ". ", " ", ""],
+    )
+    spans = []
+    current_pos = 0
+    for doc in splitter.create_documents([text]):
+        start = text.find(doc.page_content, current_pos)
+        if start == -1:
+            start = current_pos
+        end = start + len(doc.page_content)
+        spans.append((start, end))
+        current_pos = max(start + 1, end - chunk_overlap)
+    return spans
+
+
+def _overflow(text: str, spans: list[tuple[int, int]], max_tokens: int) -> tuple[int, int]:
+    """Chunks over max_tokens model tokens, and their characters past the limit."""
+    tokenizer = chunker_service._get_tokenizer()
+    if tokenizer is None:
+        return 0, 0
+    budget = max_tokens - 2  # [CLS] and [SEP]
+    over, lost = 0, 0
+    encodings = tokenizer.encode_batch([text[a:b] for a, b in spans], add_special_tokens=False)
+    for encoding, (start, end) in zip(encodings, spans):
+        if len(encoding.offsets) > budget:
+            over += 1
+            lost += (end - start) - encoding.offsets[budget - 1][1]
+    return over, lost
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark LangChain vs token-aware chunking")
+    parser.add_argument(
+        "--sizes-mb", type=float, nargs="+", default=[0.1, 1, 10], help="Document sizes (MB)"
+    )
+    parser.add_argument("--chunk-size", type=int, default=settings.chunk_size)
+    parser.add_argument("--chunk-overlap", type=int, default=settings.chunk_overlap)
+    parser.add_argument("--max-tokens", type=int, default=settings.chunk_max_tokens)
+    args = parser.parse_args()
+
+    tokenizer = "embedding tokenizer" if chunker_service._get_tokenizer() else "4 chars/token"
+    print(
+        f"chunk_size={args.chunk_size} overlap={args.chunk_overlap} "
+        f"max_tokens={args.max_tokens} ({tokenizer})"
+    )
+    print(
+        f"{'Size MB':>8} {'Mode':<10} {'Time (s)':>9} {'MB/s':>7} {'Chunks':>8} "
+        f"{'Over limit':>11} {'Chars lost':>11}"
+    )
+    print("-" * 70)
+    for size_mb in args.sizes_mb:
+        text = _synthetic_text(int(size_mb * 1_000_000))
+
+        start = time.perf_counter()
+        spans = _chunk_langchain(text, args.chunk_size, args.chunk_overlap)
+        langchain_seconds = time.perf_counter() - start
+
+        start = time.perf_counter()
+        chunks = chunker_service.chunk_text(
+            text, args.chunk_size, args.chunk_overlap, max_tokens=args.max_tokens
+        )
+        native_seconds = time.perf_counter() - start
+
+        rows = [
+            ("langchain", langchain_seconds, spans),
+            ("native", native_seconds, [(c.start_char, c.end_char) for c in chunks]),
+        ]
+        for mode, seconds, mode_spans in rows:
+            over, lost = _overflow(text, mode_spans, args.max_tokens) if args.max_tokens else (0, 0)
+            print(
+                f"{size_mb:>8g} {mode:<10} {seconds:>9.2f} {size_mb / seconds:>7.1f} "
+                f"{len(mode_spans):>8} {over:>11} {lost:>11}"
+            )
+
+
+if __name__ == "__main__":
+    main()
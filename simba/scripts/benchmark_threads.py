@@ -0,0 +1,111 @@
+"""Benchmark process/thread splits for the embedding models on this host.
+
+Runs every split of the available cores into P processes x T ONNX threads
+(P * T = cores), with each process embedding single queries concurrently,
+and reports throughput and latency percentiles. Use the best split to set
+API_PROCESSES / WORKER_PROCESSES and THREAD_BUDGETS.
+
+Usage:
+    uv run python -m simba.scripts.benchmark_threads
+    uv run python -m simba.scripts.benchmark_threads --cores 8 --queries 200 --model sparse
+"""
+
+import argparse
+import multiprocessing as mp
+import statistics
+import time
+
+from simba.core.config import settings
+from simba.core.thread_budget import available_cores
+
+SAMPLE_QUERY = "How do I reset my password if I no longer have access to my email address?"
+READY_TIMEOUT_S = 600  # Model download and load on a cold cache
+
+
+def _worker(model: str, threads: int, queries: int, ready, results) -> None:
+    """Load a model with `threads` ONNX threads and time single-query embeddings."""
+    if model == "sparse":
+        from fastembed import SparseTextEmbedding
+
+        encoder = SparseTextEmbedding(model_name=settings.retrieval_sparse_model, threads=threads)
+    else:
+        from fastembed import TextEmbedding
+
+        encoder = TextEmbedding(model_name=settings.embedding_model, threads=threads)
+
+    # Warm up, then start together with the other processes once all are warm
+    list(encoder.embed([SAMPLE_QUERY]))
+    ready.wait(READY_TIMEOUT_S)
+
+    latencies = []
+    for i in range(queries):
+        start = time.perf_counter()
+        list(encoder.embed([f"{SAMPLE_QUERY} {i}"]))
+        latencies.append((time.perf_counter() - start) * 1000)
+    results.put(latencies)
+
+
+def run_split(model: str, processes: int, threads: int, queries: int) -> dict:
+    """Run one split and aggregate latencies across its processes."""
+    ctx = mp.get_context("spawn")
+    # Released once every process has loaded and warmed up its model (and this one)
+    ready = ctx.Barrier(processes + 1)
+    results = ctx.Queue()
+    procs = [
+        ctx.Process(target=_worker, args=(model, threads, queries, ready, results))
+        for _ in range(processes)
+    ]
+    for p in procs:
+        p.start()
+
+    ready.wait(READY_TIMEOUT_S)
+    wall_start = time.perf_counter()
+    latencies = [lat for _ in procs for lat in results.get()]
+    wall_s = time.perf_counter() - wall_start
+    for p in procs:
+        p.join()
+
+    latencies.sort()
+    return {
+        "processes": processes,
+        "threads": threads,
+        "qps": len(latencies) / wall_s,
+        "p50_ms": statistics.median(latencies),
+        "p99_ms": latencies[min(int(len(latencies) * 0.99), len(latencies) - 1)],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark process/thread splits for embedding")
+    parser.add_argument(
+        "--cores", type=int, default=available_cores(), help="Core count to split (default: all)"
+    )
+    parser.add_argument("--queries", type=int, default=100, help="Queries per process")
+    parser.add_argument(
+        "--model", choices=["embedding", "sparse"], default="embedding", help="Model to benchmark"
+    )
+    args = parser.parse_args()
+
+    splits = [(p, args.cores // p) for p in range(1, args.cores + 1) if args.cores % p == 0]
+
+    print(f"Benchmarking {args.model} model on {args.cores} cores")
+    print(f"{'Processes':>10} {'Threads':>8} {'QPS':>10} {'P50 (ms)':>10} {'P99 (ms)':>10}")
+    print("-" * 52)
+
+    results = []
+    for processes, threads in splits:
+        r = run_split(args.model, processes, threads, args.queries)
+        results.append(r)
+        print(
+            f"{r['processes']:>10} {r['threads']:>8} {r['qps']:>10.1f} "
+            f"{r['p50_ms']:>10.1f} {r['p99_ms']:>10.1f}"
+        )
+
+    best_qps = max(results, key=lambda r: r["qps"])
+    best_p99 = min(results, key=lambda r: r["p99_ms"])
+    print(f"\nBest throughput: {best_qps['processes']} processes x {best_qps['threads']} threads")
+    print(f"Best p99:        {best_p99['processes']} processes x {best_p99['threads']} threads")
+
+
+if __name__ == "__main__":
+    main()
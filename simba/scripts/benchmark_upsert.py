@@ -0,0 +1,131 @@
+"""Benchmark ingestion upserts: Python float lists vs NumPy arrays.
+
+Compares the previous ingestion path (embeddings converted with .tolist(),
+one PointStruct per chunk, single upsert call) with the NumPy path used by
+qdrant_service.upsert_vectors. Each mode runs in its own process on the same
+synthetic chunks, so peak RSS is measured independently.
+
+Uses the configured Qdrant (QDRANT_HOST, QDRANT_PREFER_GRPC) and a temporary
+collection that is deleted afterwards.
+
+Usage:
+    uv run python -m simba.scripts.benchmark_upsert --chunks 20000
+    QDRANT_PREFER_GRPC=true uv run python -m simba.scripts.benchmark_upsert
+"""
+
+import argparse
+import multiprocessing as mp
+import resource
+import time
+from uuid import uuid4
+
+import numpy as np
+
+from simba.core.config import settings
+
+COLLECTION = "_benchmark_upsert"
+CHUNK_TEXT = "lorem ipsum dolor sit amet " * 37  # ~1000 characters, like a default chunk
+
+
+def _synthetic_chunks(n: int, sparse_nnz: int = 120, seed: int = 0):
+    """Generate normalized dense vectors, sparse vectors and payloads for n chunks."""
+    rng = np.random.default_rng(seed)
+    dense = rng.standard_normal((n, settings.embedding_dimensions), dtype=np.float32)
+    dense /= np.linalg.norm(dense, axis=1, keepdims=True)
+    sparse = [
+        (
+            np.sort(rng.choice(30000, sparse_nnz, replace=False)).astype(np.int32),
+            rng.random(sparse_nnz, dtype=np.float32),
+        )
+        for _ in range(n)
+    ]
+    payloads = [
+        {"document_id": "bench", "chunk_text": CHUNK_TEXT, "chunk_position": i} for i in range(n)
+    ]
+    return dense, sparse, payloads
+
+
+def _peak_rss_mb() -> float:
+    """Peak resident set size of this process in MB (Linux reports KB)."""
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def _run_lists(n: int, results) -> None:
+    """Previous path: boxed float lists and PointStructs built upfront."""
+    from qdrant_client.models import PointStruct, SparseVector
+
+    from simba.services.qdrant_service import get_qdrant_client
+
+    dense, sparse, payloads = _synthetic_chunks(n)
+    baseline = _peak_rss_mb()
+
+    start = time.perf_counter()
+    embeddings = [vector.tolist() for vector in dense]
+    sparse_lists = [(indices.tolist(), values.tolist()) for indices, values in sparse]
+    points = [
+        PointStruct(
+            id=str(uuid4()),
+            vector={
+                "": embedding,
+                "text-sparse": SparseVector(indices=sparse_vec[0], values=sparse_vec[1]),
+            },
+            payload=payload,
+        )
+        for embedding, sparse_vec, payload in zip(embeddings, sparse_lists, payloads)
+    ]
+    get_qdrant_client().upsert(collection_name=COLLECTION, points=points)
+    results.put(("lists", time.perf_counter() - start, _peak_rss_mb() - baseline))
+
+
+def _run_numpy(n: int, results) -> None:
+    """Current path: NumPy arrays passed to the batched uploader."""
+    from simba.services import qdrant_service
+
+    dense, sparse, payloads = _synthetic_chunks(n)
+    baseline = _peak_rss_mb()
+
+    start = time.perf_counter()
+    qdrant_service.upsert_vectors(
+        COLLECTION,
+        ids=[str(uuid4()) for _ in range(n)],
+        vectors=dense,
+        payloads=payloads,
+        sparse_vectors=sparse,
+    )
+    results.put(("numpy", time.perf_counter() - start, _peak_rss_mb() - baseline))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark list vs NumPy upserts to Qdrant")
+    parser.add_argument("--chunks", type=int, default=10000, help="Number of synthetic chunks")
+    args = parser.parse_args()
+
+    from simba.services import qdrant_service
+
+    ctx = mp.get_context("spawn")
+    results = ctx.Queue()
+    rows = []
+
+    for target in (_run_lists, _run_numpy):
+        # Fresh collection per mode so both pay the same indexing cost
+        if qdrant_service.collection_exists(COLLECTION):
+            qdrant_service.delete_collection(COLLECTION)
+        qdrant_service.create_collection(COLLECTION)
+
+        proc = ctx.Process(target=target, args=(args.chunks, results))
+        proc.start()
+        rows.append(results.get())
+        proc.join()
+
+    qdrant_service.delete_collection(COLLECTION)
+
+    grpc = "gRPC" if settings.qdrant_prefer_grpc else "REST"
+    print(f"Upserting {args.chunks} chunks ({settings.embedding_dimensions}d + sparse) via {grpc}")
+    print(f"{'Mode':<8} {'Time (s)':>10} {'Chunks/s':>10} {'Peak RSS +MB':>14}")
+    print("-" * 46)
+    for mode, seconds, rss in rows:
+        print(f"{mode:<8} {seconds:>10.2f} {args.chunks / seconds:>10.0f} {rss:>14.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,48 @@
+"""Build the document summary vectors used for document routing.
+
+Documents ingested with RETRIEVAL_DOCUMENT_ROUTING enabled get their summary
+vector at ingestion. Run this once to add summaries for documents ingested
+before, or after re-embedding a collection. Summaries are computed from the
+stored chunk vectors; nothing is re-embedded.
+
+Usage:
+    uv run python -m simba.scripts.build_document_summaries --collection <name>
+    uv run python -m simba.scripts.build_document_summaries --all
+"""
+
+import argparse
+import logging
+import sys
+
+from simba.scripts.rebuild_vector_store import list_collections
+from simba.services import answer_cache_service, routing_service
+
+logging.basicConfig(
+    level=logging.INFO,
+    format="%(asctime)s - %(levelname)s - %(message)s",
+)
+logger = logging.getLogger(__name__)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build document summary vectors for routing")
+    parser.add_argument("--collection", "-c", type=str, help="Chunk collection to summarize")
+    parser.add_argument("--all", "-a", action="store_true", help="Summarize all collections")
+    args = parser.parse_args()
+
+    if args.all:
+        companions = (routing_service.SUMMARY_SUFFIX, answer_cache_service.ANSWERS_SUFFIX)
+        names = [name for name in list_collections() if not name.endswith(companions)]
+    elif args.collection:
+        names = [args.collection]
+    else:
+        parser.print_help()
+        sys.exit(1)
+
+    for name in names:
+        count = routing_service.rebuild_summaries(name)
+        logger.info(f"{name}: {count} documents")
+
+
+if __name__ == "__main__":
+    main()
@@ -2,31 +2,38 @@
 
 Qdrant doesn't support adding sparse vectors to existing collections,
 so this script recreates the collection with sparse vector support.
+Collections that already have the backend's sparse vector configured are
+backfilled in place: points missing the vector get it computed from their
+chunk_text (e.g. after switching RETRIEVAL_SPARSE_BACKEND to bm25).
+
+With --late-interaction, points missing late-interaction token vectors get
+them instead (after switching a collection's rerank mode to late_interaction
+or cascade).
 
 Usage:
     uv run python -m simba.scripts.migrate_sparse --collection <name>
     uv run python -m simba.scripts.migrate_sparse --all
+    uv run python -m simba.scripts.migrate_sparse --all --backend bm25
+    uv run python -m simba.scripts.migrate_sparse --collection <name> --late-interaction
 """
 
 import argparse
 import logging
 import sys
 
-from qdrant_client.models import (
-    Distance,
-    PointStruct,
-    SparseIndexParams,
-    SparseVector,
-    SparseVectorParams,
-    VectorParams,
-)
+from qdrant_client.models import PointStruct, PointVectors, SparseVector
 
 from simba.core.config import settings
 from simba.services import embedding_service
 from simba.services.qdrant_service import (
+    LATE_INTERACTION_VECTOR,
+    SPARSE_VECTOR_NAMES,
     collection_exists,
+    collection_has_late_interaction,
     collection_has_sparse_vectors,
+    create_collection,
     get_qdrant_client,
+    sparse_vector_name,
 )
 
 logging.basicConfig(
@@ -36,7 +43,152 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 
-def migrate_collection(collection_name: str, batch_size: int = 100) -> bool:
+def backfill_collection(collection_name: str, batch_size: int, backend: str) -> bool:
+    """Compute the backend's sparse vector for points that don't have it yet.
+
+    Args:
+        collection_name: Name of a collection with the backend's sparse vector configured.
+        batch_size: Number of points to process at a time.
+        backend: Sparse backend ("splade" or "bm25").
+
+    Returns:
+        True if the backfill was successful, False otherwise.
+    """
+    client = get_qdrant_client()
+    vector_name = sparse_vector_name(backend)
+
+    offset = None
+    processed = 0
+    updated = 0
+
+    try:
+        while True:
+            results, offset = client.scroll(
+                collection_name=collection_name,
+                limit=batch_size,
+                offset=offset,
+                with_payload=["chunk_text"],
+                with_vectors=[vector_name],
+            )
+
+            if not results:
+                break
+
+            missing = [
+                point
+                for point in results
+                if not (isinstance(point.vector, dict) and point.vector.get(vector_name))
+                and point.payload.get("chunk_text")
+            ]
+            if missing:
+                sparse_embeddings = embedding_service.get_sparse_embeddings(
+                    [point.payload["chunk_text"] for point in missing], backend=backend
+                )
+                client.update_vectors(
+                    collection_name=collection_name,
+                    points=[
+                        PointVectors(
+                            id=point.id,
+                            vector={
+                                vector_name: SparseVector(
+                                    indices=sparse[0].tolist(), values=sparse[1].tolist()
+                                )
+                            },
+                        )
+                        for point, sparse in zip(missing, sparse_embeddings)
+                    ],
+                )
+                updated += len(missing)
+
+            processed += len(results)
+            logger.info(f"Processed {processed} points, backfilled {updated}")
+
+            if offset is None:
+                break
+
+    except Exception as e:
+        logger.error(f"Backfill failed: {e}")
+        return False
+
+    logger.info(f"Backfill complete: '{collection_name}' {vector_name} on {updated} points")
+    return True
+
+
+def backfill_late_interaction(collection_name: str, batch_size: int) -> bool:
+    """Compute late-interaction token vectors for points that don't have them yet.
+
+    Args:
+        collection_name: Name of the collection.
+        batch_size: Number of points to process at a time.
+
+    Returns:
+        True if the backfill was successful, False otherwise.
+    """
+    if not collection_has_late_interaction(collection_name):
+        logger.error(
+            f"Collection '{collection_name}' has no '{LATE_INTERACTION_VECTOR}' multivector "
+            "(created before late-interaction support); re-create it and re-ingest its documents"
+        )
+        return False
+
+    client = get_qdrant_client()
+    offset = None
+    processed = 0
+    updated = 0
+
+    try:
+        while True:
+            results, offset = client.scroll(
+                collection_name=collection_name,
+                limit=batch_size,
+                offset=offset,
+                with_payload=["chunk_text"],
+                with_vectors=[LATE_INTERACTION_VECTOR],
+            )
+
+            if not results:
+                break
+
+            missing = [
+                point
+                for point in results
+                if not (
+                    isinstance(point.vector, dict) and point.vector.get(LATE_INTERACTION_VECTOR)
+                )
+                and point.payload.get("chunk_text")
+            ]
+            if missing:
+                multivectors = embedding_service.get_late_interaction_embeddings(
+                    [point.payload["chunk_text"] for point in missing]
+                )
+                client.update_vectors(
+                    collection_name=collection_name,
+                    points=[
+                        PointVectors(
+                            id=point.id, vector={LATE_INTERACTION_VECTOR: multivector.tolist()}
+                        )
+                        for point, multivector in zip(missing, multivectors)
+                    ],
+                )
+                updated += len(missing)
+
+            processed += len(results)
+            logger.info(f"Processed {processed} points, backfilled {updated}")
+
+            if offset is None:
+                break
+
+    except Exception as e:
+        logger.error(f"Backfill failed: {e}")
+        return False
+
+    logger.info(f"Backfill complete: '{collection_name}' late-interaction on {updated} points")
+    return True
+
+
+def migrate_collection(
+    collection_name: str, batch_size: int = 100, backend: str | None = None
+) -> bool:
     """Migrate a collection to support sparse vectors.
 
     Since Qdrant doesn't support adding sparse vectors to existing collections,
@@ -46,25 +198,31 @@ def migrate_collection(collection_name: str, batch_size: int = 100) -> bool:
     3. Deletes the original collection
     4. Renames the temporary collection
 
+    Collections that already have the sparse vector configured are backfilled
+    in place instead (see backfill_collection).
+
     Args:
         collection_name: Name of the collection to migrate.
         batch_size: Number of points to process at a time.
+        backend: Sparse backend to add. Defaults to settings.retrieval_sparse_backend.
 
     Returns:
         True if migration was successful, False otherwise.
     """
     client = get_qdrant_client()
+    backend = backend or settings.retrieval_sparse_backend
+    vector_name = sparse_vector_name(backend)
 
     if not collection_exists(collection_name):
         logger.error(f"Collection '{collection_name}' does not exist")
         return False
 
-    # Check if collection already has sparse vectors
-    if collection_has_sparse_vectors(collection_name):
+    # Vector already configured: only fill in points that lack it
+    if collection_has_sparse_vectors(collection_name, backend):
         logger.info(
-            f"Collection '{collection_name}' already has sparse vectors. Skipping migration."
+            f"Collection '{collection_name}' already has '{vector_name}'. Backfilling points."
         )
-        return True
+        return backfill_collection(collection_name, batch_size, backend)
 
     temp_collection = f"{collection_name}_migration_temp"
 
@@ -76,16 +234,7 @@ def migrate_collection(collection_name: str, batch_size: int = 100) -> bool:
     try:
         # Step 1: Create temporary collection with sparse vector support
         logger.info(f"Creating temporary collection '{temp_collection}' with sparse vectors")
-        client.create_collection(
-            collection_name=temp_collection,
-            vectors_config=VectorParams(
-                size=settings.embedding_dimensions,
-                distance=Distance.COSINE,
-            ),
-            sparse_vectors_config={
-                "text-sparse": SparseVectorParams(index=SparseIndexParams(on_disk=False))
-            },
-        )
+        create_collection(temp_collection)
 
         # Step 2: Get total point count
         info = client.get_collection(collection_name=collection_name)
@@ -132,23 +281,25 @@ def migrate_collection(collection_name: str, batch_size: int = 100) -> bool:
 
             # Generate sparse embeddings in batch
             if texts_to_embed:
-                sparse_embeddings = embedding_service.get_sparse_embeddings(texts_to_embed)
+                sparse_embeddings = embedding_service.get_sparse_embeddings(
+                    texts_to_embed, backend=backend
+                )
 
                 for point, sparse in zip(points_data, sparse_embeddings):
-                    # Handle both dict and direct vector formats
-                    dense_vector = point.vector
-                    if isinstance(dense_vector, dict):
-                        # Named vectors - get the default one
-                        dense_vector = dense_vector.get("") or list(dense_vector.values())[0]
+                    # Handle both dict and direct vector formats, keeping any
+                    # other sparse vectors the point already has
+                    vectors = point.vector
+                    if not isinstance(vectors, dict):
+                        vectors = {"": vectors}
 
                     points_to_insert.append(
                         PointStruct(
                             id=point.id,
                             vector={
-                                "": dense_vector,
-                                "text-sparse": SparseVector(
-                                    indices=sparse[0],
-                                    values=sparse[1],
+                                **vectors,
+                                vector_name: SparseVector(
+                                    indices=sparse[0].tolist(),
+                                    values=sparse[1].tolist(),
                                 ),
                             },
                             payload=point.payload,
@@ -177,16 +328,7 @@ def migrate_collection(collection_name: str, batch_size: int = 100) -> bool:
         # Actually, let's just use aliases or recreate
         # For simplicity, we'll create the final collection and copy from temp
 
-        client.create_collection(
-            collection_name=collection_name,
-            vectors_config=VectorParams(
-                size=settings.embedding_dimensions,
-                distance=Distance.COSINE,
-            ),
-            sparse_vectors_config={
-                "text-sparse": SparseVectorParams(index=SparseIndexParams(on_disk=False))
-            },
-        )
+        create_collection(collection_name)
 
         # Copy from temp to final
         offset = None
@@ -221,7 +363,7 @@ def migrate_collection(collection_name: str, batch_size: int = 100) -> bool:
         # Delete temp collection
         client.delete_collection(temp_collection)
 
-        logger.info(f"Migration complete: '{collection_name}' now has sparse vectors")
+        logger.info(f"Migration complete: '{collection_name}' now has '{vector_name}'")
         return True
 
     except Exception as e:
@@ -262,6 +404,17 @@ def main():
         action="store_true",
         help="List all collections and their sparse vector status",
     )
+    parser.add_argument(
+        "--backend",
+        choices=sorted(SPARSE_VECTOR_NAMES),
+        default=settings.retrieval_sparse_backend,
+        help="Sparse backend to add or backfill (default: RETRIEVAL_SPARSE_BACKEND)",
+    )
+    parser.add_argument(
+        "--late-interaction",
+        action="store_true",
+        help="Backfill late-interaction token vectors instead of sparse vectors",
+    )
     parser.add_argument(
         "--batch-size",
         "-b",
@@ -272,6 +425,11 @@ def main():
 
     args = parser.parse_args()
 
+    def migrate(name: str) -> bool:
+        if args.late_interaction:
+            return backfill_late_interaction(name, args.batch_size)
+        return migrate_collection(name, args.batch_size, args.backend)
+
     if args.list:
         collections = list_collections()
         if not collections:
@@ -281,8 +439,8 @@ def main():
         print("\nCollections:")
         print("-" * 50)
         for name in collections:
-            has_sparse = collection_has_sparse_vectors(name)
-            status = "sparse vectors" if has_sparse else "dense only"
+            backends = [b for b in SPARSE_VECTOR_NAMES if collection_has_sparse_vectors(name, b)]
+            status = f"sparse vectors ({', '.join(backends)})" if backends else "dense only"
             print(f"  {name}: {status}")
         print()
         return
@@ -293,10 +451,14 @@ def main():
             logger.error("No collections found")
             sys.exit(1)
 
+        if args.late_interaction:
+            # Collections without the multivector can't be backfilled in place
+            collections = [name for name in collections if collection_has_late_interaction(name)]
+
         logger.info(f"Migrating {len(collections)} collections")
         failed = []
         for name in collections:
-            if not migrate_collection(name, args.batch_size):
+            if not migrate(name):
                 failed.append(name)
 
         if failed:
@@ -307,7 +469,7 @@ def main():
         return
 
     if args.collection:
-        if not migrate_collection(args.collection, args.batch_size):
+        if not migrate(args.collection):
             sys.exit(1)
         return
 
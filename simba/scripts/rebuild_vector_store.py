@@ -0,0 +1,83 @@
+"""Rebuild collections in the in-process NumPy vector store.
+
+With VECTOR_STORE_BACKEND=auto, copies small Qdrant collections into the
+NumPy store (mirrors are otherwise created on the next write). With --reembed
+(always, in numpy mode) vectors are recomputed from each chunk's text, e.g.
+after changing the embedding model or if the store's files were lost.
+
+Usage:
+    uv run python -m simba.scripts.rebuild_vector_store --collection <name>
+    uv run python -m simba.scripts.rebuild_vector_store --all --reembed
+"""
+
+import argparse
+import logging
+import sys
+
+from simba.core.config import settings
+from simba.services import (
+    answer_cache_service,
+    numpy_store_service,
+    qdrant_service,
+    routing_service,
+    vector_store_service,
+)
+
+logging.basicConfig(
+    level=logging.INFO,
+    format="%(asctime)s - %(levelname)s - %(message)s",
+)
+logger = logging.getLogger(__name__)
+
+
+def list_collections() -> list[str]:
+    """List collections in the source-of-truth backend."""
+    if settings.vector_store_backend == "numpy":
+        root = numpy_store_service.store_root()
+        return (
+            sorted(
+                name
+                for name in numpy_store_service.list_collections()
+                if numpy_store_service.collection_exists(name)
+            )
+            if root.exists()
+            else []
+        )
+    client = qdrant_service.get_qdrant_client()
+    return [c.name for c in client.get_collections().collections]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Rebuild collections in the NumPy vector store")
+    parser.add_argument("--collection", "-c", type=str, help="Collection to rebuild")
+    parser.add_argument("--all", "-a", action="store_true", help="Rebuild all collections")
+    parser.add_argument("--reembed", action="store_true", help="Recompute vectors from chunk text")
+    args = parser.parse_args()
+
+    if args.all:
+        names = list_collections()
+    elif args.collection:
+        names = [args.collection]
+    else:
+        parser.print_help()
+        sys.exit(1)
+
+    for name in names:
+        # Document summaries have no chunk text to re-embed
+        if args.reembed and name.endswith(routing_service.SUMMARY_SUFFIX):
+            logger.info(f"Skipping {name}: rebuild it with simba.scripts.build_document_summaries")
+            continue
+        if args.reembed and name.endswith(answer_cache_service.ANSWERS_SUFFIX):
+            logger.info(f"Skipping {name}: cached answers are not re-embedded")
+            continue
+        # In auto mode only small collections are served from NumPy
+        if settings.vector_store_backend == "auto":
+            count = qdrant_service.count_points(name)
+            if count > settings.vector_store_auto_max_points:
+                logger.info(f"Skipping {name}: {count} points exceeds the auto mirror limit")
+                continue
+        vector_store_service.rebuild_numpy_store(name, reembed=args.reembed)
+
+
+if __name__ == "__main__":
+    main()
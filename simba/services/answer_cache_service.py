@@ -0,0 +1,170 @@
+"""Semantic answer cache.
+
+The final answer to the first message of a conversation is stored, with the
+sources it cited, under the message's embedding in a companion collection
+("{collection}__answers", one point per answer). A new conversation opening
+with a message whose cosine similarity to a cached one reaches
+answer_cache_threshold is answered from the cache without calling the LLM.
+
+Entries expire after the collection profile's answer_cache_ttl_seconds, and a
+collection keeps at most answer_cache_max_entries of them (oldest evicted).
+Messages containing identifiers (order numbers, SKUs, error codes) bypass the
+cache: their embeddings hardly depend on the identifier, so another order's
+answer would match.
+The IDs of the cited documents are stored as the entry's document_id, so
+deleting a document's vectors from the answers collection (Qdrant matches any
+element of an array payload) drops every answer that cited it.
+"""
+
+import logging
+import time
+import uuid
+from dataclasses import dataclass
+
+from simba.core.config import settings
+from simba.services import (
+    embedding_service,
+    identifier_service,
+    profile_service,
+    vector_store_service,
+)
+from simba.services.metrics_service import ANSWER_CACHE_LOOKUPS
+
+logger = logging.getLogger(__name__)
+
+ANSWERS_SUFFIX = "__answers"
+
+# Eviction trims a full collection to this fraction of answer_cache_max_entries,
+# so the scan over all entries runs once per batch of new answers, not per answer
+_EVICT_TO = 0.9
+
+
+@dataclass
+class CachedAnswer:
+    """An answer served from the cache."""
+
+    query: str  # Message the answer was generated for
+    answer: str
+    sources: list[dict]
+    score: float  # Cosine similarity of the cached message to the new one
+    age_seconds: float
+
+
+def answer_collection_name(collection_name: str) -> str:
+    """Name of the companion collection holding a collection's cached answers."""
+    return f"{collection_name}{ANSWERS_SUFFIX}"
+
+
+def _ttl(collection_name: str) -> float:
+    """Seconds a cached answer of the collection may be served (0 = cache disabled)."""
+    if not settings.answer_cache_enabled:
+        return 0.0
+    return profile_service.get_profile(collection_name).answer_cache_ttl_seconds
+
+
+def lookup(collection_name: str, query: str) -> CachedAnswer | None:
+    """Find a cached answer to a message.
+
+    Args:
+        collection_name: Name of the chunk collection the conversation searches.
+        query: The user's message.
+
+    Returns:
+        The answer of the closest cached message, or None if there is none
+        within answer_cache_threshold, it is older than the collection's TTL, or
+        the message contains identifiers.
+    """
+    ttl = _ttl(collection_name)
+    answers = answer_collection_name(collection_name)
+    if ttl <= 0 or not vector_store_service.collection_exists(answers):
+        return None
+    if identifier_service.extract_identifiers(query):
+        ANSWER_CACHE_LOOKUPS.labels(result="skipped").inc()
+        return None
+
+    results = vector_store_service.search(answers, embedding_service.get_embedding(query), limit=1)
+    if not results or results[0]["score"] < settings.answer_cache_threshold:
+        ANSWER_CACHE_LOOKUPS.labels(result="miss").inc()
+        return None
+
+    payload = results[0]["payload"]
+    age = time.time() - payload.get("created_at", 0.0)
+    if age > ttl:
+        vector_store_service.delete_points(answers, [results[0]["id"]])
+        ANSWER_CACHE_LOOKUPS.labels(result="expired").inc()
+        return None
+
+    ANSWER_CACHE_LOOKUPS.labels(result="hit").inc()
+    return CachedAnswer(
+        query=payload.get("query", ""),
+        answer=payload.get("answer", ""),
+        sources=payload.get("sources", []),
+        score=results[0]["score"],
+        age_seconds=age,
+    )
+
+
+def store(collection_name: str, query: str, answer: str, sources: list[dict]) -> None:
+    """Cache the answer to a message.
+
+    Answers without cited documents are not cached: nothing would invalidate them.
+    Neither are answers to messages with identifiers (see lookup).
+
+    Args:
+        collection_name: Name of the chunk collection the conversation searches.
+        query: The user's message.
+        answer: Final answer text.
+        sources: Sources the answer was generated from (with document_id).
+    """
+    document_ids = sorted(
+        {source["document_id"] for source in sources if source.get("document_id")}
+    )
+    if not answer.strip() or not document_ids or _ttl(collection_name) <= 0:
+        return
+    if identifier_service.extract_identifiers(query):
+        return
+
+    answers = answer_collection_name(collection_name)
+    vector_store_service.create_collection(answers, with_sparse=False, with_late_interaction=False)
+    vector_store_service.upsert_vectors(
+        answers,
+        # Same message, same point: concurrent misses on it don't add duplicates
+        ids=[str(uuid.uuid5(uuid.NAMESPACE_URL, query))],
+        vectors=embedding_service.get_embedding(query)[None, :],
+        payloads=[
+            {
+                "query": query,
+                "answer": answer,
+                "sources": sources,
+                "document_id": document_ids,
+                "created_at": time.time(),
+            }
+        ],
+    )
+    _evict(answers)
+
+
+def _evict(answers: str) -> None:
+    """Delete the oldest entries of a collection over answer_cache_max_entries."""
+    from simba.services import numpy_store_service, qdrant_service
+
+    count = vector_store_service.count_points(answers)
+    if count <= settings.answer_cache_max_entries:
+        return
+
+    source = numpy_store_service if settings.vector_store_backend == "numpy" else qdrant_service
+    entries = sorted(
+        (payload.get("created_at", 0.0), point_id)
+        for ids, _, _, payloads in source.iter_points(answers)
+        for point_id, payload in zip(ids, payloads)
+    )
+    excess = len(entries) - int(settings.answer_cache_max_entries * _EVICT_TO)
+    vector_store_service.delete_points(answers, [point_id for _, point_id in entries[:excess]])
+    logger.info(f"[AnswerCache] Evicted {excess} answers from {answers}")
+
+
+def invalidate_document(collection_name: str, document_id: str) -> None:
+    """Drop every cached answer that cited a document."""
+    answers = answer_collection_name(collection_name)
+    if vector_store_service.collection_exists(answers):
+        vector_store_service.delete_by_document_id(answers, document_id)
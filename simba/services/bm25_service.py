@@ -0,0 +1,97 @@
+"""Language-agnostic BM25 sparse encoder.
+
+A cheap lexical alternative to SPLADE for the sparse leg of hybrid search.
+Text is Unicode-normalized, lowercased, stripped of accents and split on word
+characters, so it works the same for English, French or any space-delimited
+language, and keeps exact tokens such as SKUs and error codes. Tokens are
+hashed into the sparse index space, so no vocabulary has to be stored.
+
+Documents carry the BM25 term-frequency part of the score; the IDF part is
+applied by Qdrant at query time (sparse vector modifier "idf"), which keeps
+it current per collection as chunks are upserted and deleted.
+
+There is no document length normalization (BM25 with b=0). It would need the
+collection's average chunk length, which depends on its chunking profile
+and changes with every upsert, while the weights are fixed at ingestion;
+chunks are already bounded in length by the chunker.
+"""
+
+import re
+import unicodedata
+import zlib
+from collections import Counter
+
+import numpy as np
+
+from simba.core.config import settings
+
+_TOKEN_RE = re.compile(r"\w+")
+_MAX_TOKEN_LENGTH = 40  # Longer "words" are almost always base64, hashes or URLs
+
+
+def tokenize(text: str) -> list[str]:
+    """Split text into normalized tokens.
+
+    Args:
+        text: Input text in any language.
+
+    Returns:
+        Lowercased, accent-stripped word tokens in document order.
+    """
+    normalized = unicodedata.normalize("NFKD", text.lower())
+    stripped = "".join(c for c in normalized if not unicodedata.combining(c))
+    return [t for t in _TOKEN_RE.findall(stripped) if len(t) <= _MAX_TOKEN_LENGTH]
+
+
+def _token_index(token: str) -> int:
+    """Stable 32-bit index for a token (same across processes and restarts)."""
+    return zlib.crc32(token.encode())
+
+
+def _to_sparse(weights: dict[int, float]) -> tuple[np.ndarray, np.ndarray]:
+    """Convert an index -> weight mapping to sorted (indices, values) arrays."""
+    ordered = sorted(weights)
+    indices = np.fromiter(ordered, dtype=np.uint32, count=len(ordered))
+    values = np.fromiter((weights[i] for i in ordered), dtype=np.float32, count=len(ordered))
+    return indices, values
+
+
+def encode_document(text: str) -> tuple[np.ndarray, np.ndarray]:
+    """Encode a chunk as BM25 term-frequency weights.
+
+    Each term gets tf * (k1 + 1) / (tf + k1): BM25 term saturation with b=0.
+
+    Args:
+        text: Chunk text.
+
+    Returns:
+        Tuple of (indices, values) arrays for the sparse vector.
+    """
+    k1 = settings.retrieval_bm25_k1
+
+    weights: dict[int, float] = {}
+    for token, tf in Counter(tokenize(text)).items():
+        index = _token_index(token)
+        # Hash collisions are rare; merge them rather than drop a term
+        weights[index] = weights.get(index, 0.0) + tf * (k1 + 1) / (tf + k1)
+    return _to_sparse(weights)
+
+
+def encode_documents(texts: list[str]) -> list[tuple[np.ndarray, np.ndarray]]:
+    """Encode a batch of chunks (see encode_document)."""
+    return [encode_document(text) for text in texts]
+
+
+def encode_query(text: str) -> tuple[np.ndarray, np.ndarray]:
+    """Encode a query as unit weights per distinct term.
+
+    The dot product with document vectors, with Qdrant applying IDF to the
+    query side, gives the BM25 score.
+
+    Args:
+        text: Query text.
+
+    Returns:
+        Tuple of (indices, values) arrays for the sparse vector.
+    """
+    return _to_sparse({_token_index(token): 1.0 for token in set(tokenize(text))})
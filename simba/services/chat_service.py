@@ -1,36 +1,55 @@
 """Chat service with LangChain agent."""
 
+import asyncio
+import hashlib
 import json
 import logging
+import re
+import threading
 import time
 from collections.abc import AsyncGenerator
-from contextvars import ContextVar
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass, field
 from functools import lru_cache
 
-from langchain.agents import create_agent
+import numpy as np
+from cachetools import LRUCache
+from langchain.agents import AgentState, create_agent
+from langchain.agents.middleware import AgentMiddleware
 from langchain.chat_models import init_chat_model
 from langchain_core.messages import AIMessage, HumanMessage, ToolMessage
+from langchain_core.runnables import RunnableConfig
 from langchain_core.tools import tool
 from langgraph.checkpoint.base import BaseCheckpointSaver
 from langgraph.checkpoint.memory import MemorySaver
 from langgraph.checkpoint.postgres import PostgresSaver
 from langgraph.checkpoint.postgres.aio import AsyncPostgresSaver
+from langgraph.runtime import Runtime
 from psycopg_pool import AsyncConnectionPool
 
 from simba.core.config import settings
-from simba.services import retrieval_service
+from simba.services import (
+    answer_cache_service,
+    context_service,
+    embedding_service,
+    retrieval_service,
+)
+from simba.services.metrics_service import CHAT_AGENT_LATENCY, SPECULATIVE_RETRIEVALS
 
 logger = logging.getLogger(__name__)
 
-# Context variables to store tool data
-_tool_latencies: ContextVar[dict] = ContextVar("tool_latencies", default={})
-_tool_sources: ContextVar[list] = ContextVar("tool_sources", default=[])
+# Cached answers are streamed in pieces of a few words, like model output
+_CACHED_PIECE_RE = re.compile(r"\s*\S+\s*")
+_CACHED_WORDS_PER_EVENT = 8
 
 # Global connection pool and checkpointer (async)
 _connection_pool: AsyncConnectionPool | None = None
 _checkpointer: BaseCheckpointSaver | None = None
 _pool_initialized: bool = False
 
+# Compiled agents by (model, prompt version); the collection is passed per run
+_agents: LRUCache = LRUCache(maxsize=settings.chat_agent_cache_size)
+
 SYSTEM_PROMPT = """You are Simba, a customer service assistant.
 
 ## Tone
@@ -58,51 +77,184 @@ Use the rag tool to search for information. Before saying info doesn't exist:
 - Say "I don't have information" without offering an alternative path
 """
 
+# Changes with the prompt, so agents compiled with an older prompt aren't reused
+PROMPT_VERSION = hashlib.sha256(SYSTEM_PROMPT.encode()).hexdigest()[:12]
 
-def create_rag_tool(collection_name: str):
-    """Create a RAG tool bound to a specific collection."""
 
-    @tool
-    def rag(query: str) -> str:
-        """Search the knowledge base for relevant information.
+def _retrieve_context(query: str, collection_name: str | list[str]) -> tuple[str, dict]:
+    """Retrieve and assemble the context for a query.
 
-        Args:
-            query: The search query to find relevant documents.
+    Returns:
+        The context text, and the rag tool's artifact: latency and sources.
+    """
+    # Retrieve chunks with latency
+    chunks, latency = retrieval_service.retrieve(
+        query=query,
+        collection_name=collection_name,
+        limit=8,
+        return_latency=True,
+    )
 
-        Returns:
-            Retrieved context from the knowledge base.
-        """
-        # Retrieve chunks with latency
-        chunks, latency = retrieval_service.retrieve(
-            query=query,
-            collection_name=collection_name,
-            limit=8,
-            return_latency=True,
-        )
+    # Merge overlapping chunks and pack them into the context token budget
+    context = context_service.assemble_context(chunks)
+    latency = {
+        **latency,
+        "context_tokens": context.tokens,
+        "context_tokens_saved": context.saved_tokens,
+    }
+
+    # Sources as structured data for SSE emission
+    sources = [
+        {
+            "document_id": chunk.document_id,
+            "document_name": chunk.document_name,
+            "collection": chunk.collection_name,
+            "content": chunk.chunk_text[:500],  # Truncate for preview
+            "score": chunk.score,
+        }
+        for chunk in context.chunks
+    ]
 
-        # Store latency in context var for SSE emission
-        _tool_latencies.set({"rag": latency})
+    return context.text, {"latency": latency, "sources": sources}
 
-        # Store sources as structured data for SSE emission
-        sources = [
-            {
-                "document_name": chunk.document_name,
-                "content": chunk.chunk_text[:500],  # Truncate for preview
-                "score": chunk.score,
-            }
-            for chunk in chunks
+
+@dataclass
+class _Speculation:
+    """Retrieval on the user's message, started before the LLM asks for one."""
+
+    message: str
+    started: float  # perf_counter() at launch
+    finished: float | None = None  # perf_counter() when the retrieval completed
+    future: Future | None = None  # Result of _retrieve_context
+    used: bool = False  # Claimed by a rag call (served, or dropped on a miss)
+    lock: threading.Lock = field(default_factory=threading.Lock)
+
+
+@lru_cache
+def _get_speculation_executor() -> ThreadPoolExecutor:
+    """Get the thread pool that runs speculative retrievals."""
+    return ThreadPoolExecutor(
+        max_workers=settings.chat_speculative_workers, thread_name_prefix="simba-speculative"
+    )
+
+
+@lru_cache
+def _get_speculation_slots() -> threading.BoundedSemaphore:
+    """Get the semaphore counting idle speculation workers."""
+    return threading.BoundedSemaphore(settings.chat_speculative_workers)
+
+
+def _start_speculation(message: str, collection_name: str | list[str]) -> _Speculation | None:
+    """Launch retrieval on the raw message in the background.
+
+    Returns None, without queueing, when every speculation worker is busy: a
+    speculation that waits for a worker would not finish before the LLM asks.
+    """
+    slots = _get_speculation_slots()
+    if not slots.acquire(blocking=False):
+        SPECULATIVE_RETRIEVALS.labels(result="skipped").inc()
+        return None
+    speculation = _Speculation(message=message, started=time.perf_counter())
+
+    def run() -> tuple[str, dict]:
+        try:
+            return _retrieve_context(message, collection_name)
+        finally:
+            speculation.finished = time.perf_counter()
+
+    speculation.future = _get_speculation_executor().submit(run)
+    # Also called when the future is cancelled before it runs
+    speculation.future.add_done_callback(lambda _: slots.release())
+    return speculation
+
+
+def _use_speculation(speculation: _Speculation, query: str) -> tuple[str, dict] | None:
+    """Result of the speculative retrieval, if the tool's query is close enough to the message.
+
+    The similarity of the two query embeddings must reach
+    chat_speculative_min_similarity. Only the run's first rag call is
+    considered: on a miss the speculation is dropped, and later (or concurrent)
+    calls retrieve on their own query. The result's latency gains "speculative"
+    and "speculative_saved_ms": the retrieval time already spent when the tool
+    asked for it.
+    """
+    with speculation.lock:
+        if speculation.used:
+            return None
+        speculation.used = True
+
+    if query != speculation.message:
+        a = embedding_service.get_embedding(query)
+        b = embedding_service.get_embedding(speculation.message)
+        similarity = float(np.dot(a, b) / (np.linalg.norm(a) * np.linalg.norm(b) or 1.0))
+        if similarity < settings.chat_speculative_min_similarity:
+            SPECULATIVE_RETRIEVALS.labels(result="miss").inc()
+            speculation.future.cancel()
+            return None
+
+    asked = time.perf_counter()
+    try:
+        text, artifact = speculation.future.result()
+    except Exception as e:
+        logger.warning(f"[Chat] Speculative retrieval failed, retrieving again: {e}")
+        return None
+
+    SPECULATIVE_RETRIEVALS.labels(result="hit").inc()
+    # Retrieval time that overlapped the LLM's first round trip
+    saved_ms = (min(asked, speculation.finished or asked) - speculation.started) * 1000
+    latency = {**artifact["latency"], "speculative": True, "speculative_saved_ms": saved_ms}
+    return text, {**artifact, "latency": latency}
+
+
+class _RagQueryBatcher(AgentMiddleware):
+    """Embed the queries of a model turn's rag calls in one batch.
+
+    The agent's tool node runs the calls of one turn concurrently; with their
+    query embeddings cached up front, each retrieval skips its own model call.
+    """
+
+    def after_model(self, state: AgentState, runtime: Runtime) -> None:
+        message = state["messages"][-1]
+        queries = [
+            call["args"].get("query", "")
+            for call in getattr(message, "tool_calls", None) or []
+            if call["name"] == "rag"
         ]
-        _tool_sources.set(sources)
+        if len(queries) > 1:
+            embedding_service.prefetch_embeddings(queries)
+
+    async def aafter_model(self, state: AgentState, runtime: Runtime) -> None:
+        await asyncio.to_thread(self.after_model, state, runtime)
+
 
-        # Format output for LLM
-        if not chunks:
-            return "No relevant information found in the knowledge base."
+def create_rag_tool():
+    """Create the RAG tool.
 
-        context_parts = []
-        for i, chunk in enumerate(chunks, 1):
-            context_parts.append(f"[Source {i}: {chunk.document_name}]\n{chunk.chunk_text}")
+    It searches the run's "collection" (configurable), or several collections
+    together when that is a list, so one compiled agent serves every collection.
+    A "speculation" in the run config (see chat_stream) is reused when the
+    query is close enough to the message it retrieved for.
+    """
+
+    # The artifact (latency and sources) reaches chat_stream on the ToolMessage; tools
+    # run in a copy of the caller's context, so context variables set here would not
+    @tool(response_format="content_and_artifact")
+    def rag(query: str, config: RunnableConfig) -> tuple[str, dict]:
+        """Search the knowledge base for relevant information.
 
-        return "\n\n---\n\n".join(context_parts)
+        Args:
+            query: The search query to find relevant documents.
+
+        Returns:
+            Retrieved context from the knowledge base.
+        """
+        configurable = config.get("configurable", {})
+        speculation = configurable.get("speculation")
+        if speculation is not None:
+            result = _use_speculation(speculation, query)
+            if result is not None:
+                return result
+        return _retrieve_context(query, configurable.get("collection") or "default")
 
     return rag
 
@@ -147,12 +299,16 @@ def _get_reasoning_kwargs() -> dict:
 
 
 @lru_cache
-def get_llm():
-    """Get cached LLM instance with reasoning config."""
+def get_llm(model: str | None = None):
+    """Get cached LLM instance with reasoning config.
+
+    Args:
+        model: "provider:model" string. Defaults to settings.llm_model.
+    """
     reasoning_kwargs = _get_reasoning_kwargs()
 
     return init_chat_model(
-        model=settings.llm_model,
+        model=model or settings.llm_model,
         temperature=settings.llm_temperature,
         **reasoning_kwargs,
     )
@@ -211,43 +367,58 @@ async def shutdown_checkpointer() -> None:
         _connection_pool = None
     _checkpointer = None
     _pool_initialized = False
+    # Cached agents hold the closed checkpointer
+    _agents.clear()
 
 
-async def get_agent(collection: str | None = None):
-    """Create agent with the specified collection.
+async def get_agent():
+    """Get the compiled agent for the configured model and prompt.
 
-    Args:
-        collection: Collection name for RAG searches. Defaults to "default".
+    Agents are cached per (model, prompt version) in an LRU of
+    chat_agent_cache_size entries. The collection to search is not part of
+    the agent: pass it in the run config (see _run_config).
     """
-    collection_name = collection or "default"
-    llm = get_llm()
-    rag_tool = create_rag_tool(collection_name)
-    checkpointer = await get_checkpointer()
+    start = time.perf_counter()
+    key = (settings.llm_model, PROMPT_VERSION)
+    agent = _agents.get(key)
+    if agent is not None:
+        CHAT_AGENT_LATENCY.labels(cache="hit").observe(time.perf_counter() - start)
+        return agent
 
+    checkpointer = await get_checkpointer()
     agent = create_agent(
-        model=llm,
-        tools=[rag_tool],
+        model=get_llm(settings.llm_model),
+        tools=[create_rag_tool()],
+        middleware=[_RagQueryBatcher()],
         system_prompt=SYSTEM_PROMPT,
         checkpointer=checkpointer,
     )
+    _agents[key] = agent
 
+    elapsed = time.perf_counter() - start
+    CHAT_AGENT_LATENCY.labels(cache="miss").observe(elapsed)
+    logger.info(f"[Chat] Compiled agent for {settings.llm_model} in {elapsed * 1000:.1f}ms")
     return agent
 
 
-async def chat(message: str, thread_id: str, collection: str | None = None) -> str:
+def _run_config(thread_id: str, collection: str | list[str] | None) -> RunnableConfig:
+    """Run config of a message: its conversation thread and the collection(s) to search."""
+    return {"configurable": {"thread_id": thread_id, "collection": collection or "default"}}
+
+
+async def chat(message: str, thread_id: str, collection: str | list[str] | None = None) -> str:
     """Process a chat message and return the response.
 
     Args:
         message: The user's message.
         thread_id: Thread ID for conversation isolation.
-        collection: Collection name for RAG searches.
+        collection: Collection name (or names) for RAG searches.
 
     Returns:
         The agent's response.
     """
-    agent = await get_agent(collection)
-
-    config = {"configurable": {"thread_id": thread_id}}
+    agent = await get_agent()
+    config = _run_config(thread_id, collection)
 
     response = await agent.ainvoke(
         {"messages": [HumanMessage(content=message)]},
@@ -263,14 +434,14 @@ async def chat(message: str, thread_id: str, collection: str | None = None) -> s
 
 
 async def chat_stream(
-    message: str, thread_id: str, collection: str | None = None
+    message: str, thread_id: str, collection: str | list[str] | None = None
 ) -> AsyncGenerator[str, None]:
     """Stream chat responses using SSE format with all event types.
 
     Args:
         message: The user's message.
         thread_id: Thread ID for conversation isolation.
-        collection: Collection name for RAG searches.
+        collection: Collection name (or names) for RAG searches.
 
     Yields:
         SSE-formatted events including:
@@ -278,13 +449,33 @@ async def chat_stream(
         - type: "tool_start" - Tool invocation started (name, input)
         - type: "tool_end" - Tool finished (name, output/sources)
         - type: "content" - AI response text chunks
-        - type: "done" - Stream complete (includes response latency)
+        - type: "done" - Stream complete (includes response latency, and "cached"
+          when the answer was served from the semantic answer cache)
+
+    With answer_cache_enabled, the first message of a conversation over a single
+    collection is looked up in the semantic answer cache (answer_cache_service);
+    on a hit the cached answer and sources are streamed as the same events
+    without calling the LLM. Follow-up messages are never cached: their answer
+    depends on the conversation before them.
+
+    Otherwise, with chat_speculative_retrieval, retrieval on a message of at
+    least chat_speculative_min_words words starts right away (if a speculation
+    worker is free) and the rag tool reuses it for a close enough query; "done"
+    then reports speculative_hit_rate and speculative_saved_ms.
     """
-    agent = await get_agent(collection)
-    config = {"configurable": {"thread_id": thread_id}}
+    agent = await get_agent()
+    config = _run_config(thread_id, collection)
+    cache_collection = (
+        None
+        if isinstance(collection, list) or not settings.answer_cache_enabled
+        else collection or "default"
+    )
 
-    # Track tool start times for latency calculation
+    # Track tool runs (by event run_id) for latency calculation; calls of one model
+    # turn run concurrently, so several runs of the same tool can be in flight
     tool_start_times: dict[str, float] = {}
+    tool_call_ids: dict[str, str | None] = {}  # run_id -> tool call ID
+    pending_tool_calls: list[dict] = []  # Tool calls of the last model turn not yet started
 
     # Track response timing
     stream_start_time = time.perf_counter()
@@ -295,8 +486,35 @@ async def chat_stream(
     reasoning_tokens = 0
     output_tokens = 0
     input_tokens = 0
+    context_tokens_saved = 0  # Saved by context assembly across RAG calls
+
+    # Speculative retrieval: RAG calls, those served by it, and retrieval time they saved
+    rag_calls = 0
+    speculative_hits = 0
+    speculative_saved_ms = 0.0
+
+    # Final answer text (after the last tool call) and sources, for the answer cache
+    answer_parts: list[str] = []
+    cited_sources: list[dict] = []
 
     try:
+        cacheable = cache_collection is not None and await _is_new_thread(agent, config)
+        if cacheable:
+            cached = await asyncio.to_thread(answer_cache_service.lookup, cache_collection, message)
+            if cached is not None:
+                async for data in _stream_cached(agent, config, message, cached, stream_start_time):
+                    yield f"data: {json.dumps(data)}\n\n"
+                return
+
+        # Retrieve for the raw message while the LLM decides on its tool call
+        if (
+            settings.chat_speculative_retrieval
+            and len(message.split()) >= settings.chat_speculative_min_words
+        ):
+            speculation = _start_speculation(message, config["configurable"]["collection"])
+            if speculation is not None:
+                config["configurable"]["speculation"] = speculation
+
         async for event in agent.astream_events(
             {"messages": [HumanMessage(content=message)]},
             config=config,
@@ -308,9 +526,14 @@ async def chat_stream(
             # Tool invocation started
             if event_type == "on_tool_start":
                 tool_name = event.get("name")
-                tool_start_times[tool_name] = time.perf_counter()
+                run_id = event.get("run_id")
+                tool_start_times[run_id] = time.perf_counter()
+                tool_call_ids[run_id] = _match_tool_call(
+                    pending_tool_calls, tool_name, event_data.get("input")
+                )
                 data = {
                     "type": "tool_start",
+                    "id": tool_call_ids[run_id],
                     "name": tool_name,
                     "input": event_data.get("input"),
                 }
@@ -320,6 +543,10 @@ async def chat_stream(
             elif event_type == "on_tool_end":
                 # Extract output - may be a ToolMessage object or string
                 output = event_data.get("output")
+                # Detailed latency and sources (set by rag tool)
+                artifact = getattr(output, "artifact", None) or {}
+                run_id = event.get("run_id")
+                tool_call_id = getattr(output, "tool_call_id", None) or tool_call_ids.get(run_id)
                 if hasattr(output, "content"):
                     output = output.content
                 elif not isinstance(output, str | None):
@@ -327,23 +554,31 @@ async def chat_stream(
 
                 tool_name = event.get("name")
 
-                # Get detailed latency from context var (set by rag tool)
-                latencies = _tool_latencies.get()
-                latency = latencies.get(tool_name, {}) if latencies else {}
+                latency = artifact.get("latency", {})
+
+                context_tokens_saved += latency.get("context_tokens_saved", 0)
+                if tool_name == "rag":
+                    rag_calls += 1
+                    if latency.get("speculative"):
+                        speculative_hits += 1
+                        speculative_saved_ms += latency.get("speculative_saved_ms", 0.0)
 
                 # If no detailed latency, calculate total from start time
-                if not latency and tool_name in tool_start_times:
-                    elapsed = (time.perf_counter() - tool_start_times[tool_name]) * 1000
+                if not latency and run_id in tool_start_times:
+                    elapsed = (time.perf_counter() - tool_start_times[run_id]) * 1000
                     latency = {"total_ms": elapsed}
 
-                # Get sources from context var (set by rag tool)
-                sources = _tool_sources.get() if tool_name == "rag" else None
+                sources = artifact.get("sources") if tool_name == "rag" else None
 
                 # Record when tool finished for response timing
                 tool_end_time = time.perf_counter()
+                answer_parts.clear()
+                if sources:
+                    cited_sources.extend(sources)
 
                 data = {
                     "type": "tool_end",
+                    "id": tool_call_id,
                     "name": tool_name,
                     "output": output,
                     "latency": latency,
@@ -389,11 +624,13 @@ async def chat_stream(
                                     if text:
                                         if first_token_time is None:
                                             first_token_time = time.perf_counter()
+                                        answer_parts.append(text)
                                         data = {"type": "content", "content": text}
                                         yield f"data: {json.dumps(data)}\n\n"
                             elif isinstance(block, str) and block:
                                 if first_token_time is None:
                                     first_token_time = time.perf_counter()
+                                answer_parts.append(block)
                                 data = {"type": "content", "content": block}
                                 yield f"data: {json.dumps(data)}\n\n"
 
@@ -401,6 +638,7 @@ async def chat_stream(
                     elif isinstance(content, str) and content:
                         if first_token_time is None:
                             first_token_time = time.perf_counter()
+                        answer_parts.append(content)
                         data = {"type": "content", "content": content}
                         yield f"data: {json.dumps(data)}\n\n"
 
@@ -420,6 +658,7 @@ async def chat_stream(
             elif event_type == "on_chat_model_end":
                 output = event_data.get("output")
                 if output:
+                    pending_tool_calls[:] = getattr(output, "tool_calls", None) or []
                     # Try to get usage metadata from the final output
                     usage_metadata = getattr(output, "usage_metadata", None)
                     if usage_metadata:
@@ -455,8 +694,30 @@ async def chat_stream(
             response_latency["output_tokens"] = output_tokens
         if reasoning_tokens > 0:
             response_latency["reasoning_tokens"] = reasoning_tokens
+        if context_tokens_saved > 0:
+            response_latency["context_tokens_saved"] = context_tokens_saved
+        if "speculation" in config["configurable"]:
+            if rag_calls == 0:
+                SPECULATIVE_RETRIEVALS.labels(result="unused").inc()
+                config["configurable"]["speculation"].future.cancel()
+            response_latency["speculative_hit_rate"] = (
+                speculative_hits / rag_calls if rag_calls else 0.0
+            )
+            response_latency["speculative_saved_ms"] = speculative_saved_ms
+
+        if cacheable:
+            try:
+                await asyncio.to_thread(
+                    answer_cache_service.store,
+                    cache_collection,
+                    message,
+                    "".join(answer_parts),
+                    cited_sources,
+                )
+            except Exception as e:
+                logger.warning(f"[AnswerCache] Could not cache answer: {e}")
 
-        done_data = {"type": "done"}
+        done_data = {"type": "done", "cached": False}
         if response_latency:
             done_data["response_latency"] = response_latency
         yield f"data: {json.dumps(done_data)}\n\n"
@@ -471,6 +732,78 @@ async def chat_stream(
         yield f"data: {json.dumps({'type': 'done'})}\n\n"
 
 
+def _match_tool_call(pending: list[dict], name: str, args: dict | None) -> str | None:
+    """Take the ID of the pending tool call a tool run was started for.
+
+    Tool start events don't carry the call ID; runs are matched to the model's
+    calls by name and arguments.
+    """
+    for i, call in enumerate(pending):
+        if call["name"] == name and call["args"] == args:
+            return pending.pop(i).get("id")
+    return None
+
+
+async def _is_new_thread(agent, config: dict) -> bool:
+    """Whether a conversation has no messages yet."""
+    state = await agent.aget_state(config)
+    return not state.values.get("messages")
+
+
+async def _stream_cached(
+    agent,
+    config: dict,
+    message: str,
+    cached: answer_cache_service.CachedAnswer,
+    stream_start_time: float,
+) -> AsyncGenerator[dict, None]:
+    """Replay a cached answer as the events of a normal response.
+
+    The message and answer are also added to the conversation, so follow-up
+    messages in the thread see them.
+    """
+    lookup_ms = (time.perf_counter() - stream_start_time) * 1000
+    yield {"type": "tool_start", "name": "rag", "input": {"query": message}}
+    yield {
+        "type": "tool_end",
+        "name": "rag",
+        "output": None,
+        "latency": {"total_ms": lookup_ms},
+        "sources": cached.sources,
+        "cached": True,
+    }
+
+    first_token_time = time.perf_counter()
+    pieces = _CACHED_PIECE_RE.findall(cached.answer)
+    for i in range(0, len(pieces), _CACHED_WORDS_PER_EVENT):
+        yield {"type": "content", "content": "".join(pieces[i : i + _CACHED_WORDS_PER_EVENT])}
+
+    try:
+        await agent.aupdate_state(
+            config,
+            {"messages": [HumanMessage(content=message), AIMessage(content=cached.answer)]},
+            as_node="model",
+        )
+    except Exception as e:
+        logger.warning(f"[AnswerCache] Could not record cached answer in the conversation: {e}")
+
+    stream_end_time = time.perf_counter()
+    logger.info(
+        f"[AnswerCache] Served cached answer (similarity {cached.score:.3f}, "
+        f"age {cached.age_seconds:.0f}s) in {lookup_ms:.1f}ms"
+    )
+    yield {
+        "type": "done",
+        "cached": True,
+        "response_latency": {
+            "ttft_ms": (first_token_time - stream_start_time) * 1000,
+            "generation_ms": (stream_end_time - first_token_time) * 1000,
+            "total_ms": (stream_end_time - stream_start_time) * 1000,
+            "cache_similarity": cached.score,
+        },
+    }
+
+
 # --- Conversation Management Functions ---
 
 
@@ -1,8 +1,38 @@
-"""Text chunking service using LangChain."""
+"""Text chunking service.
 
-from dataclasses import dataclass
+Chunks are cut in a single pass over the text, so character offsets are known
+without searching for each chunk afterwards. Besides chunk_size characters,
+every chunk is capped at the embedding model's input length in tokens
+(settings.chunk_max_tokens): the model truncates longer inputs, and the
+truncated tail would be stored but never embedded.
 
-from langchain_text_splitters import RecursiveCharacterTextSplitter
+chunk_markdown additionally follows the markdown structure of parser output:
+chunks never cross a heading, tables and code blocks are only split between
+lines, and each chunk carries the path of headings it sits under.
+"""
+
+import logging
+import re
+from collections.abc import Iterator
+from dataclasses import dataclass, field
+from functools import lru_cache
+
+import numpy as np
+
+from simba.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Preferred split points, best first
+_SEPARATORS = ["\n\n", "\n", ". ", " "]
+_WHITESPACE_RE = re.compile(r"\s")
+_NON_WHITESPACE_RE = re.compile(r"\S")
+_SPECIAL_TOKENS = 2  # [CLS] and [SEP] count against the model's input length
+_TOKENIZE_BLOCK_CHARS = 65536  # Long texts are tokenized in blocks to bound memory
+
+# Markdown structure (ATX headings, fenced code, pipe tables)
+_HEADING_RE = re.compile(r"(#{1,6})[ \t]+(.+?)[ \t#]*$")
+_FENCE_RE = re.compile(r"[ \t]*(```|~~~)")
 
 
 @dataclass
@@ -13,59 +43,280 @@ class Chunk:
     position: int  # Position in the original document (0-indexed)
     start_char: int  # Starting character position
     end_char: int  # Ending character position
+    heading_path: list[str] = field(default_factory=list)  # Enclosing markdown headings
+
+
+@lru_cache
+def _get_tokenizer():
+    """Get the embedding model's tokenizer without truncation, or None if unavailable.
+
+    Only tokenizer.json is loaded, from the model's Hugging Face repository: with
+    the shared inference server, ingestion workers hold no embedding model. Without
+    it, the local model (loaded for embedding anyway) is the fallback source.
+    """
+    try:
+        from tokenizers import Tokenizer
+
+        try:
+            tokenizer = Tokenizer.from_pretrained(settings.embedding_model)
+        except Exception:
+            if settings.inference_socket_path:
+                raise
+            from simba.services.embedding_service import get_embedding_model
+
+            # Copy: the model's own tokenizer truncates and pads for inference
+            tokenizer = Tokenizer.from_str(get_embedding_model().model.tokenizer.to_str())
+    except Exception as e:
+        logger.warning(f"[Chunker] Embedding tokenizer unavailable, estimating 4 chars/token: {e}")
+        return None
+    tokenizer.no_truncation()
+    tokenizer.no_padding()
+    return tokenizer
+
+
+def _token_ends(text: str) -> np.ndarray | None:
+    """End character offset of every token of the text, or None without a tokenizer."""
+    tokenizer = _get_tokenizer()
+    if tokenizer is None:
+        return None
+
+    # Cut blocks at whitespace so no token straddles two blocks
+    starts = [0]
+    while len(text) - starts[-1] > _TOKENIZE_BLOCK_CHARS:
+        cut = starts[-1] + _TOKENIZE_BLOCK_CHARS
+        match = _WHITESPACE_RE.search(text, cut)
+        if match is None:
+            break
+        starts.append(match.start())
+    blocks = [text[a:b] for a, b in zip(starts, starts[1:] + [len(text)])]
+
+    encodings = tokenizer.encode_batch(blocks, add_special_tokens=False)
+    ends = [
+        np.fromiter((end for _, end in encoding.offsets), dtype=np.int64) + offset
+        for encoding, offset in zip(encodings, starts)
+    ]
+    return np.concatenate(ends) if ends else np.empty(0, dtype=np.int64)
+
+
+def _split_point(text: str, start: int, limit: int) -> int:
+    """Best end for a chunk starting at start and ending no later than limit.
+
+    Prefers the last paragraph break, then line break, sentence end and space
+    in the second half of the window; cuts at limit if there is none.
+    """
+    minimum = start + (limit - start) // 2
+    for separator in _SEPARATORS:
+        index = text.rfind(separator, minimum, limit)
+        if index != -1:
+            return index + len(separator)
+    return limit
 
 
 def chunk_text(
     text: str,
     chunk_size: int = 1000,
     chunk_overlap: int = 200,
+    max_tokens: int | None = None,
 ) -> list[Chunk]:
     """Split text into chunks with overlap.
 
     Args:
         text: The text to split.
         chunk_size: Maximum size of each chunk in characters.
-        chunk_overlap: Number of overlapping characters between chunks.
+        chunk_overlap: Number of overlapping characters between chunks (at most
+            half of a chunk).
+        max_tokens: Maximum embedding model tokens per chunk, including special
+            tokens. Defaults to settings.chunk_max_tokens (0 means no limit).
 
     Returns:
         List of Chunk objects with content and metadata.
     """
-    splitter = RecursiveCharacterTextSplitter(
-        chunk_size=chunk_size,
-        chunk_overlap=chunk_overlap,
-        length_function=len,
-        separators=["\n\n", "\n", ". ", " ", ""],
-    )
-
-    # Use create_documents to get metadata about positions
-    docs = splitter.create_documents([text])
-
-    chunks = []
-    current_pos = 0
-
-    for i, doc in enumerate(docs):
-        content = doc.page_content
+    max_tokens = settings.chunk_max_tokens if max_tokens is None else max_tokens
+    token_budget = max(max_tokens - _SPECIAL_TOKENS, 1) if max_tokens else 0
+    token_ends = _token_ends(text) if token_budget else None
 
-        # Find the actual position of this chunk in the original text
-        start_char = text.find(content, current_pos)
-        if start_char == -1:
-            # Fallback if exact match not found
-            start_char = current_pos
-
-        end_char = start_char + len(content)
+    chunks: list[Chunk] = []
+    match = _NON_WHITESPACE_RE.search(text)
+    start = match.start() if match else len(text)
+    while start < len(text):
+        limit = min(start + chunk_size, len(text))
+        if token_ends is not None:
+            last = int(np.searchsorted(token_ends, start, side="right")) + token_budget - 1
+            if last < len(token_ends):
+                limit = min(limit, int(token_ends[last]))
+        elif token_budget:
+            limit = min(limit, start + token_budget * 4)
 
+        end = limit if limit == len(text) else _split_point(text, start, limit)
+        content = text[start:end].rstrip()
         chunks.append(
             Chunk(
                 content=content,
-                position=i,
-                start_char=start_char,
-                end_char=end_char,
+                position=len(chunks),
+                start_char=start,
+                end_char=start + len(content),
             )
         )
+        if _NON_WHITESPACE_RE.search(text, end) is None:
+            break
+
+        # Next chunk starts on a word boundary about chunk_overlap characters back
+        overlap = min(chunk_overlap, (end - start) // 2)
+        boundary = _WHITESPACE_RE.search(text, end - overlap, end) if overlap else None
+        next_start = boundary.start() if boundary else end
+        match = _NON_WHITESPACE_RE.search(text, next_start)
+        start = match.start() if match else len(text)
+
+    return chunks
+
+
+@dataclass
+class _Block:
+    """Span of a markdown section: prose, or a table/code block split only between lines."""
 
-        # Update position for next search (account for overlap)
-        current_pos = max(start_char + 1, end_char - chunk_overlap)
+    start: int
+    end: int
+    atomic: bool
+    heading_path: list[str]
 
+
+def _markdown_blocks(text: str) -> Iterator[_Block]:
+    """Scan markdown once, line by line, yielding blocks in document order.
+
+    Headings start a new block and are kept with the content that follows
+    them; a heading with no content before the next block is carried into it.
+    """
+    headings: list[tuple[int, str]] = []
+    start = 0  # Start of the open block
+    atomic = False
+    has_content = False  # Open block has more than headings and blank lines
+    fence: str | None = None  # Marker of the open code fence
+
+    def close(end: int) -> Iterator[_Block]:
+        nonlocal start, has_content
+        if has_content:
+            yield _Block(start, end, atomic, [title for _, title in headings])
+            start = end
+        has_content = False
+
+    pos = 0
+    while pos < len(text):
+        newline = text.find("\n", pos)
+        line_end = len(text) if newline == -1 else newline + 1
+        line = text[pos:line_end].rstrip("\n")
+
+        if fence is not None:
+            if line.strip().startswith(fence):
+                fence = None
+                yield from close(line_end)
+                atomic = False
+            pos = line_end
+            continue
+
+        fence_match = _FENCE_RE.match(line)
+        heading = _HEADING_RE.match(line)
+        is_table = line.lstrip().startswith("|")
+        if fence_match:
+            yield from close(pos)
+            fence, atomic, has_content = fence_match.group(1), True, True
+        elif heading:
+            yield from close(pos)
+            level = len(heading.group(1))
+            while headings and headings[-1][0] >= level:
+                headings.pop()
+            headings.append((level, heading.group(2)))
+            atomic = False
+        elif is_table != atomic and line.strip():
+            yield from close(pos)
+            atomic, has_content = is_table, True
+        elif line.strip():
+            has_content = True
+        pos = line_end
+
+    has_content = has_content or bool(text[start:].strip())
+    yield from close(len(text))
+
+
+def _line_groups(
+    text: str, start: int, end: int, chunk_size: int, token_budget: int
+) -> list[tuple[int, int]]:
+    """Split a table or code block between lines into spans within the size limits."""
+    token_ends = _token_ends(text[start:end]) if token_budget else None
+
+    def too_large(a: int, b: int) -> bool:
+        if b - a > chunk_size:
+            return True
+        if token_ends is not None:
+            count = np.searchsorted(token_ends, b - start, side="right") - np.searchsorted(
+                token_ends, a - start, side="right"
+            )
+            return int(count) > token_budget
+        return bool(token_budget) and (b - a) > token_budget * 4
+
+    spans = []
+    group_start = pos = start
+    while pos < end:
+        newline = text.find("\n", pos, end)
+        line_end = end if newline == -1 else newline + 1
+        if pos > group_start and too_large(group_start, line_end):
+            spans.append((group_start, pos))
+            group_start = pos
+        pos = line_end
+    spans.append((group_start, end))
+    return spans
+
+
+def chunk_markdown(
+    text: str,
+    chunk_size: int = 1000,
+    chunk_overlap: int = 200,
+    max_tokens: int | None = None,
+) -> list[Chunk]:
+    """Split markdown into chunks that follow its structure.
+
+    Prose between headings is chunked like chunk_text. Chunks never span two
+    sections, and tables and fenced code blocks are never split mid-line (a
+    block larger than a chunk is split between rows). Text without markdown
+    structure gives the same chunks as chunk_text.
+
+    Args:
+        text: The markdown to split.
+        chunk_size: Maximum size of each chunk in characters.
+        chunk_overlap: Overlapping characters between prose chunks of a section.
+        max_tokens: Maximum embedding model tokens per chunk, including special
+            tokens. Defaults to settings.chunk_max_tokens (0 means no limit).
+
+    Returns:
+        List of Chunk objects with content, metadata and heading path.
+    """
+    max_tokens = settings.chunk_max_tokens if max_tokens is None else max_tokens
+    token_budget = max(max_tokens - _SPECIAL_TOKENS, 1) if max_tokens else 0
+
+    chunks: list[Chunk] = []
+    for block in _markdown_blocks(text):
+        if block.atomic:
+            spans = _line_groups(text, block.start, block.end, chunk_size, token_budget)
+        else:
+            pieces = chunk_text(
+                text[block.start : block.end], chunk_size, chunk_overlap, max_tokens
+            )
+            spans = [(block.start + p.start_char, block.start + p.end_char) for p in pieces]
+
+        for start, end in spans:
+            content = text[start:end]
+            stripped = content.strip()
+            if not stripped:
+                continue
+            start += len(content) - len(content.lstrip())
+            chunks.append(
+                Chunk(
+                    content=stripped,
+                    position=len(chunks),
+                    start_char=start,
+                    end_char=start + len(stripped),
+                    heading_path=block.heading_path,
+                )
+            )
     return chunks
 
 
@@ -84,11 +335,4 @@ def chunk_text_simple(
     Returns:
         List of chunk strings.
     """
-    splitter = RecursiveCharacterTextSplitter(
-        chunk_size=chunk_size,
-        chunk_overlap=chunk_overlap,
-        length_function=len,
-        separators=["\n\n", "\n", ". ", " ", ""],
-    )
-
-    return splitter.split_text(text)
+    return [chunk.content for chunk in chunk_text(text, chunk_size, chunk_overlap)]
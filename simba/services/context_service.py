@@ -0,0 +1,208 @@
+"""Assembly of retrieved chunks into the LLM context.
+
+Retrieved chunks often overlap: neighboring chunks of a document share
+chunk_overlap characters, and several hits can come from the same passage.
+The assembler merges chunks of the same document whose character ranges
+(start_char/end_char) overlap or touch, drops duplicated text and packs the
+resulting passages, best first, into a token budget counted with the LLM's
+tokenizer.
+"""
+
+import logging
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import TYPE_CHECKING
+
+from simba.core.config import settings
+
+if TYPE_CHECKING:
+    from simba.services.retrieval_service import RetrievedChunk
+
+logger = logging.getLogger(__name__)
+
+SEPARATOR = "\n\n---\n\n"
+EMPTY_CONTEXT = "No relevant information found in the knowledge base."
+
+# Chunks separated by at most this many characters (whitespace stripped by the
+# splitter) are treated as contiguous
+_MAX_GAP_CHARS = 2
+# Don't truncate a passage to fewer tokens than this to fill the remaining budget
+_MIN_PASSAGE_TOKENS = 32
+
+
+@dataclass
+class AssembledContext:
+    """LLM context built from retrieved chunks."""
+
+    text: str
+    chunks: list["RetrievedChunk"]  # Chunks included in the context, in rank order
+    passages: int  # Number of merged passages in the context
+    tokens: int  # Tokens in text
+    raw_tokens: int  # Tokens of all chunks concatenated verbatim
+
+    @property
+    def saved_tokens(self) -> int:
+        """Input tokens saved compared to concatenating every chunk verbatim."""
+        return max(self.raw_tokens - self.tokens, 0)
+
+
+@dataclass
+class _Passage:
+    """Merged text of one or more chunks of a document."""
+
+    rank: int  # Best rank among its chunks
+    document_name: str
+    heading_path: list[str]  # Section of its first chunk
+    text: str
+    end_char: int | None
+    chunks: list["RetrievedChunk"]
+
+
+@lru_cache
+def _get_encoding():
+    """Get the tiktoken encoding for the configured LLM, or None if unavailable."""
+    try:
+        import tiktoken
+    except ImportError:
+        logger.warning("[Context] tiktoken not installed, estimating 4 characters per token")
+        return None
+
+    try:
+        if settings.context_tokenizer:
+            return tiktoken.get_encoding(settings.context_tokenizer)
+        model = settings.llm_model.split(":", 1)[-1]
+        try:
+            return tiktoken.encoding_for_model(model)
+        except KeyError:
+            # Non-OpenAI models: a recent BPE is a close enough estimate for budgeting
+            return tiktoken.get_encoding("o200k_base")
+    except Exception as e:
+        # Encodings are downloaded on first use; offline hosts fall back to estimates
+        logger.warning(
+            f"[Context] Could not load tokenizer, estimating 4 characters per token: {e}"
+        )
+        return None
+
+
+def count_tokens(text: str) -> int:
+    """Count the tokens of a text with the LLM's tokenizer."""
+    encoding = _get_encoding()
+    if encoding is None:
+        return (len(text) + 3) // 4
+    return len(encoding.encode(text, disallowed_special=()))
+
+
+def truncate_to_tokens(text: str, max_tokens: int) -> str:
+    """Cut a text to at most max_tokens tokens."""
+    encoding = _get_encoding()
+    if encoding is None:
+        return text[: max_tokens * 4]
+    tokens = encoding.encode(text, disallowed_special=())
+    return text if len(tokens) <= max_tokens else encoding.decode(tokens[:max_tokens])
+
+
+def format_passage(
+    index: int, document_name: str, text: str, heading_path: list[str] | None = None
+) -> str:
+    """Format one passage for the LLM, with its markdown section if known."""
+    source = " > ".join([document_name, *(heading_path or [])])
+    return f"[Source {index}: {source}]\n{text}"
+
+
+def assemble_context(
+    chunks: list["RetrievedChunk"], token_budget: int | None = None
+) -> AssembledContext:
+    """Merge, de-duplicate and pack retrieved chunks into an LLM context.
+
+    Args:
+        chunks: Retrieved chunks in rank order.
+        token_budget: Maximum context tokens. Defaults to settings.context_token_budget
+            (0 means no limit).
+
+    Returns:
+        The assembled context with token accounting.
+    """
+    token_budget = token_budget if token_budget is not None else settings.context_token_budget
+    if not chunks:
+        return AssembledContext(EMPTY_CONTEXT, [], 0, count_tokens(EMPTY_CONTEXT), 0)
+
+    raw_text = SEPARATOR.join(
+        format_passage(i, chunk.document_name, chunk.chunk_text, chunk.heading_path)
+        for i, chunk in enumerate(chunks, 1)
+    )
+    raw_tokens = count_tokens(raw_text)
+
+    passages = sorted(_merge(chunks), key=lambda passage: passage.rank)
+
+    # Greedy packing in rank order; passages that don't fit are skipped so a
+    # smaller, lower-ranked one can still use the remaining budget
+    parts: list[str] = []
+    included: list[RetrievedChunk] = []
+    used = 0
+    separator_tokens = count_tokens(SEPARATOR)
+    for passage in passages:
+        part = format_passage(
+            len(parts) + 1, passage.document_name, passage.text, passage.heading_path
+        )
+        cost = count_tokens(part) + (separator_tokens if parts else 0)
+        if token_budget and used + cost > token_budget:
+            remaining = token_budget - used - (separator_tokens if parts else 0)
+            if parts or remaining < _MIN_PASSAGE_TOKENS:
+                continue
+            # The best passage alone exceeds the budget: keep its beginning
+            part = truncate_to_tokens(part, remaining)
+            cost = remaining
+        parts.append(part)
+        included.extend(passage.chunks)
+        used += cost
+
+    text = SEPARATOR.join(parts) if parts else EMPTY_CONTEXT
+    return AssembledContext(
+        text=text,
+        chunks=sorted(included, key=chunks.index),
+        passages=len(parts),
+        tokens=count_tokens(text),
+        raw_tokens=raw_tokens,
+    )
+
+
+def _merge(chunks: list["RetrievedChunk"]) -> list[_Passage]:
+    """Merge chunks of the same document whose character ranges overlap or touch."""
+    by_document: dict[tuple[str, str], list[tuple[int, RetrievedChunk]]] = {}
+    for rank, chunk in enumerate(chunks):
+        key = (chunk.collection_name, chunk.document_id)
+        by_document.setdefault(key, []).append((rank, chunk))
+
+    passages: list[_Passage] = []
+    seen_texts: set[str] = set()
+    for items in by_document.values():
+        current: _Passage | None = None
+        # Chunks without offsets (e.g. indexed before they were stored) sort first
+        for rank, chunk in sorted(items, key=lambda item: item[1].start_char or -1):
+            start, end = chunk.start_char, chunk.end_char
+            if (
+                current is not None
+                and start is not None
+                and end is not None
+                and current.end_char is not None
+                and start <= current.end_char + _MAX_GAP_CHARS
+            ):
+                if end > current.end_char:
+                    overlap = current.end_char - start
+                    if overlap >= 0:
+                        current.text += chunk.chunk_text[overlap:]
+                    else:
+                        current.text += " " + chunk.chunk_text
+                    current.end_char = end
+                current.rank = min(current.rank, rank)
+                current.chunks.append(chunk)
+                continue
+
+            if chunk.chunk_text in seen_texts:
+                continue
+            seen_texts.add(chunk.chunk_text)
+            current = _Passage(
+                rank, chunk.document_name, chunk.heading_path, chunk.chunk_text, end, [chunk]
+            )
+            passages.append(current)
+    return passages
@@ -0,0 +1,165 @@
+"""Near-duplicate detection for ingestion.
+
+Customer knowledge bases repeat a lot of text: page headers and footers,
+disclaimers, the same FAQ in several PDFs. Two passes keep it out of the
+index before anything is embedded:
+
+- strip_boilerplate removes short lines repeated on many pages of a document.
+- MinHash signatures over word shingles find chunks that are near-duplicates
+  of each other or of chunks already in the collection. Signatures are split
+  into LSH bands stored in the chunk payload ("minhash_bands", keyword
+  index), so the collection itself is the LSH index: candidates are found
+  with one keyword lookup and verified on their stored signatures.
+
+A stored chunk that other documents' chunks duplicated records them in its
+"shared_by" payload field (document ID, name and position of each skipped
+chunk). Deleting the document that owns the chunk hands it over to the next
+document in the list instead of removing the text from the collection.
+"""
+
+import hashlib
+import re
+import zlib
+from collections import Counter
+
+import numpy as np
+
+from simba.core.config import settings
+from simba.services.bm25_service import tokenize
+
+NUM_PERM = 64
+BANDS = 16  # 16 bands x 4 rows: pairs with Jaccard >= ~0.5 share a band with high probability
+_ROWS = NUM_PERM // BANDS
+_SHINGLE_SIZE = 5
+
+# Universal hashing (a * x + b) mod p over 32-bit shingle hashes; fits in uint64
+_PRIME = np.uint64((1 << 32) + 15)
+_rng = np.random.default_rng(1)
+_PERM_A = _rng.integers(1, 1 << 32, NUM_PERM, dtype=np.uint64)
+_PERM_B = _rng.integers(0, 1 << 32, NUM_PERM, dtype=np.uint64)
+
+# Boilerplate lines: short, repeated, and compared with page numbers masked out
+_MAX_BOILERPLATE_LENGTH = 120
+_DIGITS_RE = re.compile(r"\d+")
+_SPACE_RE = re.compile(r"\s+")
+
+
+def strip_boilerplate(text: str, min_repeats: int | None = None) -> str:
+    """Remove page-repeated header and footer lines from parsed text.
+
+    A line is boilerplate if, ignoring case, whitespace and numbers ("Page 3
+    of 12"), it occurs at least min_repeats times and is short. Markdown table
+    rows and lines without letters are kept.
+
+    Args:
+        text: Parsed document text.
+        min_repeats: Minimum occurrences. Defaults to settings.ingestion_boilerplate_min_repeats.
+
+    Returns:
+        Text without boilerplate lines.
+    """
+    min_repeats = min_repeats or settings.ingestion_boilerplate_min_repeats
+    lines = text.split("\n")
+    keys = [_boilerplate_key(line) for line in lines]
+    counts = Counter(key for key in keys if key)
+    repeated = {key for key, count in counts.items() if count >= min_repeats}
+    if not repeated:
+        return text
+    return "\n".join(line for line, key in zip(lines, keys) if key not in repeated)
+
+
+def _boilerplate_key(line: str) -> str | None:
+    """Normalized form of a line that could be boilerplate, else None."""
+    stripped = line.strip()
+    if (
+        not stripped
+        or len(stripped) > _MAX_BOILERPLATE_LENGTH
+        or stripped.startswith("|")
+        or not any(c.isalpha() for c in stripped)
+    ):
+        return None
+    return _SPACE_RE.sub(" ", _DIGITS_RE.sub("#", stripped.lower()))
+
+
+def minhash_signature(text: str) -> np.ndarray | None:
+    """MinHash signature of a text's word shingles.
+
+    Args:
+        text: Chunk text.
+
+    Returns:
+        uint32 array of NUM_PERM values, or None if the text has no words.
+    """
+    tokens = tokenize(text)
+    if not tokens:
+        return None
+    size = min(_SHINGLE_SIZE, len(tokens))
+    shingles = {" ".join(tokens[i : i + size]) for i in range(len(tokens) - size + 1)}
+    hashes = np.fromiter(
+        (zlib.crc32(shingle.encode()) for shingle in shingles), dtype=np.uint64, count=len(shingles)
+    )
+    permuted = ((hashes[:, None] * _PERM_A) % _PRIME + _PERM_B) % _PRIME
+    return permuted.min(axis=0).astype(np.uint32)
+
+
+def band_keys(signature: np.ndarray) -> list[str]:
+    """LSH band keys of a signature (one per band)."""
+    keys = []
+    for band in range(BANDS):
+        rows = signature[band * _ROWS : (band + 1) * _ROWS]
+        keys.append(f"{band}:{hashlib.blake2b(rows.tobytes(), digest_size=8).hexdigest()}")
+    return keys
+
+
+def similarity(a: np.ndarray, b: np.ndarray) -> float:
+    """Estimated Jaccard similarity of two signatures."""
+    return float(np.mean(a == b))
+
+
+def find_duplicates(
+    signatures: list[np.ndarray | None],
+    candidates: list[list[int]],
+    threshold: float | None = None,
+) -> list[int | None]:
+    """Find near-duplicates among new chunks.
+
+    A chunk is a duplicate if its signature matches a candidate (a stored
+    chunk sharing an LSH band) or an earlier non-duplicate chunk of the same
+    batch at or above the threshold.
+
+    Args:
+        signatures: Signatures of the new chunks, in order (None: never a duplicate).
+        candidates: Signatures of stored chunks returned by the LSH lookup.
+        threshold: Minimum estimated Jaccard similarity. Defaults to
+            settings.ingestion_dedup_threshold.
+
+    Returns:
+        Per new chunk: None if it is kept, else the index of the most similar
+        candidate it duplicates, or -1 if it duplicates an earlier chunk of the batch.
+    """
+    threshold = threshold if threshold is not None else settings.ingestion_dedup_threshold
+    stored = np.asarray(candidates, dtype=np.uint32).reshape(-1, NUM_PERM)
+
+    kept: list[np.ndarray] = []
+    kept_bands: dict[str, list[int]] = {}
+    matches: list[int | None] = []
+    for signature in signatures:
+        if signature is None:
+            matches.append(None)
+            continue
+        if len(stored):
+            scores = np.mean(stored == signature, axis=1)
+            best = int(np.argmax(scores))
+            if scores[best] >= threshold:
+                matches.append(best)
+                continue
+        keys = band_keys(signature)
+        nearby = {i for key in keys for i in kept_bands.get(key, ())}
+        if any(similarity(kept[i], signature) >= threshold for i in nearby):
+            matches.append(-1)
+            continue
+        for key in keys:
+            kept_bands.setdefault(key, []).append(len(kept))
+        kept.append(signature)
+        matches.append(None)
+    return matches
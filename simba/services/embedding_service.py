@@ -1,19 +1,31 @@
 """Embedding service using FastEmbed."""
 
 import logging
+import multiprocessing
+import threading
 from functools import lru_cache
 
+import numpy as np
 from cachetools import TTLCache
-from fastembed import SparseTextEmbedding, TextEmbedding
+from fastembed import LateInteractionTextEmbedding, SparseTextEmbedding, TextEmbedding
 
+from simba.core import thread_budget
 from simba.core.config import settings
+from simba.services import bm25_service, inference_client
 from simba.services.metrics_service import EMBEDDING_LATENCY, track_latency
 
 logger = logging.getLogger(__name__)
 
+# Sparse vector as (indices uint32/int32, values float32) arrays
+SparseEmbedding = tuple[np.ndarray, np.ndarray]
+
 # TTL cache for query embeddings (5 min TTL, max 1000 entries)
 _embedding_cache: TTLCache = TTLCache(maxsize=1000, ttl=300)
 _sparse_embedding_cache: TTLCache = TTLCache(maxsize=1000, ttl=300)
+_late_interaction_cache: TTLCache = TTLCache(maxsize=1000, ttl=300)
+# TTLCache isn't thread-safe (expiry mutates it on reads); queries are embedded
+# from request handlers, agent tool threads and speculative retrievals at once
+_cache_lock = threading.Lock()
 
 
 @lru_cache
@@ -22,29 +34,63 @@ def get_embedding_model() -> TextEmbedding:
 
     The model is downloaded and cached on first use.
     """
-    return TextEmbedding(model_name=settings.embedding_model)
+    return TextEmbedding(
+        model_name=settings.embedding_model,
+        threads=thread_budget.onnx_threads("embedding"),
+    )
 
 
-def get_embeddings(texts: list[str]) -> list[list[float]]:
+def get_embeddings(
+    texts: list[str], batch_size: int = 256, parallel: int | None = None
+) -> np.ndarray:
     """Generate embeddings for a list of texts.
 
     Args:
         texts: List of text strings to embed.
+        batch_size: Texts per ONNX call for the in-process model.
+        parallel: FastEmbed data-parallel worker count (0 = one per core), see
+            get_ingestion_parallelism(). Always runs in-process, bypassing the
+            inference server. None embeds in a single ONNX session.
 
     Returns:
-        List of embedding vectors (each vector is a list of floats).
+        Contiguous float32 array of shape (len(texts), embedding_dimensions).
     """
     with track_latency(EMBEDDING_LATENCY):
-        model = get_embedding_model()
+        if parallel is not None:
+            return compute_embeddings(texts, batch_size, parallel)
+
+        # Prefer the shared inference server, fall back to the in-process model
+        embeddings = inference_client.request("embed", {"texts": texts})
+        if embeddings is None:
+            embeddings = compute_embeddings(texts, batch_size)
+
+    return embeddings
+
+
+def compute_embeddings(
+    texts: list[str], batch_size: int = 256, parallel: int | None = None
+) -> np.ndarray:
+    """Generate embeddings with the in-process model.
 
-        # FastEmbed returns a generator, convert to list
-        embeddings_generator = model.embed(texts)
-        embeddings = [embedding.tolist() for embedding in embeddings_generator]
+    Args:
+        texts: List of text strings to embed.
+        batch_size: Texts per ONNX call.
+        parallel: FastEmbed data-parallel worker count, or None for a single session.
+
+    Returns:
+        Contiguous float32 array of shape (len(texts), embedding_dimensions).
+    """
+    model = get_embedding_model()
 
+    # Fill a preallocated matrix from FastEmbed's generator of per-text vectors
+    # (data-parallel workers return batches in input order)
+    embeddings = np.empty((len(texts), settings.embedding_dimensions), dtype=np.float32)
+    for i, embedding in enumerate(model.embed(texts, batch_size=batch_size, parallel=parallel)):
+        embeddings[i] = embedding
     return embeddings
 
 
-def get_embedding(text: str) -> list[float]:
+def get_embedding(text: str) -> np.ndarray:
     """Generate embedding for a single text.
 
     Uses TTL cache to avoid recomputing embeddings for repeated queries.
@@ -53,20 +99,72 @@ def get_embedding(text: str) -> list[float]:
         text: Text string to embed.
 
     Returns:
-        Embedding vector as a list of floats.
+        Read-only float32 embedding vector.
     """
     # Check cache first
-    if text in _embedding_cache:
-        return _embedding_cache[text]
+    with _cache_lock:
+        embedding = _embedding_cache.get(text)
+    if embedding is not None:
+        return embedding
 
-    # Generate and cache
-    embeddings = get_embeddings([text])
-    embedding = embeddings[0]
-    _embedding_cache[text] = embedding
+    # Generate and cache (copy so the cache holds only this row, not the batch)
+    embedding = get_embeddings([text])[0].copy()
+    embedding.setflags(write=False)
+    with _cache_lock:
+        _embedding_cache[text] = embedding
 
     return embedding
 
 
+def prefetch_embeddings(texts: list[str]) -> None:
+    """Embed the texts missing from the query embedding cache in one batch.
+
+    For queries known together (e.g. concurrent rag calls of one agent turn):
+    their get_embedding() calls then hit the cache instead of each running
+    the model.
+
+    Args:
+        texts: Text strings to embed.
+    """
+    with _cache_lock:
+        missing = list(dict.fromkeys(text for text in texts if text not in _embedding_cache))
+    if not missing:
+        return
+    embeddings = []
+    for embedding in get_embeddings(missing):
+        embedding = embedding.copy()
+        embedding.setflags(write=False)
+        embeddings.append(embedding)
+    with _cache_lock:
+        _embedding_cache.update(zip(missing, embeddings))
+
+
+def get_ingestion_parallelism(chunk_count: int, parallel: int) -> int | None:
+    """Decide whether a document is large enough for data-parallel embedding.
+
+    Daemonic processes can't start the FastEmbed worker processes, so inside
+    one (e.g. a Celery prefork pool child) documents are always embedded
+    serially; run the worker with a threads or solo pool to embed in parallel.
+
+    Args:
+        chunk_count: Number of chunks in the document.
+        parallel: Configured worker count (0 = one per available core).
+
+    Returns:
+        Worker count to pass as `parallel`, or None to embed in one session.
+    """
+    threshold = settings.ingestion_parallel_threshold
+    if threshold <= 0 or chunk_count < threshold:
+        return None
+    if multiprocessing.current_process().daemon:
+        logger.info(
+            f"Embedding {chunk_count} chunks serially: daemonic worker processes "
+            "can't start data-parallel workers"
+        )
+        return None
+    return parallel or thread_budget.available_cores()
+
+
 # --- Sparse Embeddings (SPLADE) ---
 
 
@@ -77,54 +175,197 @@ def get_sparse_embedding_model() -> SparseTextEmbedding:
     The model is downloaded and cached on first use.
     """
     logger.info(f"Loading sparse embedding model: {settings.retrieval_sparse_model}")
-    return SparseTextEmbedding(model_name=settings.retrieval_sparse_model)
+    return SparseTextEmbedding(
+        model_name=settings.retrieval_sparse_model,
+        threads=thread_budget.onnx_threads("sparse"),
+    )
+
+
+def get_sparse_embeddings(
+    texts: list[str],
+    batch_size: int = 256,
+    parallel: int | None = None,
+    backend: str | None = None,
+) -> list[SparseEmbedding]:
+    """Generate sparse embeddings for a list of document texts.
+
+    Args:
+        texts: List of text strings to embed.
+        batch_size: Texts per ONNX call for the in-process model.
+        parallel: FastEmbed data-parallel worker count, see get_embeddings().
+        backend: "splade" or "bm25". Defaults to settings.retrieval_sparse_backend.
+
+    Returns:
+        List of (indices, values) array pairs for sparse vectors.
+    """
+    if (backend or settings.retrieval_sparse_backend) == "bm25":
+        return bm25_service.encode_documents(texts)
+
+    if parallel is not None:
+        return compute_sparse_embeddings(texts, batch_size, parallel)
+
+    # Prefer the shared inference server, fall back to the in-process model
+    results = inference_client.request("sparse_embed", {"texts": texts})
+    if results is None:
+        return compute_sparse_embeddings(texts, batch_size)
+    return [(indices, values) for indices, values in results]
 
 
-def get_sparse_embeddings(texts: list[str]) -> list[tuple[list[int], list[float]]]:
-    """Generate sparse embeddings for a list of texts.
+def compute_sparse_embeddings(
+    texts: list[str], batch_size: int = 256, parallel: int | None = None
+) -> list[SparseEmbedding]:
+    """Generate sparse embeddings with the in-process model.
 
     Args:
         texts: List of text strings to embed.
+        batch_size: Texts per ONNX call.
+        parallel: FastEmbed data-parallel worker count, or None for a single session.
 
     Returns:
-        List of (indices, values) tuples for sparse vectors.
+        List of (indices, values) array pairs for sparse vectors.
     """
     model = get_sparse_embedding_model()
 
     # SparseTextEmbedding returns a generator of SparseEmbedding objects
-    embeddings_generator = model.embed(texts)
-    results = []
-
-    for sparse_embedding in embeddings_generator:
-        # SparseEmbedding has .indices and .values attributes
-        results.append(
-            (
-                sparse_embedding.indices.tolist(),
-                sparse_embedding.values.tolist(),
-            )
+    # with .indices and .values arrays
+    return [
+        (
+            sparse_embedding.indices.astype(np.int32, copy=False),
+            sparse_embedding.values.astype(np.float32, copy=False),
         )
-
-    return results
+        for sparse_embedding in model.embed(texts, batch_size=batch_size, parallel=parallel)
+    ]
 
 
-def get_sparse_embedding(text: str) -> tuple[list[int], list[float]]:
-    """Generate sparse embedding for a single text.
+def get_sparse_embedding(text: str, backend: str | None = None) -> SparseEmbedding:
+    """Generate sparse embedding for a single query.
 
     Uses TTL cache to avoid recomputing embeddings for repeated queries.
+    SPLADE encodes queries like documents; BM25 uses query-side weights.
 
     Args:
         text: Text string to embed.
+        backend: "splade" or "bm25". Defaults to settings.retrieval_sparse_backend.
 
     Returns:
-        Tuple of (indices, values) for sparse vector.
+        Tuple of (indices, values) arrays for sparse vector.
     """
+    backend = backend or settings.retrieval_sparse_backend
+    key = (backend, text)
+
     # Check cache first
-    if text in _sparse_embedding_cache:
-        return _sparse_embedding_cache[text]
+    with _cache_lock:
+        embedding = _sparse_embedding_cache.get(key)
+    if embedding is not None:
+        return embedding
 
     # Generate and cache
-    embeddings = get_sparse_embeddings([text])
-    embedding = embeddings[0]
-    _sparse_embedding_cache[text] = embedding
+    if backend == "bm25":
+        embedding = bm25_service.encode_query(text)
+    else:
+        embedding = get_sparse_embeddings([text], backend=backend)[0]
+    with _cache_lock:
+        _sparse_embedding_cache[key] = embedding
+
+    return embedding
+
+
+# --- Late-interaction (ColBERT) multivectors ---
+
+
+@lru_cache
+def get_late_interaction_model() -> LateInteractionTextEmbedding:
+    """Get cached late-interaction model instance (one vector per token).
+
+    The model is downloaded and cached on first use.
+    """
+    logger.info(f"Loading late-interaction model: {settings.retrieval_late_interaction_model}")
+    return LateInteractionTextEmbedding(
+        model_name=settings.retrieval_late_interaction_model,
+        threads=thread_budget.onnx_threads("late_interaction"),
+    )
+
+
+def get_late_interaction_embeddings(
+    texts: list[str], batch_size: int = 32, parallel: int | None = None
+) -> list[np.ndarray]:
+    """Generate per-token embeddings for a list of document texts.
+
+    Args:
+        texts: List of text strings to embed.
+        batch_size: Texts per ONNX call for the in-process model.
+        parallel: FastEmbed data-parallel worker count, see get_embeddings().
+
+    Returns:
+        One float32 array of shape (tokens, retrieval_late_interaction_dimensions)
+        per text.
+    """
+    if parallel is not None:
+        return compute_late_interaction_embeddings(texts, batch_size, parallel)
+
+    # Prefer the shared inference server, fall back to the in-process model
+    results = inference_client.request("late_embed", {"texts": texts})
+    if results is None:
+        return compute_late_interaction_embeddings(texts, batch_size)
+    return results
+
+
+def compute_late_interaction_embeddings(
+    texts: list[str], batch_size: int = 32, parallel: int | None = None
+) -> list[np.ndarray]:
+    """Generate per-token document embeddings with the in-process model.
+
+    Args:
+        texts: List of text strings to embed.
+        batch_size: Texts per ONNX call.
+        parallel: FastEmbed data-parallel worker count, or None for a single session.
+
+    Returns:
+        One float32 (tokens, dimensions) array per text.
+    """
+    model = get_late_interaction_model()
+    return [
+        np.asarray(embedding, dtype=np.float32)
+        for embedding in model.embed(texts, batch_size=batch_size, parallel=parallel)
+    ]
+
+
+def compute_late_interaction_queries(texts: list[str]) -> list[np.ndarray]:
+    """Generate per-token query embeddings with the in-process model.
+
+    Queries are encoded differently from documents (ColBERT pads them with
+    [MASK] tokens that act as query expansion).
+
+    Args:
+        texts: Queries to embed.
+
+    Returns:
+        One float32 (tokens, dimensions) array per query.
+    """
+    model = get_late_interaction_model()
+    return [np.asarray(embedding, dtype=np.float32) for embedding in model.query_embed(texts)]
+
+
+def get_late_interaction_query(text: str) -> np.ndarray:
+    """Generate the per-token embedding of a query.
+
+    Uses TTL cache to avoid recomputing embeddings for repeated queries.
+
+    Args:
+        text: Query to embed.
+
+    Returns:
+        Read-only float32 array of shape (tokens, dimensions).
+    """
+    with _cache_lock:
+        embedding = _late_interaction_cache.get(text)
+    if embedding is not None:
+        return embedding
+
+    results = inference_client.request("late_query", {"texts": [text]})
+    embedding = (results or compute_late_interaction_queries([text]))[0]
+    embedding.setflags(write=False)
+    with _cache_lock:
+        _late_interaction_cache[text] = embedding
 
     return embedding
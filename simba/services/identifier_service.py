@@ -0,0 +1,60 @@
+"""Detection of exact identifiers in queries.
+
+Order numbers, SKUs and error codes ("ERR-4012", "AB12345", "#100234") are
+poorly served by dense embeddings but trivially found by a full-text lookup
+on chunk_text. retrieve() uses these helpers to route such tokens to the
+payload index and to verify that a hit contains the identifier verbatim.
+"""
+
+import re
+
+from simba.services.bm25_service import tokenize
+
+# Alphanumeric runs, optionally joined by - _ . / (e.g. "ERR-4012", "v2.3.1", "A/B-12")
+_CANDIDATE_RE = re.compile(r"[A-Za-z0-9]+(?:[-_./][A-Za-z0-9]+)*")
+_MIN_LENGTH = 4
+_MIN_DIGITS_NUMERIC = 5  # Pure numbers shorter than this are usually quantities or years
+
+# Identifier-only queries may carry a few words of context ("order 123456")
+_MAX_CONTEXT_WORDS = 2
+
+
+def extract_identifiers(query: str) -> list[str]:
+    """Extract identifier-like tokens from a query.
+
+    A token is an identifier if it contains a digit and either a letter
+    ("ERR-4012", "SKU8841") or at least five digits ("100234").
+
+    Args:
+        query: User query.
+
+    Returns:
+        Distinct identifiers in query order.
+    """
+    identifiers: list[str] = []
+    for candidate in _CANDIDATE_RE.findall(query):
+        if len(candidate) < _MIN_LENGTH or candidate in identifiers:
+            continue
+        digits = sum(c.isdigit() for c in candidate)
+        has_letter = any(c.isalpha() for c in candidate)
+        if digits and (has_letter or digits >= _MIN_DIGITS_NUMERIC):
+            identifiers.append(candidate)
+    return identifiers
+
+
+def is_identifier_lookup(query: str, identifiers: list[str]) -> bool:
+    """Whether a query is essentially just identifiers (e.g. "order 100234").
+
+    Such queries are answered by the full-text lookup alone when it finds
+    exact matches, without embedding, vector search or reranking.
+    """
+    remainder = query
+    for identifier in identifiers:
+        remainder = remainder.replace(identifier, " ")
+    return len(tokenize(remainder)) <= _MAX_CONTEXT_WORDS
+
+
+def contains_identifier(text: str, identifier: str) -> bool:
+    """Whether text contains the identifier verbatim (case-insensitive, whole token)."""
+    pattern = rf"(?<![A-Za-z0-9]){re.escape(identifier)}(?![A-Za-z0-9])"
+    return re.search(pattern, text, re.IGNORECASE) is not None
@@ -0,0 +1,166 @@
+"""Client for the local inference server.
+
+API and worker processes use this module to send embedding and rerank
+requests to the inference server (see inference_server.py) over a Unix
+socket. Each frame is a JSON header followed by the raw bytes of any NumPy
+arrays it references, so embeddings cross the socket as float32 buffers
+rather than JSON numbers.
+
+`request()` returns None whenever the server is disabled, unreachable or
+fails, so callers can fall back to their in-process models.
+"""
+
+import json
+import logging
+import socket
+import struct
+import threading
+import time
+from typing import Any
+
+import numpy as np
+
+from simba.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Frame prefix: JSON header length, array blob length
+_PREFIX = struct.Struct("!IQ")
+
+# One connection per thread: requests on a connection are sequential
+_local = threading.local()
+_unavailable_until: float = 0.0
+
+
+def is_enabled() -> bool:
+    """Return True when an inference server socket is configured."""
+    return bool(settings.inference_socket_path)
+
+
+def request(op: str, payload: dict[str, Any]) -> Any | None:
+    """Send a request to the inference server.
+
+    Args:
+        op: Operation name ("embed", "sparse_embed", "late_embed", "late_query" or
+            "rerank").
+        payload: Operation arguments.
+
+    Returns:
+        The operation result, or None if the server is disabled or unavailable.
+    """
+    global _unavailable_until
+
+    if not is_enabled() or time.monotonic() < _unavailable_until:
+        return None
+
+    try:
+        conn = _get_connection()
+        send_message(conn, {"op": op, **payload})
+        response = recv_message(conn)
+    except (OSError, ValueError) as e:
+        _close_connection()
+        _unavailable_until = time.monotonic() + settings.inference_retry_interval_s
+        logger.warning(f"Inference server unavailable, using in-process models: {e}")
+        return None
+
+    if not response.get("ok"):
+        logger.warning(f"Inference server error for '{op}': {response.get('error')}")
+        return None
+
+    return response["result"]
+
+
+def _get_connection() -> socket.socket:
+    """Get this thread's connection to the inference server, connecting if needed."""
+    conn = getattr(_local, "conn", None)
+    if conn is None:
+        conn = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        conn.settimeout(settings.inference_timeout_s)
+        try:
+            conn.connect(settings.inference_socket_path)
+        except OSError:
+            conn.close()
+            raise
+        _local.conn = conn
+    return conn
+
+
+def _close_connection() -> None:
+    """Drop this thread's connection so the next request reconnects."""
+    conn = getattr(_local, "conn", None)
+    if conn is not None:
+        try:
+            conn.close()
+        except OSError:
+            pass
+        _local.conn = None
+
+
+def encode_message(message: dict[str, Any]) -> bytes:
+    """Encode a message as a frame, moving NumPy arrays into the binary blob."""
+    blobs: list[bytes] = []
+    offset = 0
+
+    def pack(value: Any) -> Any:
+        nonlocal offset
+        if isinstance(value, np.ndarray):
+            data = np.ascontiguousarray(value).tobytes()
+            ref = {
+                "__array__": True,
+                "dtype": value.dtype.str,
+                "shape": list(value.shape),
+                "offset": offset,
+                "nbytes": len(data),
+            }
+            blobs.append(data)
+            offset += len(data)
+            return ref
+        if isinstance(value, dict):
+            return {k: pack(v) for k, v in value.items()}
+        if isinstance(value, list | tuple):
+            return [pack(v) for v in value]
+        return value
+
+    header = json.dumps(pack(message)).encode()
+    return _PREFIX.pack(len(header), offset) + header + b"".join(blobs)
+
+
+def decode_message(header: bytes, blob: bytes) -> dict[str, Any]:
+    """Decode a frame's header, resolving array references into the blob."""
+    view = memoryview(blob)
+
+    def unpack(value: Any) -> Any:
+        if isinstance(value, dict):
+            if value.get("__array__"):
+                start = value["offset"]
+                data = view[start : start + value["nbytes"]]
+                return np.frombuffer(data, dtype=value["dtype"]).reshape(value["shape"])
+            return {k: unpack(v) for k, v in value.items()}
+        if isinstance(value, list):
+            return [unpack(v) for v in value]
+        return value
+
+    return unpack(json.loads(header))
+
+
+def send_message(conn: socket.socket, message: dict[str, Any]) -> None:
+    """Write a frame to a blocking socket."""
+    conn.sendall(encode_message(message))
+
+
+def recv_message(conn: socket.socket) -> dict[str, Any]:
+    """Read a frame from a blocking socket."""
+    header_len, blob_len = _PREFIX.unpack(_recv_exactly(conn, _PREFIX.size))
+    header = _recv_exactly(conn, header_len)
+    return decode_message(header, _recv_exactly(conn, blob_len))
+
+
+def _recv_exactly(conn: socket.socket, size: int) -> bytes:
+    """Read exactly size bytes or raise ConnectionError if the peer closed."""
+    buf = bytearray()
+    while len(buf) < size:
+        chunk = conn.recv(size - len(buf))
+        if not chunk:
+            raise ConnectionError("Inference server closed the connection")
+        buf.extend(chunk)
+    return bytes(buf)
@@ -0,0 +1,205 @@
+"""Local inference server shared by all API and worker processes.
+
+Owns one copy of the dense embedding, sparse embedding and cross-encoder
+models, and serves them over a Unix socket using the framing from
+inference_client.py. Requests arriving from different clients within
+`inference_batch_wait_ms` are merged into a single model call.
+
+Usage:
+    uv run simba inference --socket /tmp/simba-inference.sock
+"""
+
+import asyncio
+import logging
+import os
+import struct
+from collections.abc import Callable
+from pathlib import Path
+from typing import Any
+
+from simba.core import thread_budget
+from simba.core.config import settings
+from simba.services.inference_client import decode_message, encode_message
+
+logger = logging.getLogger(__name__)
+
+_PREFIX = struct.Struct("!IQ")
+
+
+class _Batcher:
+    """Merges concurrent requests for one model into batched calls.
+
+    Each request submits a list of items; the batcher concatenates items from
+    requests queued within the batch window, runs the model once in a worker
+    thread, and splits the results back per request.
+    """
+
+    def __init__(self, name: str, run_batch: Callable[[list[Any]], list[Any]]):
+        self.name = name
+        self.run_batch = run_batch
+        self.queue: asyncio.Queue[tuple[list[Any], asyncio.Future]] = asyncio.Queue()
+
+    async def submit(self, items: list[Any]) -> list[Any]:
+        """Queue items and wait for their results."""
+        future = asyncio.get_running_loop().create_future()
+        await self.queue.put((items, future))
+        return await future
+
+    async def run(self) -> None:
+        """Consume the queue forever, one batched model call at a time."""
+        loop = asyncio.get_running_loop()
+        wait_s = settings.inference_batch_wait_ms / 1000
+
+        while True:
+            batch = [await self.queue.get()]
+            size = len(batch[0][0])
+            deadline = loop.time() + wait_s
+
+            while size < settings.inference_max_batch_size:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    entry = await asyncio.wait_for(self.queue.get(), timeout)
+                except TimeoutError:
+                    break
+                batch.append(entry)
+                size += len(entry[0])
+
+            flat = [item for items, _ in batch for item in items]
+            try:
+                results = await asyncio.to_thread(self.run_batch, flat)
+            except Exception as e:
+                logger.exception(f"[Inference] {self.name} batch of {len(flat)} failed")
+                for _, future in batch:
+                    if not future.done():
+                        future.set_exception(e)
+                continue
+
+            logger.debug(f"[Inference] {self.name}: {len(batch)} requests, {len(flat)} items")
+            offset = 0
+            for items, future in batch:
+                if not future.done():
+                    future.set_result(results[offset : offset + len(items)])
+                offset += len(items)
+
+
+def _build_batchers() -> dict[str, _Batcher]:
+    """Create one batcher per operation, backed by the in-process models."""
+    from simba.services import embedding_service, reranker_service
+
+    return {
+        "embed": _Batcher("embed", embedding_service.compute_embeddings),
+        "sparse_embed": _Batcher("sparse_embed", embedding_service.compute_sparse_embeddings),
+        "rerank": _Batcher("rerank", reranker_service.compute_scores),
+        # Late-interaction model loads on first use (only collections that rerank with it)
+        "late_embed": _Batcher("late_embed", embedding_service.compute_late_interaction_embeddings),
+        "late_query": _Batcher("late_query", embedding_service.compute_late_interaction_queries),
+    }
+
+
+async def _read_message(reader: asyncio.StreamReader) -> dict[str, Any]:
+    """Read a frame (see inference_client.encode_message)."""
+    header_len, blob_len = _PREFIX.unpack(await reader.readexactly(_PREFIX.size))
+    header = await reader.readexactly(header_len)
+    blob = await reader.readexactly(blob_len) if blob_len else b""
+    return decode_message(header, blob)
+
+
+async def _write_message(writer: asyncio.StreamWriter, message: dict[str, Any]) -> None:
+    """Write a frame (see inference_client.encode_message)."""
+    writer.write(encode_message(message))
+    await writer.drain()
+
+
+async def _handle_client(
+    batchers: dict[str, _Batcher],
+    reader: asyncio.StreamReader,
+    writer: asyncio.StreamWriter,
+) -> None:
+    """Serve requests from one client connection until it disconnects."""
+    try:
+        while True:
+            try:
+                message = await _read_message(reader)
+            except asyncio.IncompleteReadError:
+                break
+
+            op = message.get("op")
+            try:
+                if op in ("embed", "sparse_embed", "late_embed", "late_query"):
+                    result = await batchers[op].submit(message["texts"])
+                elif op == "rerank":
+                    result = await batchers[op].submit(message["pairs"])
+                elif op == "ping":
+                    result = "pong"
+                else:
+                    raise ValueError(f"Unknown operation: {op}")
+                await _write_message(writer, {"ok": True, "result": result})
+            except Exception as e:
+                await _write_message(writer, {"ok": False, "error": str(e)})
+    finally:
+        writer.close()
+
+
+def _preload_models() -> None:
+    """Load all models before accepting connections."""
+    from simba.services import embedding_service, reranker_service
+
+    logger.info(f"[Inference] Loading embedding model: {settings.embedding_model}")
+    embedding_service.get_embedding_model()
+    logger.info(f"[Inference] Loading sparse model: {settings.retrieval_sparse_model}")
+    embedding_service.get_sparse_embedding_model()
+    logger.info(f"[Inference] Loading reranker model: {settings.reranker_model}")
+    reranker_service.get_reranker()
+
+
+async def serve(socket_path: str) -> None:
+    """Run the inference server on a Unix socket until cancelled.
+
+    Args:
+        socket_path: Filesystem path of the Unix socket to listen on.
+    """
+    if settings.process_role == "api":
+        settings.process_role = "inference"
+    thread_budget.check_thread_budget()
+
+    # The server computes locally; never route its own calls back to a socket
+    settings.inference_socket_path = None
+
+    await asyncio.to_thread(_preload_models)
+
+    batchers = _build_batchers()
+    tasks = [asyncio.create_task(b.run()) for b in batchers.values()]
+
+    path = Path(socket_path)
+    path.unlink(missing_ok=True)
+    server = await asyncio.start_unix_server(
+        lambda r, w: _handle_client(batchers, r, w), path=str(path)
+    )
+    # Only the owning user (the API and worker processes) may connect
+    os.chmod(path, 0o600)
+    logger.info(f"[Inference] Listening on {path}")
+
+    try:
+        async with server:
+            await server.serve_forever()
+    finally:
+        for task in tasks:
+            task.cancel()
+        path.unlink(missing_ok=True)
+
+
+def main(socket_path: str | None = None) -> None:
+    """Entry point for `simba inference`."""
+    logging.basicConfig(
+        level=logging.INFO, format="%(asctime)s - %(name)s - %(levelname)s - %(message)s"
+    )
+    path = socket_path or settings.inference_socket_path
+    if not path:
+        raise SystemExit("Set --socket or INFERENCE_SOCKET_PATH")
+
+    try:
+        asyncio.run(serve(path))
+    except KeyboardInterrupt:
+        pass
@@ -1,18 +1,27 @@
 """Document ingestion service - orchestrates the full pipeline."""
 
 import logging
+import time
 from uuid import uuid4
 
+import numpy as np
 from sqlalchemy.orm import Session
 
+from simba.core.config import settings
 from simba.models import Document
 from simba.services import (
+    answer_cache_service,
     chunker_service,
+    dedup_service,
     embedding_service,
+    language_service,
     parser_service,
-    qdrant_service,
+    profile_service,
+    routing_service,
     storage_service,
+    vector_store_service,
 )
+from simba.services.metrics_service import INGESTION_EMBEDDING_THROUGHPUT
 
 logger = logging.getLogger(__name__)
 
@@ -22,8 +31,8 @@ def ingest_document(document_id: str, db: Session) -> None:
 
     Pipeline steps:
     1. Download file from MinIO
-    2. Parse document to extract text
-    3. Chunk text into smaller pieces
+    2. Parse document to extract text (minus repeated headers/footers)
+    3. Chunk text into smaller pieces, dropping near-duplicate chunks
     4. Generate embeddings for each chunk
     5. Store embeddings in Qdrant
 
@@ -61,50 +70,148 @@ def ingest_document(document_id: str, db: Session) -> None:
         if not text.strip():
             raise ValueError("Document parsing resulted in empty text")
 
+        if settings.ingestion_strip_boilerplate:
+            stripped = dedup_service.strip_boilerplate(text)
+            logger.info(f"Stripped {len(text) - len(stripped)} characters of repeated boilerplate")
+            text = stripped
+
+        # Chunking and sparse settings come from the collection's profile
+        collection_name = f"{document.organization_id}_{document.collection.name}"
+        profile = profile_service.get_profile(collection_name)
+
         # Step 3: Chunk text
         logger.info(f"Chunking text ({len(text)} characters)")
-        chunks = chunker_service.chunk_text(text)
+        small_units = profile.chunking_mode == "small_to_big"
+        split = (
+            chunker_service.chunk_markdown
+            if settings.chunk_markdown
+            else chunker_service.chunk_text
+        )
+        if small_units:
+            chunks = split(text, settings.chunk_small_size, settings.chunk_small_overlap)
+        else:
+            chunks = split(text, profile.chunk_size, profile.chunk_overlap)
         logger.info(f"Created {len(chunks)} chunks")
 
-        # Step 4: Generate embeddings (dense + sparse)
-        logger.info("Generating dense embeddings")
-        chunk_texts = [chunk.content for chunk in chunks]
-        embeddings = embedding_service.get_embeddings(chunk_texts)
+        # Ensure collection exists with org namespace
+        vector_store_service.create_collection(collection_name)
 
-        logger.info("Generating sparse embeddings")
-        sparse_embeddings = embedding_service.get_sparse_embeddings(chunk_texts)
+        # Drop near-duplicates of chunks already in the collection or in this document
+        signatures = [dedup_service.minhash_signature(chunk.content) for chunk in chunks]
+        all_chunks = chunks
+        shared: dict[str, list[dict]] = {}
+        if settings.ingestion_dedup:
+            chunks, signatures, shared = _drop_duplicates(
+                collection_name, document_id, document.name, chunks, signatures
+            )
 
-        # Step 5: Store in Qdrant
-        logger.info(f"Storing {len(embeddings)} vectors (dense + sparse) in Qdrant")
+        # A document made only of already-indexed text has nothing left to store
+        if chunks:
+            # Step 4: Generate embeddings (dense + sparse)
+            chunk_texts = [chunk.content for chunk in chunks]
 
-        # Ensure collection exists with org namespace
-        collection_name = f"{document.organization_id}_{document.collection.name}"
-        qdrant_service.create_collection(collection_name)
+            parallel = embedding_service.get_ingestion_parallelism(
+                len(chunks), settings.ingestion_embed_parallel
+            )
+            logger.info(f"Generating dense embeddings (parallel={parallel})")
+            start = time.perf_counter()
+            embeddings = embedding_service.get_embeddings(
+                chunk_texts, batch_size=settings.ingestion_embed_batch_size, parallel=parallel
+            )
+            _report_throughput(document_id, "embedding", parallel, len(chunks), start)
+
+            parallel = embedding_service.get_ingestion_parallelism(
+                len(chunks), settings.ingestion_sparse_parallel
+            )
+            logger.info(f"Generating sparse embeddings (parallel={parallel})")
+            start = time.perf_counter()
+            sparse_embeddings = embedding_service.get_sparse_embeddings(
+                chunk_texts,
+                batch_size=settings.ingestion_sparse_batch_size,
+                parallel=parallel,
+                backend=profile.sparse_backend,
+            )
+            _report_throughput(document_id, "sparse", parallel, len(chunks), start)
 
-        # Prepare points for Qdrant (dense + sparse vectors)
-        points = []
-        for i, (chunk, embedding, sparse) in enumerate(zip(chunks, embeddings, sparse_embeddings)):
-            point_id = str(uuid4())
-            points.append(
+            # Token vectors for late-interaction reranking, if the profile uses it
+            multivectors = None
+            if profile.late_interaction:
+                parallel = embedding_service.get_ingestion_parallelism(
+                    len(chunks), settings.ingestion_late_interaction_parallel
+                )
+                logger.info(f"Generating late-interaction embeddings (parallel={parallel})")
+                start = time.perf_counter()
+                multivectors = embedding_service.get_late_interaction_embeddings(
+                    chunk_texts,
+                    batch_size=settings.ingestion_late_interaction_batch_size,
+                    parallel=parallel,
+                )
+                _report_throughput(document_id, "late_interaction", parallel, len(chunks), start)
+
+            # Step 5: Store in Qdrant
+            logger.info(f"Storing {len(embeddings)} vectors (dense + sparse) in Qdrant")
+
+            # Prepare payloads; vectors stay as NumPy arrays through the upsert
+            payloads = [
                 {
-                    "id": point_id,
-                    "vector": embedding,
-                    "sparse_indices": sparse[0],
-                    "sparse_values": sparse[1],
-                    "payload": {
-                        "document_id": document_id,
-                        "document_name": document.name,
-                        "collection_id": document.collection_id,
-                        "chunk_text": chunk.content,
-                        "chunk_position": chunk.position,
-                        "start_char": chunk.start_char,
-                        "end_char": chunk.end_char,
-                    },
+                    "document_id": document_id,
+                    "document_name": document.name,
+                    "collection_id": document.collection_id,
+                    "chunk_text": chunk.content,
+                    "chunk_position": chunk.position,
+                    "start_char": chunk.start_char,
+                    "end_char": chunk.end_char,
+                    "language": language_service.chunk_language(chunk.content),
+                    # Small search units are expanded with their neighbors at read time
+                    "chunk_unit": "small" if small_units else "chunk",
+                    "heading_path": chunk.heading_path,
+                    # MinHash signature and LSH bands for near-duplicate detection
+                    **(
+                        {
+                            "minhash": signature.tolist(),
+                            "minhash_bands": dedup_service.band_keys(signature),
+                        }
+                        if signature is not None
+                        else {}
+                    ),
                 }
+                for chunk, signature in zip(chunks, signatures)
+            ]
+
+            # Upsert to Qdrant (dense + sparse vectors)
+            vector_store_service.upsert_vectors(
+                collection_name,
+                ids=[str(uuid4()) for _ in chunks],
+                vectors=embeddings,
+                payloads=payloads,
+                sparse_vectors=sparse_embeddings,
+                sparse_backend=profile.sparse_backend,
+                multivectors=multivectors,
             )
 
-        # Upsert to Qdrant
-        qdrant_service.upsert_vectors(collection_name, points)
+        # Document summary vector for routing in large collections, over all of the
+        # document's chunks: duplicates stored under other documents are part of it too
+        if settings.retrieval_document_routing:
+            kept = {chunk.position for chunk in chunks}
+            dropped = [chunk.content for chunk in all_chunks if chunk.position not in kept]
+            summary_embeddings = [embeddings] if chunks else []
+            if dropped:
+                summary_embeddings.append(
+                    embedding_service.get_embeddings(
+                        dropped, batch_size=settings.ingestion_embed_batch_size
+                    )
+                )
+            if summary_embeddings:
+                routing_service.upsert_document_summary(
+                    collection_name, document_id, document.name, np.vstack(summary_embeddings)
+                )
+
+        # Link the skipped duplicates to the stored chunks they share, once the
+        # document's own chunks are in
+        vector_store_service.set_payloads(
+            collection_name,
+            {point_id: {"shared_by": entries} for point_id, entries in shared.items()},
+        )
 
         # Update document status
         document.status = "ready"
@@ -130,6 +237,82 @@ def ingest_document(document_id: str, db: Session) -> None:
         raise
 
 
+def _drop_duplicates(
+    collection_name: str,
+    document_id: str,
+    document_name: str,
+    chunks: list[chunker_service.Chunk],
+    signatures: list[np.ndarray | None],
+) -> tuple[list[chunker_service.Chunk], list[np.ndarray | None], dict[str, list[dict]]]:
+    """Remove chunks that near-duplicate stored chunks or earlier chunks of the document.
+
+    Returns:
+        Kept chunks, their signatures, and the new "shared_by" list of each stored
+        chunk that a removed chunk duplicated, by point ID.
+    """
+    keys = sorted(
+        {
+            key
+            for signature in signatures
+            if signature is not None
+            for key in dedup_service.band_keys(signature)
+        }
+    )
+    candidates = vector_store_service.lsh_candidates(
+        collection_name, keys, exclude_document_id=document_id
+    )
+    matches = dedup_service.find_duplicates(
+        signatures, [candidate["payload"]["minhash"] for candidate in candidates]
+    )
+
+    # One entry per document on each stored chunk (stale ones from an earlier
+    # ingestion of this document are replaced)
+    shared: dict[str, list[dict]] = {}
+    for chunk, match in zip(chunks, matches):
+        if match is None or match < 0:
+            continue
+        candidate = candidates[match]
+        if candidate["id"] not in shared:
+            shared[candidate["id"]] = [
+                entry
+                for entry in candidate["payload"].get("shared_by", [])
+                if entry["document_id"] != document_id
+            ]
+        elif any(entry["document_id"] == document_id for entry in shared[candidate["id"]]):
+            continue
+        shared[candidate["id"]].append(
+            {
+                "document_id": document_id,
+                "document_name": document_name,
+                "chunk_position": chunk.position,
+                "start_char": chunk.start_char,
+                "end_char": chunk.end_char,
+                "heading_path": chunk.heading_path,
+            }
+        )
+
+    kept = [(c, s) for c, s, match in zip(chunks, signatures, matches) if match is None]
+    logger.info(
+        f"[Ingestion] {document_id}: skipped {len(chunks) - len(kept)} near-duplicate chunks "
+        f"({len(candidates)} LSH candidates, {len(shared)} shared)"
+    )
+    return [c for c, _ in kept], [s for _, s in kept], shared
+
+
+def _report_throughput(
+    document_id: str, model: str, parallel: int | None, chunk_count: int, start: float
+) -> None:
+    """Log and record a document's embedding throughput in chunks/sec."""
+    elapsed = time.perf_counter() - start
+    rate = chunk_count / elapsed if elapsed > 0 else 0.0
+    mode = "parallel" if parallel is not None else "serial"
+    INGESTION_EMBEDDING_THROUGHPUT.labels(model=model, mode=mode).observe(rate)
+    logger.info(
+        f"[Ingestion] {document_id}: {model} embedded {chunk_count} chunks in {elapsed:.2f}s "
+        f"({rate:.1f} chunks/s, {mode})"
+    )
+
+
 def delete_document_vectors(document_id: str, collection_name: str) -> None:
     """Delete all vectors associated with a document.
 
@@ -137,5 +320,37 @@ def delete_document_vectors(document_id: str, collection_name: str) -> None:
         document_id: ID of the document.
         collection_name: Name of the Qdrant collection.
     """
-    if qdrant_service.collection_exists(collection_name):
-        qdrant_service.delete_by_document_id(collection_name, document_id)
+    if vector_store_service.collection_exists(collection_name):
+        _release_shared_chunks(collection_name, document_id)
+        vector_store_service.delete_by_document_id(collection_name, document_id)
+    routing_service.delete_document_summary(collection_name, document_id)
+    # Cached answers citing the document would outlive its content
+    answer_cache_service.invalidate_document(collection_name, document_id)
+
+
+def _release_shared_chunks(collection_name: str, document_id: str) -> None:
+    """Unlink a document from the near-duplicate chunks it shares.
+
+    Chunks the document owns pass to the first other document in their
+    "shared_by" list, with that document's name and position, so deleting it
+    doesn't remove text the other documents still contain.
+    """
+    updates: dict[str, dict] = {}
+    handed_over = 0
+    for point in vector_store_service.shared_points(collection_name, document_id):
+        payload = point["payload"]
+        remaining = [
+            entry for entry in payload.get("shared_by", []) if entry["document_id"] != document_id
+        ]
+        if payload.get("document_id") == document_id and remaining:
+            updates[point["id"]] = {**remaining[0], "shared_by": remaining[1:]}
+            handed_over += 1
+        else:
+            updates[point["id"]] = {"shared_by": remaining}
+
+    if updates:
+        vector_store_service.set_payloads(collection_name, updates)
+        logger.info(
+            f"[Ingestion] {document_id}: handed {handed_over} shared chunks over to other "
+            f"documents, unlinked from {len(updates) - handed_over}"
+        )
@@ -0,0 +1,112 @@
+"""Fast local language detection for queries and chunks.
+
+Counts hits against small stopword lists (function words are the most
+frequent and most language-specific tokens), which is enough to tell the
+languages we serve apart in a few microseconds without a model. Text with
+no stopword hits (identifiers, product names, single keywords) is
+"unknown".
+"""
+
+from collections import Counter
+
+from simba.core.config import settings
+from simba.services.bm25_service import tokenize
+
+UNKNOWN = "unknown"
+
+# Accent-stripped, lowercased (matching bm25_service.tokenize)
+_STOPWORDS: dict[str, frozenset[str]] = {
+    "en": frozenset(
+        "the and is are was were of to in on for with that this it be have has "
+        "not but or from by at an as do does did how what why when where which "
+        "who can could should would my your our their i you we they".split()
+    ),
+    "fr": frozenset(
+        "le la les un une des du de et est sont etait dans sur pour avec que qui "
+        "ce cette ces il elle ils elles nous vous je tu ne pas mais ou par au aux "
+        "comment pourquoi quand quel quelle mon ma mes votre vos notre leur se sa son".split()
+    ),
+    "de": frozenset(
+        "der die das und ist sind war ein eine einen nicht mit fur auf dem den des "
+        "zu im ich du wir sie es wie was warum wann wo mein dein unser kann auch "
+        "oder aber von bei nach".split()
+    ),
+    "es": frozenset(
+        "el la los las un una unos y es son era en con para por que del al como "
+        "pero no se su sus mi tu yo nosotros ellos esta este estos cuando donde "
+        "porque cual muy".split()
+    ),
+    "it": frozenset(
+        "il lo la gli le un una e sono era di da in con per che non ma come del "
+        "della dei delle al alla nel nella io tu noi voi loro questo questa quando "
+        "dove perche mio tuo".split()
+    ),
+    "pt": frozenset(
+        "o a os as um uma e sao era de do da dos das em no na com para por que nao "
+        "mas como eu voce nos eles ela este esta isso quando onde porque meu seu".split()
+    ),
+    "nl": frozenset(
+        "de het een en is zijn was van in op voor met dat die niet maar of ik jij "
+        "wij zij hoe wat waarom wanneer waar mijn uw ons kan ook bij naar".split()
+    ),
+}
+
+# Inverted index so detection is a single pass over the tokens
+_LANGUAGES_BY_STOPWORD: dict[str, tuple[str, ...]] = {}
+for _language, _words in _STOPWORDS.items():
+    for _word in _words:
+        _LANGUAGES_BY_STOPWORD[_word] = (*_LANGUAGES_BY_STOPWORD.get(_word, ()), _language)
+
+
+def detect_language(text: str) -> str:
+    """Detect the language of a query or chunk.
+
+    Args:
+        text: Input text.
+
+    Returns:
+        ISO 639-1 code ("en", "fr", ...) or "unknown" if no stopwords matched
+        or the top languages tie.
+    """
+    scores: Counter[str] = Counter()
+    for token in tokenize(text):
+        scores.update(_LANGUAGES_BY_STOPWORD.get(token, ()))
+
+    ranked = scores.most_common(2)
+    if not ranked or (len(ranked) == 2 and ranked[0][1] == ranked[1][1]):
+        return UNKNOWN
+    return ranked[0][0]
+
+
+def chunk_language(text: str) -> str | None:
+    """Language tag to store with a chunk.
+
+    None for "unknown" chunks (SKU tables, error codes): untagged chunks stay
+    in the sparse leg's prefetch for queries in any language.
+    """
+    language = detect_language(text)
+    return None if language == UNKNOWN else language
+
+
+def sparse_supports(language: str, backend: str | None = None) -> bool:
+    """Whether a sparse backend (default: the configured one) handles queries in a language.
+
+    BM25 is language-agnostic. SPLADE is limited to retrieval_sparse_languages;
+    "unknown" queries (mostly identifiers and keywords) still use it, since
+    exact-token matching is what the sparse leg is for.
+    """
+    if (backend or settings.retrieval_sparse_backend) == "bm25" or language == UNKNOWN:
+        return True
+    return language in settings.retrieval_sparse_languages
+
+
+def sparse_filter_language(language: str, backend: str | None = None) -> str | None:
+    """Language to restrict the sparse prefetch to, or None for no restriction.
+
+    Only a language-specific sparse model (SPLADE) is restricted to chunks in
+    the query's language; BM25 matches exact tokens such as SKUs across
+    languages.
+    """
+    if (backend or settings.retrieval_sparse_backend) == "bm25" or language == UNKNOWN:
+        return None
+    return language
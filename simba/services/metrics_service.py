@@ -5,7 +5,7 @@ from collections.abc import Callable, Generator
 from contextlib import contextmanager
 from functools import wraps
 
-from prometheus_client import CONTENT_TYPE_LATEST, Histogram, generate_latest
+from prometheus_client import CONTENT_TYPE_LATEST, Counter, Histogram, generate_latest
 
 # Latency histograms with buckets optimized for sub-100ms targets
 EMBEDDING_LATENCY = Histogram(
@@ -26,12 +26,58 @@ RERANK_LATENCY = Histogram(
     buckets=(0.01, 0.025, 0.05, 0.1, 0.15, 0.2, 0.3, 0.5, 1.0),
 )
 
+LATE_INTERACTION_LATENCY = Histogram(
+    "rag_late_interaction_latency_seconds",
+    "Time spent rescoring results with late-interaction (MaxSim) vectors",
+    buckets=(0.005, 0.01, 0.025, 0.05, 0.075, 0.1, 0.25, 0.5, 1.0),
+)
+
 RETRIEVAL_LATENCY = Histogram(
     "rag_retrieval_total_latency_seconds",
     "Total time for retrieval (embedding + search + optional rerank)",
     buckets=(0.01, 0.025, 0.05, 0.1, 0.15, 0.2, 0.3, 0.5, 1.0),
 )
 
+# Retrievals served by waiting on an identical in-flight retrieval
+# scope="local": coalesced within this process, scope="redis": across processes
+RETRIEVAL_COALESCED = Counter(
+    "rag_retrieval_coalesced_total",
+    "Retrievals that awaited an identical in-flight retrieval instead of recomputing",
+    ["scope"],
+)
+
+# Time to get a compiled chat agent; cache="miss" includes compiling the graph
+CHAT_AGENT_LATENCY = Histogram(
+    "rag_chat_agent_latency_seconds",
+    "Time to get a compiled chat agent",
+    ["cache"],
+    buckets=(0.0001, 0.0005, 0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5),
+)
+
+# Speculative retrievals on the chat message by outcome: "hit" (reused by the rag
+# tool), "miss" (tool query too different), "unused" (the LLM didn't search) or
+# "skipped" (every speculation worker busy, not started)
+SPECULATIVE_RETRIEVALS = Counter(
+    "rag_speculative_retrievals_total",
+    "Speculative chat retrievals by outcome",
+    ["result"],
+)
+
+# Semantic answer cache lookups by result: "hit", "miss", "expired" or "skipped"
+# (message with identifiers)
+ANSWER_CACHE_LOOKUPS = Counter(
+    "rag_answer_cache_lookups_total",
+    "Semantic answer cache lookups",
+    ["result"],
+)
+
+INGESTION_EMBEDDING_THROUGHPUT = Histogram(
+    "rag_ingestion_embedding_chunks_per_second",
+    "Per-document embedding throughput during ingestion",
+    ["model", "mode"],
+    buckets=(10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000),
+)
+
 
 @contextmanager
 def track_latency(histogram: Histogram) -> Generator[None, None, None]:
@@ -0,0 +1,925 @@
+"""In-process vector store backed by memory-mapped NumPy arrays.
+
+For small collections a brute-force scan is cheaper than a network hop: an
+exact cosine top-k over a few thousand 384-d rows takes microseconds. This
+module implements the same operations as qdrant_service on local files, so
+vector_store_service can serve small tenants (or tests and local benchmarks)
+without Qdrant.
+
+Layout under settings.vector_store_path, one directory per collection:
+
+    <collection>/CURRENT              name of the live snapshot directory
+    <collection>/<snapshot>/dense.npy float32 (n, dim), L2-normalized rows
+    <collection>/<snapshot>/points.json           ids and payloads
+    <collection>/<snapshot>/sparse-<name>.npz     CSR rows of a sparse vector
+    <collection>/<snapshot>/late-interaction.npz  token vectors per point (optional)
+
+Writes build a new snapshot and switch CURRENT atomically under a file lock,
+so readers in other processes (API workers while Celery ingests) never see a
+half-written collection; they pick up the new snapshot on their next call.
+Dense matrices are memory-mapped read-only and shared through the page cache.
+"""
+
+import fcntl
+import json
+import logging
+import os
+import shutil
+import threading
+from collections.abc import Generator, Iterator
+from contextlib import contextmanager
+from dataclasses import dataclass
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+from urllib.parse import quote, unquote
+from uuid import uuid4
+
+import numpy as np
+
+from simba.core.config import settings
+from simba.services.bm25_service import tokenize
+from simba.services.language_service import UNKNOWN
+from simba.services.metrics_service import SEARCH_LATENCY, track_latency
+from simba.services.qdrant_service import SPARSE_VECTOR_NAMES, sparse_vector_name
+
+if TYPE_CHECKING:
+    from simba.services.embedding_service import SparseEmbedding
+
+logger = logging.getLogger(__name__)
+
+# Same constant as Qdrant's RRF fusion, so hybrid scores are comparable across backends
+RRF_K = 2
+
+# Sparse vectors scored with IDF computed from the collection (Qdrant modifier "idf")
+_IDF_VECTORS = {SPARSE_VECTOR_NAMES["bm25"]}
+
+
+class CollectionNotFoundError(ValueError):
+    """Raised when reading a collection that doesn't exist in the NumPy store."""
+
+
+@dataclass
+class _SparseMatrix:
+    """Sparse vectors of a collection in CSR form."""
+
+    indices: np.ndarray  # uint32, all rows concatenated
+    values: np.ndarray  # float32, aligned with indices
+    offsets: np.ndarray  # int64, row i spans offsets[i]:offsets[i + 1]
+    rows: np.ndarray  # int64, row number of each entry (for bincount)
+
+
+@dataclass
+class _MultiMatrix:
+    """Late-interaction token vectors of a collection, rows concatenated."""
+
+    vectors: np.ndarray  # float32 (tokens, dim), L2-normalized rows
+    offsets: np.ndarray  # int64, point i spans offsets[i]:offsets[i + 1]
+
+
+@dataclass
+class _Snapshot:
+    """Loaded, immutable state of one collection."""
+
+    name: str
+    ids: list[str]
+    payloads: list[dict[str, Any]]
+    dense: np.ndarray
+    sparse: dict[str, _SparseMatrix]
+    multivectors: _MultiMatrix | None = None
+
+
+_snapshots: dict[str, _Snapshot] = {}
+_snapshots_lock = threading.Lock()
+
+
+# --- Collections ---
+
+
+def create_collection(
+    collection_name: str, with_sparse: bool = True, with_late_interaction: bool = True
+) -> None:
+    """Create an empty collection if it doesn't exist.
+
+    Args:
+        collection_name: Name of the collection to create.
+        with_sparse: Accepted for interface parity; sparse vectors are always supported.
+        with_late_interaction: Accepted for interface parity; late-interaction
+            vectors are always supported.
+    """
+    if collection_exists(collection_name):
+        return
+    with _write_lock(collection_name):
+        if not _current_snapshot_name(collection_name):
+            _write_snapshot(collection_name, [], [], _empty_dense(), {})
+
+
+def delete_collection(collection_name: str) -> None:
+    """Delete a collection and its files.
+
+    Args:
+        collection_name: Name of the collection to delete.
+    """
+    shutil.rmtree(_collection_dir(collection_name), ignore_errors=True)
+    with _snapshots_lock:
+        _snapshots.pop(collection_name, None)
+
+
+def collection_exists(collection_name: str) -> bool:
+    """Check if a collection exists.
+
+    Args:
+        collection_name: Name of the collection.
+
+    Returns:
+        True if collection exists, False otherwise.
+    """
+    return _current_snapshot_name(collection_name) is not None
+
+
+def list_collections() -> list[str]:
+    """List the names of all collections in the store."""
+    root = Path(settings.vector_store_path)
+    if not root.is_dir():
+        return []
+    return sorted(
+        unquote(directory.name) for directory in root.iterdir() if (directory / "CURRENT").is_file()
+    )
+
+
+def get_collection_info(collection_name: str) -> dict[str, Any]:
+    """Get information about a collection.
+
+    Args:
+        collection_name: Name of the collection.
+
+    Returns:
+        Collection information including point count.
+    """
+    snapshot = _load(collection_name)
+    return {
+        "name": collection_name,
+        "points_count": len(snapshot.ids),
+        "vectors_count": len(snapshot.ids),
+        "status": "green",
+    }
+
+
+def count_points(collection_name: str) -> int:
+    """Number of points in a collection (0 if it doesn't exist)."""
+    if not collection_exists(collection_name):
+        return 0
+    return len(_load(collection_name).ids)
+
+
+# --- Writes ---
+
+
+def upsert_vectors(
+    collection_name: str,
+    ids: list[str],
+    vectors: np.ndarray,
+    payloads: list[dict[str, Any]],
+    sparse_vectors: list["SparseEmbedding"] | None = None,
+    sparse_name: str | None = None,
+    multivectors: list[np.ndarray] | None = None,
+) -> None:
+    """Insert or update vectors in a collection.
+
+    Args:
+        collection_name: Name of the collection.
+        ids: Unique point identifiers.
+        vectors: Dense embeddings, float32 array of shape (len(ids), dimensions).
+        payloads: Metadata per point (document_id, chunk_text, etc.).
+        sparse_vectors: Optional (indices, values) arrays per point.
+        sparse_name: Named sparse vector to store them under. Defaults to the
+            configured sparse backend's vector.
+        multivectors: Optional late-interaction token vectors per point.
+    """
+    sparse_name = sparse_name or sparse_vector_name()
+    new_dense = _normalize(np.asarray(vectors, dtype=np.float32).reshape(len(ids), -1))
+
+    with _write_lock(collection_name):
+        snapshot = _load(collection_name, must_exist=False)
+        replaced = set(ids)
+        keep = [i for i, point_id in enumerate(snapshot.ids) if point_id not in replaced]
+
+        sparse_rows = {name: _sparse_rows(matrix, keep) for name, matrix in snapshot.sparse.items()}
+        for name in set(sparse_rows) | ({sparse_name} if sparse_vectors is not None else set()):
+            rows = sparse_rows.setdefault(name, [_empty_sparse()] * len(keep))
+            if name == sparse_name and sparse_vectors is not None:
+                rows.extend(sparse_vectors)
+            else:
+                rows.extend([_empty_sparse()] * len(ids))
+
+        multi_rows = None
+        if snapshot.multivectors is not None or multivectors is not None:
+            multi_rows = _multi_rows(snapshot.multivectors, keep)
+            multi_rows.extend(multivectors if multivectors is not None else [None] * len(ids))
+
+        _write_snapshot(
+            collection_name,
+            [snapshot.ids[i] for i in keep] + list(ids),
+            [snapshot.payloads[i] for i in keep] + list(payloads),
+            np.concatenate([snapshot.dense[keep], new_dense]),
+            sparse_rows,
+            multi_rows,
+        )
+
+
+def _has_document(payload: dict[str, Any], document_id: str) -> bool:
+    """Whether a payload's document_id is (or, like Qdrant's match on arrays, contains) an ID."""
+    value = payload.get("document_id")
+    return document_id in value if isinstance(value, list) else value == document_id
+
+
+def delete_by_document_id(collection_name: str, document_id: str) -> None:
+    """Delete all vectors associated with a document.
+
+    Args:
+        collection_name: Name of the collection.
+        document_id: Document ID to delete vectors for.
+    """
+    with _write_lock(collection_name):
+        snapshot = _load(collection_name, must_exist=False)
+        keep = [
+            i
+            for i, payload in enumerate(snapshot.payloads)
+            if not _has_document(payload, document_id)
+        ]
+        _delete_rows(collection_name, snapshot, keep)
+
+
+def delete_points(collection_name: str, ids: list[str]) -> None:
+    """Delete points by ID.
+
+    Args:
+        collection_name: Name of the collection.
+        ids: IDs of the points to delete.
+    """
+    deleted = set(ids)
+    with _write_lock(collection_name):
+        snapshot = _load(collection_name, must_exist=False)
+        keep = [i for i, point_id in enumerate(snapshot.ids) if point_id not in deleted]
+        _delete_rows(collection_name, snapshot, keep)
+
+
+def set_payloads(collection_name: str, payloads: dict[str, dict[str, Any]]) -> None:
+    """Overwrite payload fields of points; their other fields are kept.
+
+    Args:
+        collection_name: Name of the collection.
+        payloads: Fields to set, by point ID.
+    """
+    if not payloads:
+        return
+    with _write_lock(collection_name):
+        snapshot = _load(collection_name, must_exist=False)
+        if payloads.keys().isdisjoint(snapshot.ids):
+            return
+        rows = list(range(len(snapshot.ids)))
+        _write_snapshot(
+            collection_name,
+            snapshot.ids,
+            [
+                {**payload, **payloads.get(point_id, {})}
+                for point_id, payload in zip(snapshot.ids, snapshot.payloads)
+            ],
+            snapshot.dense,
+            {name: _sparse_rows(matrix, rows) for name, matrix in snapshot.sparse.items()},
+            _multi_rows(snapshot.multivectors, rows) if snapshot.multivectors is not None else None,
+        )
+
+
+def _delete_rows(collection_name: str, snapshot: _Snapshot, keep: list[int]) -> None:
+    """Write a snapshot with only the kept rows (caller holds the write lock)."""
+    if len(keep) == len(snapshot.ids):
+        return
+    _write_snapshot(
+        collection_name,
+        [snapshot.ids[i] for i in keep],
+        [snapshot.payloads[i] for i in keep],
+        snapshot.dense[keep],
+        {name: _sparse_rows(matrix, keep) for name, matrix in snapshot.sparse.items()},
+        _multi_rows(snapshot.multivectors, keep) if snapshot.multivectors is not None else None,
+    )
+
+
+def replace_collection(
+    collection_name: str,
+    ids: list[str],
+    vectors: np.ndarray,
+    payloads: list[dict[str, Any]],
+    sparse_vectors: dict[str, list["SparseEmbedding"]] | None = None,
+    multivectors: list[np.ndarray | None] | None = None,
+) -> None:
+    """Replace a collection's contents in one snapshot (used to rebuild it).
+
+    Args:
+        collection_name: Name of the collection.
+        ids: Point identifiers.
+        vectors: Dense embeddings, float32 array of shape (len(ids), dimensions).
+        payloads: Metadata per point.
+        sparse_vectors: Sparse vectors per point, keyed by named sparse vector.
+        multivectors: Late-interaction token vectors per point (None for points
+            without them).
+    """
+    with _write_lock(collection_name):
+        _write_snapshot(
+            collection_name,
+            list(ids),
+            list(payloads),
+            _normalize(np.asarray(vectors, dtype=np.float32).reshape(len(ids), -1)),
+            sparse_vectors or {},
+            multivectors,
+        )
+
+
+# --- Reads ---
+
+
+def search(
+    collection_name: str,
+    query_vector: np.ndarray,
+    limit: int = 5,
+    document_id: str | None = None,
+    document_ids: list[str] | None = None,
+    group_size: int | None = None,
+) -> list[dict[str, Any]]:
+    """Exact cosine search over a collection.
+
+    Args:
+        collection_name: Name of the collection.
+        query_vector: Query embedding vector.
+        limit: Maximum number of results.
+        document_id: Optional filter by document ID.
+        document_ids: Optional filter to any of these document IDs (chunks they own or share).
+        group_size: Optional cap on results per document_id.
+
+    Returns:
+        List of search results with id, score, and payload.
+    """
+    snapshot = _load(collection_name)
+    with track_latency(SEARCH_LATENCY):
+        scores = _dense_scores(snapshot, query_vector)
+        mask = _document_mask(snapshot, document_id, document_ids)
+        if group_size:
+            rows = _grouped_rows(snapshot, scores, limit, mask, group_size)
+            return [_result(snapshot, row, float(scores[row])) for row in rows]
+        return _top_k(snapshot, scores, limit, mask)
+
+
+def hybrid_search(
+    collection_name: str,
+    query_dense: np.ndarray,
+    query_sparse: "SparseEmbedding | None" = None,
+    limit: int = 5,
+    document_id: str | None = None,
+    language: str | None = None,
+    sparse_backend: str | None = None,
+    document_ids: list[str] | None = None,
+    group_size: int | None = None,
+) -> list[dict[str, Any]]:
+    """Hybrid search: exact dense and sparse rankings fused with RRF.
+
+    Mirrors qdrant_service.hybrid_search (prefetch limit * 2 per leg, RRF fusion,
+    language restriction on the sparse leg only).
+
+    Args:
+        collection_name: Name of the collection.
+        query_dense: Dense embedding vector.
+        query_sparse: Optional tuple of (indices, values) for sparse vector.
+        limit: Maximum number of results.
+        document_id: Optional filter by document ID.
+        language: Optional query language for the sparse leg.
+        sparse_backend: Backend that computed query_sparse. Defaults to
+            settings.retrieval_sparse_backend.
+        document_ids: Optional filter to any of these document IDs (chunks they own or share).
+        group_size: Optional cap on fused results per document_id.
+
+    Returns:
+        List of search results with id, score, and payload.
+    """
+    snapshot = _load(collection_name)
+    sparse_name = sparse_vector_name(sparse_backend)
+    matrix = snapshot.sparse.get(sparse_name)
+    if query_sparse is None or matrix is None:
+        return search(collection_name, query_dense, limit, document_id, document_ids, group_size)
+
+    with track_latency(SEARCH_LATENCY):
+        mask = _document_mask(snapshot, document_id, document_ids)
+        dense_rank = _ranked_rows(_dense_scores(snapshot, query_dense), limit * 2, mask)
+
+        sparse_mask = mask
+        if language:
+            accepted = (language, UNKNOWN, None)
+            tags = np.array([p.get("language") in accepted for p in snapshot.payloads])
+            sparse_mask = tags if mask is None else mask & tags
+        sparse_scores = _sparse_scores(matrix, query_sparse, sparse_name)
+        # Points without any matching term are not sparse hits
+        has_match = sparse_scores > 0
+        sparse_mask = has_match if sparse_mask is None else sparse_mask & has_match
+        sparse_rank = _ranked_rows(sparse_scores, limit * 2, sparse_mask)
+
+        fused: dict[int, float] = {}
+        for ranking in (dense_rank, sparse_rank):
+            for position, row in enumerate(ranking):
+                fused[row] = fused.get(row, 0.0) + 1.0 / (position + RRF_K)
+
+    best = sorted(fused.items(), key=lambda item: item[1], reverse=True)
+    if group_size:
+        best = _cap_per_document(snapshot, best, group_size)
+    return [_result(snapshot, row, score) for row, score in best[:limit]]
+
+
+def late_interaction_rescore(
+    collection_name: str,
+    query_multivector: np.ndarray,
+    ids: list[str],
+    limit: int,
+) -> list[dict[str, Any]]:
+    """Score candidate points by MaxSim (see qdrant_service.late_interaction_rescore).
+
+    Args:
+        collection_name: Name of the collection.
+        query_multivector: Query token vectors, shape (tokens, dimensions).
+        ids: IDs of the candidate points.
+        limit: Maximum number of results.
+
+    Returns:
+        List of results with id, score, and payload, best first.
+    """
+    snapshot = _load(collection_name)
+    matrix = snapshot.multivectors
+    if matrix is None:
+        return []
+
+    with track_latency(SEARCH_LATENCY):
+        wanted = {str(point_id) for point_id in ids}
+        rows = np.array(
+            [
+                row
+                for row, point_id in enumerate(snapshot.ids)
+                if point_id in wanted and matrix.offsets[row + 1] > matrix.offsets[row]
+            ],
+            dtype=np.int64,
+        )
+        if not len(rows):
+            return []
+
+        starts, ends = matrix.offsets[rows], matrix.offsets[rows + 1]
+        tokens = np.concatenate([matrix.vectors[a:b] for a, b in zip(starts, ends)])
+        query = _normalize(np.asarray(query_multivector, dtype=np.float32))
+        # Best match of every query token within each candidate's token span, summed
+        similarity = query @ tokens.T
+        bounds = np.concatenate([[0], np.cumsum(ends - starts)[:-1]])
+        scores = np.maximum.reduceat(similarity, bounds, axis=1).sum(axis=0) / max(len(query), 1)
+
+    order = np.argsort(-scores, kind="stable")[:limit]
+    return [_result(snapshot, int(rows[i]), float(scores[i])) for i in order]
+
+
+def text_search(
+    collection_name: str,
+    terms: list[str],
+    limit: int = 5,
+) -> list[dict[str, Any]]:
+    """Find chunks containing all words of any term (like a full-text index).
+
+    Args:
+        collection_name: Name of the collection.
+        terms: Terms to look up.
+        limit: Maximum number of results.
+
+    Returns:
+        List of matching points with id and payload (score is always 1.0).
+    """
+    snapshot = _load(collection_name)
+    term_words = [set(tokenize(term)) for term in terms]
+    results = []
+    for row, payload in enumerate(snapshot.payloads):
+        words = set(tokenize(payload.get("chunk_text", "")))
+        if any(tw and tw <= words for tw in term_words):
+            results.append(_result(snapshot, row, 1.0))
+            if len(results) >= limit:
+                break
+    return results
+
+
+def get_chunk_windows(
+    collection_name: str, windows: list[tuple[str, int, int]]
+) -> list[dict[str, Any]]:
+    """Get the chunks in position ranges of several documents (see qdrant_service)."""
+    ranges: dict[str, list[tuple[int, int]]] = {}
+    for document_id, first, last in windows:
+        ranges.setdefault(document_id, []).append((first, last))
+    if not ranges:
+        return []
+
+    return [
+        payload
+        for payload in _load(collection_name).payloads
+        if payload.get("document_id") in ranges
+        and any(
+            first <= payload.get("chunk_position", 0) <= last
+            for first, last in ranges[payload["document_id"]]
+        )
+    ]
+
+
+def lsh_candidates(
+    collection_name: str,
+    band_keys: list[str],
+    exclude_document_id: str | None = None,
+) -> list[dict[str, Any]]:
+    """Get the chunks sharing any LSH band key, with their MinHash signatures (see qdrant_service)."""
+    keys = set(band_keys)
+    snapshot = _load(collection_name)
+    return [
+        {"id": point_id, "payload": payload}
+        for point_id, payload in zip(snapshot.ids, snapshot.payloads)
+        if "minhash" in payload
+        and payload.get("document_id") != exclude_document_id
+        and not keys.isdisjoint(payload.get("minhash_bands", ()))
+    ]
+
+
+def shared_points(collection_name: str, document_id: str) -> list[dict[str, Any]]:
+    """Get the points linking a document to others through near-duplicate sharing (see qdrant_service)."""
+    snapshot = _load(collection_name)
+    return [
+        {"id": point_id, "payload": payload}
+        for point_id, payload in zip(snapshot.ids, snapshot.payloads)
+        if (payload.get("document_id") == document_id and payload.get("shared_by"))
+        or any(entry["document_id"] == document_id for entry in payload.get("shared_by", ()))
+    ]
+
+
+def get_document_chunks(
+    collection_name: str,
+    document_id: str,
+    limit: int = 100,
+) -> list[dict[str, Any]]:
+    """Get all chunks for a specific document.
+
+    Args:
+        collection_name: Name of the collection.
+        document_id: Document ID to get chunks for.
+        limit: Maximum number of chunks to return.
+
+    Returns:
+        List of chunks with their payload (text, position, etc.).
+    """
+    snapshot = _load(collection_name)
+    chunks = [
+        {
+            "id": snapshot.ids[row],
+            "text": payload.get("chunk_text", ""),
+            "position": payload.get("chunk_position", 0),
+            "document_name": payload.get("document_name", ""),
+        }
+        for row, payload in enumerate(snapshot.payloads)
+        if payload.get("document_id") == document_id
+    ][:limit]
+    return sorted(chunks, key=lambda x: x["position"])
+
+
+def sample_chunks(collection_name: str, limit: int = 50) -> list[dict[str, Any]]:
+    """Get the payloads of up to `limit` chunks of a collection.
+
+    Args:
+        collection_name: Name of the collection.
+        limit: Maximum number of payloads.
+
+    Returns:
+        Chunk payloads.
+    """
+    return _load(collection_name).payloads[:limit]
+
+
+def iter_points(
+    collection_name: str, batch_size: int = 256
+) -> Iterator[tuple[list[str], np.ndarray, dict[str, list["SparseEmbedding"]], list[dict]]]:
+    """Iterate over all points of a collection (see qdrant_service.iter_points).
+
+    Args:
+        collection_name: Name of the collection.
+        batch_size: Points per batch.
+
+    Yields:
+        Batches of (ids, dense float32 matrix, sparse vectors by name, payloads).
+    """
+    snapshot = _load(collection_name)
+    for start in range(0, len(snapshot.ids), batch_size):
+        rows = list(range(start, min(start + batch_size, len(snapshot.ids))))
+        yield (
+            snapshot.ids[start : rows[-1] + 1],
+            np.array(snapshot.dense[start : rows[-1] + 1]),
+            {name: _sparse_rows(matrix, rows) for name, matrix in snapshot.sparse.items()},
+            snapshot.payloads[start : rows[-1] + 1],
+        )
+
+
+# --- Scoring ---
+
+
+def _dense_scores(snapshot: _Snapshot, query_vector: np.ndarray) -> np.ndarray:
+    """Cosine similarity of the query with every row (rows are pre-normalized)."""
+    query = np.asarray(query_vector, dtype=np.float32)
+    norm = np.linalg.norm(query)
+    return snapshot.dense @ (query / norm if norm else query)
+
+
+def _sparse_scores(matrix: _SparseMatrix, query_sparse: "SparseEmbedding", name: str) -> np.ndarray:
+    """Dot product of a sparse query with every row, vectorized over the CSR arrays.
+
+    For IDF vectors (BM25), query weights are scaled by Qdrant's IDF formula
+    ln((N - df + 0.5) / (df + 0.5) + 1) computed over the collection.
+    """
+    n = len(matrix.offsets) - 1
+    query_indices = np.asarray(query_sparse[0], dtype=np.int64)
+    query_values = np.asarray(query_sparse[1], dtype=np.float32)
+    order = np.argsort(query_indices)
+    query_indices, query_values = query_indices[order], query_values[order]
+    if n == 0 or len(query_indices) == 0:
+        return np.zeros(n, dtype=np.float32)
+
+    # For every stored entry, find the query term with the same index (if any)
+    positions = np.searchsorted(query_indices, matrix.indices)
+    positions = np.minimum(positions, len(query_indices) - 1)
+    matched = query_indices[positions] == matrix.indices
+
+    weights = query_values
+    if name in _IDF_VECTORS:
+        df = np.bincount(positions[matched], minlength=len(query_indices))
+        weights = query_values * np.log((n - df + 0.5) / (df + 0.5) + 1.0)
+
+    contributions = np.where(matched, matrix.values * weights[positions], 0.0)
+    return np.bincount(matrix.rows, weights=contributions, minlength=n).astype(np.float32)
+
+
+def _document_mask(
+    snapshot: _Snapshot, document_id: str | None, document_ids: list[str] | None = None
+) -> np.ndarray | None:
+    """Boolean row mask for document filters, or None for no filter (see qdrant_service)."""
+    if not document_id and document_ids is None:
+        return None
+    routed = set(document_ids) if document_ids is not None else None
+
+    def allowed(payload: dict[str, Any]) -> bool:
+        if document_id and payload.get("document_id") != document_id:
+            return False
+        return (
+            routed is None
+            or payload.get("document_id") in routed
+            or any(entry["document_id"] in routed for entry in payload.get("shared_by", ()))
+        )
+
+    return np.array([allowed(p) for p in snapshot.payloads], dtype=bool)
+
+
+def _ranked_rows(scores: np.ndarray, limit: int, mask: np.ndarray | None) -> list[int]:
+    """Rows of the top `limit` scores in descending order (argpartition, then sort)."""
+    if mask is not None:
+        scores = np.where(mask, scores, -np.inf)
+        limit = min(limit, int(mask.sum()))
+    limit = min(limit, len(scores))
+    if limit <= 0:
+        return []
+    top = np.argpartition(-scores, limit - 1)[:limit]
+    return top[np.argsort(-scores[top], kind="stable")].tolist()
+
+
+def _cap_per_document(
+    snapshot: _Snapshot, ranked: list[tuple[int, float]], group_size: int
+) -> list[tuple[int, float]]:
+    """Keep at most group_size of the ranked (row, score) pairs per document_id."""
+    counts: dict[Any, int] = {}
+    kept = []
+    for row, score in ranked:
+        document_id = snapshot.payloads[row].get("document_id")
+        if counts.get(document_id, 0) < group_size:
+            counts[document_id] = counts.get(document_id, 0) + 1
+            kept.append((row, score))
+    return kept
+
+
+def _grouped_rows(
+    snapshot: _Snapshot,
+    scores: np.ndarray,
+    limit: int,
+    mask: np.ndarray | None,
+    group_size: int,
+) -> list[int]:
+    """Rows of the top `limit` scores with at most group_size rows per document_id.
+
+    Ranks a growing prefix of the scores until enough rows survive the cap (like
+    Qdrant's grouped query, which returns the best hits of the best documents).
+    """
+    fetch = limit * 4
+    while True:
+        ranked = _ranked_rows(scores, fetch, mask)
+        kept = _cap_per_document(snapshot, [(row, 0.0) for row in ranked], group_size)
+        if len(kept) >= limit or len(ranked) < fetch:
+            return [row for row, _ in kept[:limit]]
+        fetch *= 4
+
+
+def _top_k(
+    snapshot: _Snapshot, scores: np.ndarray, limit: int, mask: np.ndarray | None
+) -> list[dict[str, Any]]:
+    """Top-k results in qdrant_service's result format."""
+    return [_result(snapshot, row, float(scores[row])) for row in _ranked_rows(scores, limit, mask)]
+
+
+def _result(snapshot: _Snapshot, row: int, score: float) -> dict[str, Any]:
+    """One search result in qdrant_service's result format."""
+    return {"id": snapshot.ids[row], "score": score, "payload": snapshot.payloads[row]}
+
+
+def _normalize(vectors: np.ndarray) -> np.ndarray:
+    """L2-normalize rows, as Qdrant does for cosine collections."""
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    return vectors / np.where(norms == 0, 1.0, norms)
+
+
+# --- Storage ---
+
+
+def _collection_dir(collection_name: str) -> Path:
+    """Directory of a collection (name is percent-encoded to a safe file name)."""
+    return Path(settings.vector_store_path) / quote(collection_name, safe="-_")
+
+
+def _current_snapshot_name(collection_name: str) -> str | None:
+    """Name of the live snapshot directory, or None if the collection doesn't exist."""
+    try:
+        return (_collection_dir(collection_name) / "CURRENT").read_text().strip() or None
+    except FileNotFoundError:
+        return None
+
+
+@contextmanager
+def _write_lock(collection_name: str) -> Generator[None, None, None]:
+    """Exclusive cross-process lock for a collection's read-modify-write cycle."""
+    directory = _collection_dir(collection_name)
+    directory.mkdir(parents=True, exist_ok=True)
+    with open(directory / ".lock", "w") as lock_file:
+        fcntl.flock(lock_file, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+
+def _load(collection_name: str, must_exist: bool = True) -> _Snapshot:
+    """Get the live snapshot of a collection, reloading it if another process wrote.
+
+    Args:
+        collection_name: Name of the collection.
+        must_exist: Raise if the collection doesn't exist; otherwise return an empty one.
+
+    Raises:
+        CollectionNotFoundError: If the collection doesn't exist and must_exist is True.
+    """
+    for _ in range(3):
+        name = _current_snapshot_name(collection_name)
+        if name is None:
+            if must_exist:
+                raise CollectionNotFoundError(f"Collection not found: {collection_name}")
+            return _Snapshot("", [], [], _empty_dense(), {})
+
+        with _snapshots_lock:
+            cached = _snapshots.get(collection_name)
+        if cached is not None and cached.name == name:
+            return cached
+
+        try:
+            snapshot = _read_snapshot(collection_name, name)
+        except FileNotFoundError:
+            # A writer replaced and removed this snapshot between reads; retry
+            continue
+
+        with _snapshots_lock:
+            _snapshots[collection_name] = snapshot
+        return snapshot
+
+    raise RuntimeError(f"Collection {collection_name} is changing too fast to load")
+
+
+def _read_snapshot(collection_name: str, name: str) -> _Snapshot:
+    """Read a snapshot directory (dense matrix memory-mapped)."""
+    directory = _collection_dir(collection_name) / name
+    with open(directory / "points.json") as f:
+        points = json.load(f)
+    sparse = {}
+    for path in directory.glob("sparse-*.npz"):
+        with np.load(path) as data:
+            offsets = data["offsets"]
+            sparse[path.stem.removeprefix("sparse-")] = _SparseMatrix(
+                indices=data["indices"],
+                values=data["values"],
+                offsets=offsets,
+                rows=np.repeat(np.arange(len(offsets) - 1), np.diff(offsets)),
+            )
+    multivectors = None
+    if (directory / "late-interaction.npz").is_file():
+        with np.load(directory / "late-interaction.npz") as data:
+            multivectors = _MultiMatrix(vectors=data["vectors"], offsets=data["offsets"])
+    return _Snapshot(
+        name=name,
+        ids=points["ids"],
+        payloads=points["payloads"],
+        dense=np.load(directory / "dense.npy", mmap_mode="r"),
+        sparse=sparse,
+        multivectors=multivectors,
+    )
+
+
+def _write_snapshot(
+    collection_name: str,
+    ids: list[str],
+    payloads: list[dict[str, Any]],
+    dense: np.ndarray,
+    sparse_rows: dict[str, list["SparseEmbedding"]],
+    multi_rows: list[np.ndarray | None] | None = None,
+) -> None:
+    """Write a new snapshot and make it live. Caller must hold the write lock."""
+    collection_dir = _collection_dir(collection_name)
+    name = uuid4().hex
+    directory = collection_dir / name
+    directory.mkdir(parents=True)
+
+    np.save(directory / "dense.npy", np.ascontiguousarray(dense, dtype=np.float32))
+    for sparse_name, rows in sparse_rows.items():
+        _save_sparse(directory / f"sparse-{sparse_name}.npz", rows)
+    if multi_rows is not None:
+        _save_multi(directory / "late-interaction.npz", multi_rows)
+    with open(directory / "points.json", "w") as f:
+        json.dump({"ids": ids, "payloads": payloads}, f)
+
+    # Atomically switch readers to the new snapshot, then drop the old ones
+    # (open memory maps keep their files alive until released)
+    pointer = collection_dir / f"CURRENT.{name}"
+    pointer.write_text(name)
+    os.replace(pointer, collection_dir / "CURRENT")
+    for old in collection_dir.iterdir():
+        if old.is_dir() and old.name != name:
+            shutil.rmtree(old, ignore_errors=True)
+
+
+def _save_sparse(path: Path, rows: list["SparseEmbedding"]) -> None:
+    """Save sparse rows in CSR form."""
+    indices = [np.asarray(i, dtype=np.uint32) for i, _ in rows]
+    values = [np.asarray(v, dtype=np.float32) for _, v in rows]
+    offsets = np.zeros(len(rows) + 1, dtype=np.int64)
+    np.cumsum([len(i) for i in indices], out=offsets[1:])
+    np.savez(
+        path,
+        indices=np.concatenate(indices) if rows else np.empty(0, dtype=np.uint32),
+        values=np.concatenate(values) if rows else np.empty(0, dtype=np.float32),
+        offsets=offsets,
+    )
+
+
+def _save_multi(path: Path, rows: list[np.ndarray | None]) -> None:
+    """Save token vectors per point (None = no vectors), rows L2-normalized."""
+    matrices = [_empty_multi() if row is None else np.asarray(row, np.float32) for row in rows]
+    offsets = np.zeros(len(matrices) + 1, dtype=np.int64)
+    np.cumsum([len(m) for m in matrices], out=offsets[1:])
+    vectors = np.concatenate(matrices) if matrices else _empty_multi()
+    np.savez(path, vectors=_normalize(vectors), offsets=offsets)
+
+
+def _multi_rows(matrix: _MultiMatrix | None, rows: list[int]) -> list[np.ndarray | None]:
+    """Extract selected points' token vectors (None where a point has none)."""
+    if matrix is None:
+        return [None] * len(rows)
+    return [
+        matrix.vectors[matrix.offsets[row] : matrix.offsets[row + 1]]
+        if matrix.offsets[row + 1] > matrix.offsets[row]
+        else None
+        for row in rows
+    ]
+
+
+def _sparse_rows(matrix: _SparseMatrix, rows: list[int]) -> list["SparseEmbedding"]:
+    """Extract selected CSR rows as (indices, values) pairs."""
+    return [
+        (
+            matrix.indices[matrix.offsets[row] : matrix.offsets[row + 1]],
+            matrix.values[matrix.offsets[row] : matrix.offsets[row + 1]],
+        )
+        for row in rows
+    ]
+
+
+def _empty_sparse() -> "SparseEmbedding":
+    return np.empty(0, dtype=np.uint32), np.empty(0, dtype=np.float32)
+
+
+def _empty_multi() -> np.ndarray:
+    return np.empty((0, settings.retrieval_late_interaction_dimensions), dtype=np.float32)
+
+
+def _empty_dense() -> np.ndarray:
+    return np.empty((0, settings.embedding_dimensions), dtype=np.float32)
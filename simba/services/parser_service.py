@@ -226,6 +226,20 @@ def parse_document(file_content: bytes, mime_type: str, filename: str) -> str:
         raise ValueError(f"Unknown parser backend: {backend}")
 
 
+def preload() -> None:
+    """Load the local parser models ahead of the first document.
+
+    Only Docling runs models in-process; remote backends need no preloading.
+    """
+    if settings.parser_backend.lower() != "docling":
+        return
+
+    from docling.datamodel.base_models import InputFormat
+
+    converter = _get_docling_converter()
+    converter.initialize_pipeline(InputFormat.PDF)
+
+
 def get_supported_mime_types() -> list[str]:
     """Get list of supported MIME types for the configured backend."""
     return list(_get_mime_types().keys())
@@ -0,0 +1,199 @@
+"""Per-collection chunking and retrieval profiles.
+
+A collection's profile (collection_profiles table) overrides the global
+settings for that collection only, so a latency-sensitive widget and a
+deep-research assistant can use different trade-offs in one deployment.
+Profiles are resolved by vector store collection name ("{org_id}_{name}")
+and cached per process for collection_profile_ttl_seconds; update_profile
+invalidates the local cache immediately.
+"""
+
+import logging
+import threading
+import time
+from dataclasses import dataclass, fields, replace
+from typing import Any
+
+from simba.core.config import settings
+from simba.models import Collection, CollectionProfile, SessionLocal
+
+logger = logging.getLogger(__name__)
+
+CHUNKING_MODES = ("standard", "small_to_big")
+SPARSE_BACKENDS = ("splade", "bm25")
+QUANTIZATIONS = ("scalar", "binary")
+RERANK_MODES = ("cross_encoder", "late_interaction", "cascade")
+
+# collection name -> (monotonic time fetched, profile)
+_profile_cache: dict[str, tuple[float, "Profile"]] = {}
+_profile_lock = threading.Lock()
+
+
+@dataclass(frozen=True)
+class Profile:
+    """Effective settings of a collection: its stored overrides over the global defaults."""
+
+    chunking_mode: str
+    chunk_size: int
+    chunk_overlap: int
+    sparse_backend: str
+    quantization: str | None  # None, "scalar" (int8) or "binary"
+    retrieval_limit: int
+    retrieval_min_score: float
+    retrieval_rerank: bool
+    retrieval_hybrid: bool
+    rerank_candidates: int  # Search hits passed to the reranker (0 = 4 x limit)
+    rerank_group_size: int  # Max rerank candidates per document (0 = no cap)
+    rerank_mode: str  # "cross_encoder", "late_interaction" or "cascade"
+    cascade_candidates: int  # Late-interaction survivors passed to the cross-encoder
+    answer_cache_ttl_seconds: float
+
+    def search_limit(self, limit: int, rerank: bool) -> int:
+        """Number of search hits to fetch for a result limit."""
+        if not rerank:
+            return limit
+        return max(self.rerank_candidates, limit) if self.rerank_candidates else limit * 4
+
+    @property
+    def late_interaction(self) -> bool:
+        """Whether the rerank mode needs late-interaction vectors stored at ingestion."""
+        return self.rerank_mode != "cross_encoder"
+
+
+PROFILE_FIELDS = tuple(f.name for f in fields(Profile))
+
+
+def default_profile() -> Profile:
+    """Profile of a collection without overrides (the global settings)."""
+    return Profile(
+        chunking_mode=settings.chunking_mode,
+        chunk_size=settings.chunk_size,
+        chunk_overlap=settings.chunk_overlap,
+        sparse_backend=settings.retrieval_sparse_backend,
+        quantization=settings.qdrant_quantization,
+        retrieval_limit=settings.retrieval_limit,
+        retrieval_min_score=settings.retrieval_min_score,
+        retrieval_rerank=settings.retrieval_rerank,
+        retrieval_hybrid=settings.retrieval_hybrid,
+        rerank_candidates=settings.retrieval_rerank_candidates,
+        rerank_group_size=settings.retrieval_rerank_group_size,
+        rerank_mode=settings.retrieval_rerank_mode,
+        cascade_candidates=settings.retrieval_cascade_candidates,
+        answer_cache_ttl_seconds=settings.answer_cache_ttl_seconds,
+    )
+
+
+def resolve(overrides: CollectionProfile | None) -> Profile:
+    """Apply a stored profile's non-NULL columns over the global settings."""
+    profile = default_profile()
+    if overrides is None:
+        return profile
+    values = {name: getattr(overrides, name) for name in PROFILE_FIELDS}
+    return replace(profile, **{name: value for name, value in values.items() if value is not None})
+
+
+def get_profile(collection_name: str) -> Profile:
+    """Get the effective profile of a vector store collection.
+
+    Cached for collection_profile_ttl_seconds. Collections without a database
+    row (e.g. created by scripts) and lookup errors use the global settings.
+
+    Args:
+        collection_name: Vector store collection name ("{org_id}_{name}").
+    """
+    now = time.monotonic()
+    with _profile_lock:
+        cached = _profile_cache.get(collection_name)
+    if cached is not None and now - cached[0] < settings.collection_profile_ttl_seconds:
+        return cached[1]
+
+    db = SessionLocal()
+    try:
+        overrides = (
+            db.query(CollectionProfile)
+            .join(Collection)
+            .filter(Collection.organization_id + "_" + Collection.name == collection_name)
+            .first()
+        )
+        profile = resolve(overrides)
+    except Exception as e:
+        logger.warning(f"[Profile] Could not load profile of {collection_name}: {e}")
+        profile = default_profile()
+    finally:
+        db.close()
+
+    with _profile_lock:
+        _profile_cache[collection_name] = (now, profile)
+    return profile
+
+
+def invalidate(collection_name: str | None = None) -> None:
+    """Drop a collection's cached profile, or all cached profiles."""
+    with _profile_lock:
+        if collection_name is None:
+            _profile_cache.clear()
+        else:
+            _profile_cache.pop(collection_name, None)
+
+
+def validate(values: dict[str, Any]) -> None:
+    """Check profile overrides, raising ValueError for unknown fields or values."""
+    unknown = set(values) - set(PROFILE_FIELDS)
+    if unknown:
+        raise ValueError(f"Unknown profile fields: {', '.join(sorted(unknown))}")
+    choices = {
+        "chunking_mode": CHUNKING_MODES,
+        "sparse_backend": SPARSE_BACKENDS,
+        "quantization": QUANTIZATIONS,
+        "rerank_mode": RERANK_MODES,
+    }
+    for name, allowed in choices.items():
+        if values.get(name) is not None and values[name] not in allowed:
+            raise ValueError(f"{name} must be one of {', '.join(allowed)}")
+    for name in ("chunk_size", "retrieval_limit", "cascade_candidates"):
+        if values.get(name) is not None and values[name] < 1:
+            raise ValueError(f"{name} must be positive")
+    for name in ("rerank_candidates", "rerank_group_size"):
+        if values.get(name) is not None and values[name] < 0:
+            raise ValueError(f"{name} must not be negative")
+    chunk_size = values.get("chunk_size") or settings.chunk_size
+    if values.get("chunk_overlap") is not None and not 0 <= values["chunk_overlap"] < chunk_size:
+        raise ValueError("chunk_overlap must be at least 0 and smaller than chunk_size")
+
+
+def update_profile(db, collection: Collection, values: dict[str, Any]) -> Profile:
+    """Store profile overrides of a collection and apply them.
+
+    Fields set to None fall back to the global settings. Quantization is
+    applied to the Qdrant collection right away; chunking changes (and the
+    late-interaction vectors a new rerank mode needs) apply to documents
+    ingested afterwards; backfill existing ones with
+    simba.scripts.migrate_sparse --late-interaction.
+
+    Args:
+        db: Database session.
+        collection: Collection to update.
+        values: Profile fields to set.
+
+    Returns:
+        The collection's new effective profile.
+    """
+    from simba.services import qdrant_service
+
+    validate(values)
+    overrides = collection.profile or CollectionProfile(collection_id=collection.id)
+    previous = resolve(collection.profile)
+    for name, value in values.items():
+        setattr(overrides, name, value)
+    db.add(overrides)
+    db.commit()
+    db.refresh(overrides)
+
+    collection_name = f"{collection.organization_id}_{collection.name}"
+    invalidate(collection_name)
+    profile = resolve(overrides)
+
+    if profile.quantization != previous.quantization and settings.vector_store_backend != "numpy":
+        qdrant_service.update_quantization(collection_name, profile.quantization)
+    logger.info(f"[Profile] Updated {collection_name}: {values}")
+    return profile
@@ -1,29 +1,83 @@
 """Qdrant vector database service."""
 
 import logging
+import threading
+import time
+from collections.abc import Iterator
 from functools import lru_cache
-from typing import Any
+from typing import TYPE_CHECKING, Any
 
+import numpy as np
 from qdrant_client import QdrantClient
 from qdrant_client.models import (
+    BinaryQuantization,
+    BinaryQuantizationConfig,
+    Disabled,
     Distance,
     FieldCondition,
     Filter,
     Fusion,
+    HasIdCondition,
+    HnswConfigDiff,
+    IsEmptyCondition,
+    MatchAny,
+    MatchText,
     MatchValue,
-    PointStruct,
+    Modifier,
+    MultiVectorComparator,
+    MultiVectorConfig,
+    PayloadField,
+    PayloadSchemaType,
+    PointIdsList,
     Prefetch,
+    QuantizationConfig,
+    Range,
+    ScalarQuantization,
+    ScalarQuantizationConfig,
+    ScalarType,
+    ScoredPoint,
+    SearchParams,
+    SetPayload,
+    SetPayloadOperation,
     SparseIndexParams,
     SparseVector,
     SparseVectorParams,
+    TextIndexParams,
+    TextIndexType,
+    TokenizerType,
     VectorParams,
 )
 
 from simba.core.config import settings
+from simba.services.language_service import UNKNOWN
 from simba.services.metrics_service import SEARCH_LATENCY, track_latency
 
 logger = logging.getLogger(__name__)
 
+if TYPE_CHECKING:
+    from simba.services.embedding_service import SparseEmbedding
+
+# Named sparse vector per sparse backend (settings.retrieval_sparse_backend)
+SPARSE_VECTOR_NAMES = {"splade": "text-sparse", "bm25": "text-bm25"}
+
+# Named multivector holding late-interaction (ColBERT) token vectors, used only
+# to rescore candidates (no HNSW graph)
+LATE_INTERACTION_VECTOR = "text-colbert"
+
+# Search-time HNSW params per collection, read from collection metadata:
+# collection name -> (monotonic time fetched, params)
+_search_params_cache: dict[str, tuple[float, SearchParams | None]] = {}
+_search_params_lock = threading.Lock()
+
+
+def sparse_vector_name(backend: str | None = None) -> str:
+    """Get the named sparse vector used by a sparse backend.
+
+    Args:
+        backend: "splade" or "bm25". Defaults to settings.retrieval_sparse_backend.
+    """
+    return SPARSE_VECTOR_NAMES[backend or settings.retrieval_sparse_backend]
+
 
 @lru_cache
 def get_qdrant_client() -> QdrantClient:
@@ -35,6 +89,8 @@ def get_qdrant_client() -> QdrantClient:
         return QdrantClient(
             url=host,
             api_key=settings.qdrant_api_key,
+            prefer_grpc=settings.qdrant_prefer_grpc,
+            grpc_port=settings.qdrant_grpc_port,
         )
 
     # Local connection without protocol
@@ -42,15 +98,21 @@ def get_qdrant_client() -> QdrantClient:
         host=host,
         port=settings.qdrant_port,
         api_key=settings.qdrant_api_key,
+        prefer_grpc=settings.qdrant_prefer_grpc,
+        grpc_port=settings.qdrant_grpc_port,
     )
 
 
-def create_collection(collection_name: str, with_sparse: bool = True) -> None:
+def create_collection(
+    collection_name: str, with_sparse: bool = True, with_late_interaction: bool = True
+) -> None:
     """Create a new Qdrant collection with optional sparse vector support.
 
     Args:
         collection_name: Name of the collection to create.
         with_sparse: Whether to include sparse vector configuration for hybrid search.
+        with_late_interaction: Whether to include the late-interaction multivector
+            (points only take space once vectors are stored in it).
     """
     client = get_qdrant_client()
 
@@ -61,16 +123,221 @@ def create_collection(collection_name: str, with_sparse: bool = True) -> None:
 
     sparse_config = None
     if with_sparse:
-        sparse_config = {"text-sparse": SparseVectorParams(index=SparseIndexParams(on_disk=False))}
+        sparse_config = {
+            SPARSE_VECTOR_NAMES["splade"]: SparseVectorParams(
+                index=SparseIndexParams(on_disk=False)
+            ),
+            # Qdrant computes IDF from the collection's current points at query time
+            SPARSE_VECTOR_NAMES["bm25"]: SparseVectorParams(
+                index=SparseIndexParams(on_disk=False), modifier=Modifier.IDF
+            ),
+        }
+
+    vectors_config: VectorParams | dict[str, VectorParams] = VectorParams(
+        size=settings.embedding_dimensions,
+        distance=Distance.COSINE,
+    )
+    if with_late_interaction:
+        vectors_config = {
+            "": vectors_config,
+            LATE_INTERACTION_VECTOR: VectorParams(
+                size=settings.retrieval_late_interaction_dimensions,
+                distance=Distance.COSINE,
+                multivector_config=MultiVectorConfig(comparator=MultiVectorComparator.MAX_SIM),
+                hnsw_config=HnswConfigDiff(m=0),  # Rescoring only: never searched directly
+            ),
+        }
 
     client.create_collection(
         collection_name=collection_name,
-        vectors_config=VectorParams(
-            size=settings.embedding_dimensions,
-            distance=Distance.COSINE,
-        ),
+        vectors_config=vectors_config,
         sparse_vectors_config=sparse_config,
+        hnsw_config=HnswConfigDiff(
+            m=settings.qdrant_hnsw_m,
+            ef_construct=settings.qdrant_hnsw_ef_construct,
+        ),
+        quantization_config=_quantization_config(settings.qdrant_quantization),
+    )
+
+    create_payload_indexes(collection_name)
+
+
+def create_payload_indexes(collection_name: str) -> None:
+    """Create the payload indexes used by retrieval filters and lookups.
+
+    Idempotent: Qdrant ignores requests for indexes that already exist, so this
+    can be run against collections created before an index was added.
+
+    Args:
+        collection_name: Name of the collection.
+    """
+    client = get_qdrant_client()
+
+    # Document filters (per-document search, deletes, chunk listing)
+    client.create_payload_index(
+        collection_name=collection_name,
+        field_name="document_id",
+        field_schema=PayloadSchemaType.KEYWORD,
+    )
+    # Neighbor lookups for small-to-big context expansion
+    client.create_payload_index(
+        collection_name=collection_name,
+        field_name="chunk_position",
+        field_schema=PayloadSchemaType.INTEGER,
+    )
+    # Markdown heading path of each chunk, for section filters
+    client.create_payload_index(
+        collection_name=collection_name,
+        field_name="heading_path",
+        field_schema=PayloadSchemaType.KEYWORD,
+    )
+    # MinHash LSH bands, used to find near-duplicate chunks at ingestion
+    client.create_payload_index(
+        collection_name=collection_name,
+        field_name="minhash_bands",
+        field_schema=PayloadSchemaType.KEYWORD,
+    )
+    # Documents sharing a near-duplicate chunk, looked up when one is deleted
+    client.create_payload_index(
+        collection_name=collection_name,
+        field_name="shared_by[].document_id",
+        field_schema=PayloadSchemaType.KEYWORD,
+    )
+    # Per-chunk language tag, used to route the sparse leg of hybrid search
+    client.create_payload_index(
+        collection_name=collection_name,
+        field_name="language",
+        field_schema=PayloadSchemaType.KEYWORD,
+    )
+    # Full-text index for exact identifier lookups (order numbers, SKUs, error codes)
+    client.create_payload_index(
+        collection_name=collection_name,
+        field_name="chunk_text",
+        field_schema=TextIndexParams(
+            type=TextIndexType.TEXT,
+            tokenizer=TokenizerType.WORD,
+            min_token_len=2,
+            lowercase=True,
+        ),
+    )
+
+
+def get_hnsw_config(collection_name: str) -> dict[str, int | None]:
+    """Get the HNSW index and search-time config of a collection.
+
+    Args:
+        collection_name: Name of the collection.
+
+    Returns:
+        Dict with m and ef_construct (index build params) and hnsw_ef (search-time
+        beam width, None for Qdrant's default).
+    """
+    client = get_qdrant_client()
+    config = client.get_collection(collection_name=collection_name).config
+    metadata = config.metadata or {}
+    return {
+        "m": config.hnsw_config.m,
+        "ef_construct": config.hnsw_config.ef_construct,
+        "hnsw_ef": metadata.get("hnsw_ef", settings.qdrant_hnsw_ef),
+    }
+
+
+def update_hnsw_config(
+    collection_name: str,
+    m: int | None = None,
+    ef_construct: int | None = None,
+    hnsw_ef: int | None = None,
+) -> None:
+    """Update a collection's HNSW config in place.
+
+    Changing m or ef_construct makes Qdrant rebuild the index in the background
+    from the stored vectors; points don't need to be re-uploaded. hnsw_ef is
+    stored in the collection metadata and used by every search on it.
+
+    Args:
+        collection_name: Name of the collection.
+        m: Edges per node in the HNSW graph.
+        ef_construct: Beam width while building the index.
+        hnsw_ef: Beam width at search time.
+    """
+    client = get_qdrant_client()
+
+    hnsw_config = None
+    if m is not None or ef_construct is not None:
+        hnsw_config = HnswConfigDiff(m=m, ef_construct=ef_construct)
+
+    client.update_collection(
+        collection_name=collection_name,
+        hnsw_config=hnsw_config,
+        metadata={"hnsw_ef": hnsw_ef} if hnsw_ef is not None else None,
+    )
+
+    with _search_params_lock:
+        _search_params_cache.pop(collection_name, None)
+    logger.info(
+        f"[Qdrant] Updated HNSW config of {collection_name}: "
+        f"m={m}, ef_construct={ef_construct}, hnsw_ef={hnsw_ef}"
+    )
+
+
+def _quantization_config(quantization: str | None) -> QuantizationConfig | None:
+    """Qdrant quantization config for "scalar" (int8) or "binary", None for none."""
+    if quantization == "scalar":
+        return ScalarQuantization(
+            scalar=ScalarQuantizationConfig(type=ScalarType.INT8, always_ram=True)
+        )
+    if quantization == "binary":
+        return BinaryQuantization(binary=BinaryQuantizationConfig(always_ram=True))
+    return None
+
+
+def update_quantization(collection_name: str, quantization: str | None) -> None:
+    """Enable, change or disable vector quantization of a collection.
+
+    Qdrant builds the quantized vectors in the background; searches use them
+    (rescored with the original vectors) once they are ready.
+
+    Args:
+        collection_name: Name of the collection.
+        quantization: "scalar" (int8), "binary", or None to disable.
+    """
+    client = get_qdrant_client()
+    client.update_collection(
+        collection_name=collection_name,
+        quantization_config=_quantization_config(quantization) or Disabled.DISABLED,
     )
+    logger.info(f"[Qdrant] Set quantization of {collection_name} to {quantization}")
+
+
+def get_search_params(collection_name: str) -> SearchParams | None:
+    """Get the search params for a collection's tuned hnsw_ef.
+
+    Read from the collection metadata and cached for
+    qdrant_search_params_ttl_seconds, so updates from other processes are
+    picked up without a metadata request per search.
+
+    Args:
+        collection_name: Name of the collection.
+
+    Returns:
+        SearchParams with hnsw_ef, or None to use Qdrant's default.
+    """
+    now = time.monotonic()
+    with _search_params_lock:
+        cached = _search_params_cache.get(collection_name)
+    if cached is not None and now - cached[0] < settings.qdrant_search_params_ttl_seconds:
+        return cached[1]
+
+    try:
+        hnsw_ef = get_hnsw_config(collection_name)["hnsw_ef"]
+    except Exception as e:
+        logger.warning(f"[Qdrant] Could not read search params of {collection_name}: {e}")
+        hnsw_ef = settings.qdrant_hnsw_ef
+
+    params = SearchParams(hnsw_ef=hnsw_ef) if hnsw_ef else None
+    with _search_params_lock:
+        _search_params_cache[collection_name] = (now, params)
+    return params
 
 
 def delete_collection(collection_name: str) -> None:
@@ -81,6 +348,8 @@ def delete_collection(collection_name: str) -> None:
     """
     client = get_qdrant_client()
     client.delete_collection(collection_name=collection_name)
+    with _search_params_lock:
+        _search_params_cache.pop(collection_name, None)
 
 
 def collection_exists(collection_name: str) -> bool:
@@ -99,57 +368,116 @@ def collection_exists(collection_name: str) -> bool:
 
 def upsert_vectors(
     collection_name: str,
-    points: list[dict[str, Any]],
+    ids: list[str],
+    vectors: np.ndarray,
+    payloads: list[dict[str, Any]],
+    sparse_vectors: list["SparseEmbedding"] | None = None,
+    sparse_backend: str | None = None,
+    multivectors: list[np.ndarray] | None = None,
 ) -> None:
     """Insert or update vectors in a collection.
 
+    Vectors stay as NumPy arrays and are handed to the client's batched
+    uploader, which converts one batch at a time (over gRPC when
+    qdrant_prefer_grpc is set) instead of materializing every point upfront.
+
     Args:
         collection_name: Name of the collection.
-        points: List of points with id, vector, and payload.
-            Each point should have:
-            - id: str (unique identifier)
-            - vector: list[float] (dense embedding vector)
-            - sparse_indices: list[int] (optional, sparse vector indices)
-            - sparse_values: list[float] (optional, sparse vector values)
-            - payload: dict (metadata like document_id, chunk_text, etc.)
+        ids: Unique point identifiers.
+        vectors: Dense embeddings, float32 array of shape (len(ids), dimensions).
+        payloads: Metadata per point (document_id, chunk_text, etc.).
+        sparse_vectors: Optional (indices, values) arrays per point for hybrid search,
+            stored under the sparse backend's vector.
+        sparse_backend: Backend that computed sparse_vectors. Defaults to
+            settings.retrieval_sparse_backend.
+        multivectors: Optional late-interaction token vectors per point, a
+            (tokens, dimensions) array each.
     """
     client = get_qdrant_client()
 
-    qdrant_points = []
-    for point in points:
-        # Build vector config - can be just dense or dense + sparse
-        has_sparse = "sparse_indices" in point and "sparse_values" in point
-
-        if has_sparse:
-            vector = {
-                "": point["vector"],  # Default dense vector
-                "text-sparse": SparseVector(
-                    indices=point["sparse_indices"],
-                    values=point["sparse_values"],
-                ),
-            }
-        else:
-            vector = point["vector"]
-
-        qdrant_points.append(
-            PointStruct(
-                id=point["id"],
-                vector=vector,
-                payload=point.get("payload", {}),
-            )
+    if multivectors is not None and not collection_has_late_interaction(collection_name):
+        logger.warning(
+            f"Collection '{collection_name}' has no '{LATE_INTERACTION_VECTOR}' multivector "
+            "(created before late-interaction support). Storing without it."
+        )
+        multivectors = None
+
+    sparse_name = sparse_vector_name(sparse_backend)
+    if sparse_vectors is not None and not collection_has_sparse_vectors(
+        collection_name, sparse_backend
+    ):
+        logger.warning(
+            f"Collection '{collection_name}' has no '{sparse_name}' sparse vector. "
+            "Storing dense vectors only; run migrate_sparse to add it."
+        )
+        sparse_vectors = None
+
+    if sparse_vectors is None and multivectors is None:
+        point_vectors: np.ndarray | Iterator[dict[str, Any]] = vectors
+    else:
+        # Named vectors: default dense vector + sparse and/or late-interaction,
+        # converted lazily one upload batch at a time
+        point_vectors = _named_vector_points(
+            vectors, sparse_name, sparse_vectors, multivectors, settings.qdrant_upsert_batch_size
         )
 
-    client.upsert(
+    client.upload_collection(
         collection_name=collection_name,
-        points=qdrant_points,
+        vectors=point_vectors,
+        payload=payloads,
+        ids=ids,
+        batch_size=settings.qdrant_upsert_batch_size,
+        wait=True,
     )
 
 
+def _named_vector_points(
+    dense: np.ndarray,
+    sparse_name: str,
+    sparse_vectors: list["SparseEmbedding"] | None,
+    multivectors: list[np.ndarray] | None,
+    batch_size: int,
+) -> Iterator[dict[str, Any]]:
+    """Named vectors of every point, keyed by vector name.
+
+    Dense rows are converted with one tolist() per upload batch, as the client
+    does for a plain array. Rows can't be passed as arrays: the gRPC converter
+    silently drops array values of named vectors.
+    """
+    for start in range(0, len(dense), batch_size):
+        rows = dense[start : start + batch_size].tolist()
+        for i, row in enumerate(rows, start):
+            yield _named_vectors(
+                row,
+                sparse_name,
+                sparse_vectors[i] if sparse_vectors is not None else None,
+                multivectors[i] if multivectors is not None else None,
+            )
+
+
+def _named_vectors(
+    dense: list[float],
+    sparse_name: str,
+    sparse: "SparseEmbedding | None",
+    multivector: np.ndarray | None,
+) -> dict[str, Any]:
+    """Vectors of one point keyed by vector name."""
+    vectors: dict[str, Any] = {"": dense}
+    if sparse is not None:
+        vectors[sparse_name] = SparseVector(indices=sparse[0].tolist(), values=sparse[1].tolist())
+    if multivector is not None and len(multivector):
+        vectors[LATE_INTERACTION_VECTOR] = multivector.tolist()
+    return vectors
+
+
 def search(
     collection_name: str,
-    query_vector: list[float],
+    query_vector: np.ndarray,
     limit: int = 5,
     document_id: str | None = None,
+    search_params: SearchParams | None = None,
+    document_ids: list[str] | None = None,
+    group_size: int | None = None,
 ) -> list[dict[str, Any]]:
     """Search for similar vectors in a collection.
 
@@ -158,31 +486,27 @@ def search(
         query_vector: Query embedding vector.
         limit: Maximum number of results.
         document_id: Optional filter by document ID.
+        search_params: HNSW search params (e.g. hnsw_ef, exact). Defaults to the
+            collection's tuned params (see get_search_params).
+        document_ids: Optional filter to any of these document IDs (chunks they own or share).
+        group_size: Optional cap on results per document_id (grouped query).
 
     Returns:
         List of search results with id, score, and payload.
     """
     client = get_qdrant_client()
-
-    query_filter = None
-    if document_id:
-        query_filter = Filter(
-            must=[
-                FieldCondition(
-                    key="document_id",
-                    match=MatchValue(value=document_id),
-                )
-            ]
-        )
+    query_filter = _document_filter(document_id, document_ids)
 
     with track_latency(SEARCH_LATENCY):
-        results = client.query_points(
-            collection_name=collection_name,
+        results = _query_points(
+            client,
+            collection_name,
+            limit,
+            group_size,
             query=query_vector,
             query_filter=query_filter,
-            limit=limit,
-            with_payload=True,
-        ).points
+            search_params=search_params or get_search_params(collection_name),
+        )
 
     return [
         {
@@ -194,11 +518,62 @@ def search(
     ]
 
 
-def collection_has_sparse_vectors(collection_name: str) -> bool:
+def _query_points(
+    client: QdrantClient,
+    collection_name: str,
+    limit: int,
+    group_size: int | None,
+    **query: Any,
+) -> list[ScoredPoint]:
+    """Run a query, optionally keeping at most group_size hits per document_id.
+
+    Grouped queries return the best `limit` documents with up to group_size
+    hits each; their hits are merged and cut back to the `limit` best.
+    """
+    if not group_size:
+        return client.query_points(
+            collection_name=collection_name, limit=limit, with_payload=True, **query
+        ).points
+
+    groups = client.query_points_groups(
+        collection_name=collection_name,
+        group_by="document_id",
+        limit=limit,
+        group_size=group_size,
+        with_payload=True,
+        **query,
+    ).groups
+    hits = [hit for group in groups for hit in group.hits]
+    return sorted(hits, key=lambda hit: hit.score, reverse=True)[:limit]
+
+
+def _document_filter(document_id: str | None, document_ids: list[str] | None) -> Filter | None:
+    """Filter on one document ID and/or a set of document IDs, or None for no filter.
+
+    Chunks match the set (routed documents) also when one of its documents
+    shares them: its near-duplicate text is stored under another document.
+    """
+    conditions: list[FieldCondition | Filter] = []
+    if document_id:
+        conditions.append(FieldCondition(key="document_id", match=MatchValue(value=document_id)))
+    if document_ids is not None:
+        conditions.append(
+            Filter(
+                should=[
+                    FieldCondition(key="document_id", match=MatchAny(any=document_ids)),
+                    FieldCondition(key="shared_by[].document_id", match=MatchAny(any=document_ids)),
+                ]
+            )
+        )
+    return Filter(must=conditions) if conditions else None
+
+
+def collection_has_sparse_vectors(collection_name: str, backend: str | None = None) -> bool:
     """Check if a collection has sparse vector configuration.
 
     Args:
         collection_name: Name of the collection.
+        backend: Sparse backend to check. Defaults to settings.retrieval_sparse_backend.
 
     Returns:
         True if collection supports sparse vectors, False otherwise.
@@ -206,19 +581,81 @@ def collection_has_sparse_vectors(collection_name: str) -> bool:
     client = get_qdrant_client()
     try:
         info = client.get_collection(collection_name=collection_name)
-        # Check if sparse_vectors_config exists and has 'text-sparse'
+        # Check if sparse_vectors_config exists and has the backend's named vector
         sparse_config = info.config.params.sparse_vectors
-        return sparse_config is not None and "text-sparse" in sparse_config
+        return sparse_config is not None and sparse_vector_name(backend) in sparse_config
     except Exception:
         return False
 
 
+def collection_has_late_interaction(collection_name: str) -> bool:
+    """Check if a collection has the late-interaction multivector configured.
+
+    Args:
+        collection_name: Name of the collection.
+
+    Returns:
+        True if points of the collection can store late-interaction vectors.
+    """
+    client = get_qdrant_client()
+    try:
+        vectors = client.get_collection(collection_name=collection_name).config.params.vectors
+        return isinstance(vectors, dict) and LATE_INTERACTION_VECTOR in vectors
+    except Exception:
+        return False
+
+
+def late_interaction_rescore(
+    collection_name: str,
+    query_multivector: np.ndarray,
+    ids: list[str],
+    limit: int,
+) -> list[dict[str, Any]]:
+    """Score candidate points by MaxSim against their late-interaction vectors.
+
+    Qdrant computes MaxSim server-side (for every query token, the best cosine
+    similarity over the point's token vectors, summed); scores are divided by
+    the number of query tokens so they fall in [-1, 1]. Points without
+    late-interaction vectors are not returned.
+
+    Args:
+        collection_name: Name of the collection.
+        query_multivector: Query token vectors, shape (tokens, dimensions).
+        ids: IDs of the candidate points.
+        limit: Maximum number of results.
+
+    Returns:
+        List of results with id, score, and payload, best first.
+    """
+    client = get_qdrant_client()
+    with track_latency(SEARCH_LATENCY):
+        results = client.query_points(
+            collection_name=collection_name,
+            query=query_multivector.tolist(),
+            using=LATE_INTERACTION_VECTOR,
+            query_filter=Filter(must=[HasIdCondition(has_id=ids)]),
+            search_params=SearchParams(exact=True),
+            limit=limit,
+            with_payload=True,
+        ).points
+
+    tokens = max(len(query_multivector), 1)
+    return [
+        {"id": result.id, "score": result.score / tokens, "payload": result.payload}
+        for result in results
+    ]
+
+
 def hybrid_search(
     collection_name: str,
-    query_dense: list[float],
-    query_sparse: tuple[list[int], list[float]] | None = None,
+    query_dense: np.ndarray,
+    query_sparse: "SparseEmbedding | None" = None,
     limit: int = 5,
     document_id: str | None = None,
+    language: str | None = None,
+    sparse_backend: str | None = None,
+    document_ids: list[str] | None = None,
+    group_size: int | None = None,
 ) -> list[dict[str, Any]]:
     """Hybrid search using dense + sparse vectors with RRF fusion.
 
@@ -231,26 +668,22 @@ def hybrid_search(
         query_sparse: Optional tuple of (indices, values) for sparse vector.
         limit: Maximum number of results.
         document_id: Optional filter by document ID.
+        language: Optional query language; restricts the sparse prefetch to chunks
+            tagged with it, untagged chunks (unknown language, or from before
+            language tagging) and chunks tagged "unknown".
+        sparse_backend: Backend that computed query_sparse. Defaults to
+            settings.retrieval_sparse_backend.
+        document_ids: Optional filter to any of these document IDs (chunks they own or share).
+        group_size: Optional cap on fused results per document_id (grouped query).
 
     Returns:
         List of search results with id, score, and payload.
     """
     client = get_qdrant_client()
-
-    # Build filter if document_id specified
-    query_filter = None
-    if document_id:
-        query_filter = Filter(
-            must=[
-                FieldCondition(
-                    key="document_id",
-                    match=MatchValue(value=document_id),
-                )
-            ]
-        )
+    query_filter = _document_filter(document_id, document_ids)
 
     # Check if we can do hybrid search
-    has_sparse = collection_has_sparse_vectors(collection_name)
+    has_sparse = collection_has_sparse_vectors(collection_name, sparse_backend)
 
     if not has_sparse or query_sparse is None:
         if query_sparse is not None and not has_sparse:
@@ -259,33 +692,53 @@ def hybrid_search(
                 "Falling back to dense-only search. Consider re-indexing with sparse vectors."
             )
         # Fall back to dense-only search
-        return search(collection_name, query_dense, limit, document_id)
+        return search(
+            collection_name,
+            query_dense,
+            limit,
+            document_id,
+            document_ids=document_ids,
+            group_size=group_size,
+        )
+
+    sparse_filter = query_filter
+    if language:
+        sparse_filter = Filter(
+            must=query_filter.must if query_filter else None,
+            should=[
+                # Chunks ingested before unknown chunks were left untagged carry UNKNOWN
+                FieldCondition(key="language", match=MatchAny(any=[language, UNKNOWN])),
+                IsEmptyCondition(is_empty=PayloadField(key="language")),
+            ],
+        )
 
     with track_latency(SEARCH_LATENCY):
         # Hybrid search with RRF fusion
-        results = client.query_points(
-            collection_name=collection_name,
+        results = _query_points(
+            client,
+            collection_name,
+            limit,
+            group_size,
             prefetch=[
                 Prefetch(
-                    query=query_dense,
+                    query=query_dense.tolist(),
                     using="",  # Default dense vector
                     limit=limit * 2,
                     filter=query_filter,
+                    params=get_search_params(collection_name),
                 ),
                 Prefetch(
                     query=SparseVector(
-                        indices=query_sparse[0],
-                        values=query_sparse[1],
+                        indices=query_sparse[0].tolist(),
+                        values=query_sparse[1].tolist(),
                     ),
-                    using="text-sparse",
+                    using=sparse_vector_name(sparse_backend),
                     limit=limit * 2,
-                    filter=query_filter,
+                    filter=sparse_filter,
                 ),
             ],
             query=Fusion.RRF,
-            limit=limit,
-            with_payload=True,
-        ).points
+        )
 
     return [
         {
@@ -297,6 +750,187 @@ def hybrid_search(
     ]
 
 
+def text_search(
+    collection_name: str,
+    terms: list[str],
+    limit: int = 5,
+) -> list[dict[str, Any]]:
+    """Find chunks whose text matches any of the terms via the full-text index.
+
+    Each term matches chunks containing all of its words (as tokenized by the
+    chunk_text index), in any order; callers verify exact matches themselves.
+
+    Args:
+        collection_name: Name of the collection.
+        terms: Terms to look up, e.g. identifiers extracted from a query.
+        limit: Maximum number of results.
+
+    Returns:
+        List of matching points with id and payload (score is always 1.0).
+    """
+    client = get_qdrant_client()
+
+    with track_latency(SEARCH_LATENCY):
+        results, _ = client.scroll(
+            collection_name=collection_name,
+            scroll_filter=Filter(
+                should=[
+                    FieldCondition(key="chunk_text", match=MatchText(text=term)) for term in terms
+                ]
+            ),
+            limit=limit,
+            with_payload=True,
+            with_vectors=False,
+        )
+
+    return [{"id": result.id, "score": 1.0, "payload": result.payload} for result in results]
+
+
+def get_chunk_windows(
+    collection_name: str, windows: list[tuple[str, int, int]]
+) -> list[dict[str, Any]]:
+    """Get the chunks in position ranges of several documents in one request.
+
+    Args:
+        collection_name: Name of the collection.
+        windows: (document_id, first chunk_position, last chunk_position) ranges.
+
+    Returns:
+        Payloads of the matching chunks, in no particular order.
+    """
+    if not windows:
+        return []
+    client = get_qdrant_client()
+
+    with track_latency(SEARCH_LATENCY):
+        results, _ = client.scroll(
+            collection_name=collection_name,
+            scroll_filter=Filter(
+                should=[
+                    Filter(
+                        must=[
+                            FieldCondition(key="document_id", match=MatchValue(value=document_id)),
+                            FieldCondition(key="chunk_position", range=Range(gte=first, lte=last)),
+                        ]
+                    )
+                    for document_id, first, last in windows
+                ]
+            ),
+            limit=sum(last - first + 1 for _, first, last in windows),
+            with_payload=True,
+            with_vectors=False,
+        )
+
+    return [point.payload for point in results]
+
+
+def lsh_candidates(
+    collection_name: str,
+    band_keys: list[str],
+    exclude_document_id: str | None = None,
+    batch_size: int = 1024,
+) -> list[dict[str, Any]]:
+    """Get the chunks sharing any LSH band key, with their MinHash signatures.
+
+    Args:
+        collection_name: Name of the collection.
+        band_keys: Band keys of the chunks being ingested.
+        exclude_document_id: Ignore chunks of this document (e.g. when re-ingesting it).
+        batch_size: Band keys per request, and points per scroll page.
+
+    Returns:
+        Candidate points ({"id", "payload"}, payload with the "minhash" and
+        "shared_by" fields).
+    """
+    client = get_qdrant_client()
+    must_not = None
+    if exclude_document_id:
+        must_not = [FieldCondition(key="document_id", match=MatchValue(value=exclude_document_id))]
+
+    # A point sharing bands with several batches is returned once
+    candidates: dict[str, dict[str, Any]] = {}
+    for start in range(0, len(band_keys), batch_size):
+        batch = band_keys[start : start + batch_size]
+        offset = None
+        # Common text (a disclaimer in every document) can match more points than
+        # band keys in the batch: page until the scroll is exhausted
+        while True:
+            results, offset = client.scroll(
+                collection_name=collection_name,
+                scroll_filter=Filter(
+                    must=[FieldCondition(key="minhash_bands", match=MatchAny(any=batch))],
+                    must_not=must_not,
+                ),
+                limit=batch_size,
+                offset=offset,
+                with_payload=["minhash", "shared_by"],
+                with_vectors=False,
+            )
+            for point in results:
+                if point.payload and "minhash" in point.payload:
+                    candidates[str(point.id)] = {"id": str(point.id), "payload": point.payload}
+            if offset is None:
+                break
+    return list(candidates.values())
+
+
+def shared_points(
+    collection_name: str, document_id: str, batch_size: int = 256
+) -> list[dict[str, Any]]:
+    """Get the points linking a document to others through near-duplicate sharing.
+
+    Args:
+        collection_name: Name of the collection.
+        document_id: Document ID.
+        batch_size: Points per scroll request.
+
+    Returns:
+        Points ({"id", "payload"}, payload with the "document_id" and "shared_by"
+        fields) owned by the document and shared with others, or owned by other
+        documents and shared with it.
+    """
+    client = get_qdrant_client()
+    owned = Filter(
+        must=[FieldCondition(key="document_id", match=MatchValue(value=document_id))],
+        must_not=[IsEmptyCondition(is_empty=PayloadField(key="shared_by"))],
+    )
+    sharing = FieldCondition(key="shared_by[].document_id", match=MatchValue(value=document_id))
+
+    points = []
+    offset = None
+    while True:
+        results, offset = client.scroll(
+            collection_name=collection_name,
+            scroll_filter=Filter(should=[owned, sharing]),
+            limit=batch_size,
+            offset=offset,
+            with_payload=["document_id", "shared_by"],
+            with_vectors=False,
+        )
+        points.extend({"id": str(point.id), "payload": point.payload or {}} for point in results)
+        if offset is None:
+            return points
+
+
+def set_payloads(collection_name: str, payloads: dict[str, dict[str, Any]]) -> None:
+    """Overwrite payload fields of points; their other fields are kept.
+
+    Args:
+        collection_name: Name of the collection.
+        payloads: Fields to set, by point ID.
+    """
+    if not payloads:
+        return
+    client = get_qdrant_client()
+    client.batch_update_points(
+        collection_name=collection_name,
+        update_operations=[
+            SetPayloadOperation(set_payload=SetPayload(payload=fields, points=[point_id]))
+            for point_id, fields in payloads.items()
+        ],
+    )
+
+
 def delete_by_document_id(collection_name: str, document_id: str) -> None:
     """Delete all vectors associated with a document.
 
@@ -319,6 +953,19 @@ def delete_by_document_id(collection_name: str, document_id: str) -> None:
     )
 
 
+def delete_points(collection_name: str, ids: list[str]) -> None:
+    """Delete points by ID.
+
+    Args:
+        collection_name: Name of the collection.
+        ids: IDs of the points to delete.
+    """
+    if not ids:
+        return
+    client = get_qdrant_client()
+    client.delete(collection_name=collection_name, points_selector=PointIdsList(points=ids))
+
+
 def get_collection_info(collection_name: str) -> dict[str, Any]:
     """Get information about a collection.
 
@@ -334,11 +981,98 @@ def get_collection_info(collection_name: str) -> dict[str, Any]:
     return {
         "name": collection_name,
         "points_count": info.points_count,
-        "vectors_count": info.vectors_count,
+        # qdrant-client 1.16 dropped vectors_count; one dense vector per point
+        "vectors_count": info.points_count,
         "status": info.status.value,
+        "hnsw": {
+            "m": info.config.hnsw_config.m,
+            "ef_construct": info.config.hnsw_config.ef_construct,
+            "hnsw_ef": (info.config.metadata or {}).get("hnsw_ef", settings.qdrant_hnsw_ef),
+        },
     }
 
 
+def count_points(collection_name: str) -> int:
+    """Exact number of points in a collection.
+
+    Args:
+        collection_name: Name of the collection.
+    """
+    client = get_qdrant_client()
+    return client.count(collection_name=collection_name, exact=True).count
+
+
+def iter_points(
+    collection_name: str, batch_size: int = 256
+) -> Iterator[tuple[list[str], np.ndarray, dict[str, list["SparseEmbedding"]], list[dict]]]:
+    """Scroll through all points of a collection with their vectors.
+
+    Args:
+        collection_name: Name of the collection.
+        batch_size: Points per scroll request.
+
+    Yields:
+        Batches of (ids, dense float32 matrix, sparse vectors by name, payloads).
+        Points without a given sparse vector get an empty one.
+    """
+    client = get_qdrant_client()
+    offset = None
+
+    while True:
+        results, offset = client.scroll(
+            collection_name=collection_name,
+            limit=batch_size,
+            offset=offset,
+            with_payload=True,
+            with_vectors=True,
+        )
+        if not results:
+            break
+
+        ids, dense, payloads = [], [], []
+        sparse: dict[str, list[SparseEmbedding]] = {
+            name: [] for name in SPARSE_VECTOR_NAMES.values()
+        }
+        for point in results:
+            vectors = point.vector if isinstance(point.vector, dict) else {"": point.vector}
+            ids.append(str(point.id))
+            dense.append(vectors[""])
+            payloads.append(point.payload or {})
+            for name, rows in sparse.items():
+                vector = vectors.get(name)
+                rows.append(
+                    (
+                        np.asarray(vector.indices if vector else [], dtype=np.uint32),
+                        np.asarray(vector.values if vector else [], dtype=np.float32),
+                    )
+                )
+
+        yield ids, np.asarray(dense, dtype=np.float32), sparse, payloads
+
+        if offset is None:
+            break
+
+
+def sample_chunks(collection_name: str, limit: int = 50) -> list[dict[str, Any]]:
+    """Get the payloads of up to `limit` chunks of a collection.
+
+    Args:
+        collection_name: Name of the collection.
+        limit: Maximum number of payloads.
+
+    Returns:
+        Chunk payloads.
+    """
+    client = get_qdrant_client()
+    results, _ = client.scroll(
+        collection_name=collection_name,
+        limit=limit,
+        with_payload=True,
+        with_vectors=False,
+    )
+    return [point.payload for point in results]
+
+
 def get_document_chunks(
     collection_name: str,
     document_id: str,
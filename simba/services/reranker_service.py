@@ -1,11 +1,18 @@
 """Reranker service using cross-encoder models."""
 
 import logging
+from dataclasses import replace
 from functools import lru_cache
 from typing import TYPE_CHECKING
 
+from simba.core import thread_budget
 from simba.core.config import settings
-from simba.services.metrics_service import RERANK_LATENCY, track_latency
+from simba.services import inference_client
+from simba.services.metrics_service import (
+    LATE_INTERACTION_LATENCY,
+    RERANK_LATENCY,
+    track_latency,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -22,9 +29,23 @@ def get_reranker():
     from sentence_transformers import CrossEncoder
 
     logger.info(f"Loading reranker model: {settings.reranker_model}")
+    thread_budget.apply_torch_budget("reranker")
     return CrossEncoder(settings.reranker_model, device="mps")
 
 
+def compute_scores(pairs: list[tuple[str, str]]) -> list[float]:
+    """Score query-document pairs with the in-process cross-encoder.
+
+    Args:
+        pairs: List of (query, document) text pairs.
+
+    Returns:
+        Relevance score for each pair.
+    """
+    reranker = get_reranker()
+    return [float(score) for score in reranker.predict(pairs)]
+
+
 def rerank_chunks(
     query: str,
     chunks: list["RetrievedChunk"],
@@ -46,13 +67,13 @@ def rerank_chunks(
     top_k = top_k if top_k is not None else settings.reranker_top_k
 
     with track_latency(RERANK_LATENCY):
-        reranker = get_reranker()
-
         # Prepare query-document pairs for cross-encoder
         pairs = [(query, chunk.chunk_text) for chunk in chunks]
 
-        # Get cross-encoder scores
-        scores = reranker.predict(pairs)
+        # Get cross-encoder scores (shared inference server, else in-process model)
+        scores = inference_client.request("rerank", {"pairs": pairs})
+        if scores is None:
+            scores = compute_scores(pairs)
 
         # Combine chunks with new scores and sort
         scored_chunks = list(zip(chunks, scores))
@@ -62,16 +83,67 @@ def rerank_chunks(
         result = []
         for chunk, score in scored_chunks[:top_k]:
             # Create new chunk with updated score
-            from simba.services.retrieval_service import RetrievedChunk
-
-            result.append(
-                RetrievedChunk(
-                    document_id=chunk.document_id,
-                    document_name=chunk.document_name,
-                    chunk_text=chunk.chunk_text,
-                    chunk_position=chunk.chunk_position,
-                    score=float(score),
-                )
-            )
+            result.append(replace(chunk, score=float(score)))
 
     return result
+
+
+def late_interaction_rerank(
+    query: str,
+    chunks: list["RetrievedChunk"],
+    top_k: int | None = None,
+) -> list["RetrievedChunk"]:
+    """Rerank chunks by MaxSim of late-interaction (ColBERT) token vectors.
+
+    Only the query is encoded here: chunk token vectors were stored at
+    ingestion and MaxSim is computed by the vector store, one call per
+    collection. Chunks without stored token vectors (ingested before the
+    collection's rerank mode needed them) keep their order after the scored ones.
+
+    Args:
+        query: The search query.
+        chunks: List of chunks to rerank (with point_id set).
+        top_k: Number of top results to return. Defaults to settings.reranker_top_k.
+
+    Returns:
+        Reranked list of chunks, sorted by relevance.
+    """
+    from simba.services import embedding_service, vector_store_service
+
+    if not chunks:
+        return []
+
+    top_k = top_k if top_k is not None else settings.reranker_top_k
+
+    with track_latency(LATE_INTERACTION_LATENCY):
+        query_vectors = embedding_service.get_late_interaction_query(query)
+
+        by_collection: dict[str, list[str]] = {}
+        for chunk in chunks:
+            if chunk.point_id:
+                by_collection.setdefault(chunk.collection_name, []).append(chunk.point_id)
+
+        scores: dict[tuple[str, str], float] = {}
+        for collection_name, ids in by_collection.items():
+            results = vector_store_service.late_interaction_rescore(
+                collection_name, query_vectors, ids, limit=len(ids)
+            )
+            scores.update({(collection_name, str(r["id"])): r["score"] for r in results})
+
+        scored = sorted(
+            (
+                replace(chunk, score=scores[(chunk.collection_name, chunk.point_id)])
+                for chunk in chunks
+                if (chunk.collection_name, chunk.point_id) in scores
+            ),
+            key=lambda chunk: chunk.score,
+            reverse=True,
+        )
+        unscored = [c for c in chunks if (c.collection_name, c.point_id) not in scores]
+        if unscored:
+            logger.info(
+                f"[Rerank] {len(unscored)} of {len(chunks)} chunks have no late-interaction "
+                "vectors, keeping their search order"
+            )
+
+    return (scored + unscored)[:top_k]
@@ -1,18 +1,43 @@
 """Retrieval service for RAG queries."""
 
+import hashlib
+import json
 import logging
+import threading
 import time
-from dataclasses import dataclass
-from typing import TypedDict
+import uuid
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict, dataclass, field, replace
+from functools import lru_cache
+from typing import Any, TypedDict, TypeVar
 
 from qdrant_client.http.exceptions import UnexpectedResponse
 
 from simba.core.config import settings
-from simba.services import embedding_service, qdrant_service
-from simba.services.metrics_service import RETRIEVAL_LATENCY, track_latency
+from simba.services import (
+    context_service,
+    embedding_service,
+    identifier_service,
+    language_service,
+    profile_service,
+    routing_service,
+    vector_store_service,
+)
+from simba.services.metrics_service import (
+    RETRIEVAL_COALESCED,
+    RETRIEVAL_LATENCY,
+    track_latency,
+)
+from simba.services.numpy_store_service import RRF_K, CollectionNotFoundError
 
 logger = logging.getLogger(__name__)
 
+_T = TypeVar("_T")
+
+# Joins expanded units that aren't adjacent in the document
+_GAP_MARKER = "\n[...]\n"
+
 
 class LatencyBreakdown(TypedDict, total=False):
     """Latency breakdown for retrieval operations."""
@@ -22,6 +47,18 @@ class LatencyBreakdown(TypedDict, total=False):
     search_ms: float
     rerank_ms: float
     total_ms: float
+    coalesced: bool  # True when served by an identical in-flight retrieval
+    query_language: str  # Detected query language (hybrid with language routing)
+    sparse_skipped: bool  # True when the sparse model doesn't support the query language
+    identifier_ms: float  # Full-text lookup of identifiers found in the query
+    identifier_hits: int  # Chunks containing a query identifier verbatim
+    expand_ms: float  # Fetching neighbors of small search units (small-to-big)
+    context_tokens: int  # Tokens in the assembled LLM context
+    context_tokens_saved: int  # Tokens saved by merging overlaps and the token budget
+    collection_count: int  # Collections searched (federated retrieval when > 1)
+    routed_documents: int  # Documents chunk search was restricted to (document routing)
+    rerank_candidates: int  # Chunks passed to the reranker
+    late_interaction_ms: float  # MaxSim rescoring (late_interaction/cascade rerank modes)
 
 
 @dataclass
@@ -33,92 +70,217 @@ class RetrievedChunk:
     chunk_text: str
     chunk_position: int
     score: float
+    collection_name: str = ""
+    start_char: int | None = None  # Character range in the source document
+    end_char: int | None = None
+    expand: bool = False  # Small search unit, expanded with its neighbors before returning
+    heading_path: list[str] = field(default_factory=list)  # Markdown section of the chunk
+    point_id: str = ""  # Vector store point ID (for late-interaction rescoring)
 
 
 def retrieve(
     query: str,
-    collection_name: str,
+    collection_name: str | list[str],
     limit: int | None = None,
     min_score: float | None = None,
     rerank: bool | None = None,
     hybrid: bool | None = None,
     return_latency: bool = False,
+    rerank_mode: str | None = None,
 ) -> list[RetrievedChunk] | tuple[list[RetrievedChunk], LatencyBreakdown]:
     """Retrieve relevant chunks for a query.
 
+    Identical concurrent calls (same query, collection and options) are coalesced:
+    only the first one runs embedding, search and rerank, the others wait for its
+    result. Set ``retrieval_coalesce_redis_url`` to coalesce across processes too.
+
+    Several collections are searched concurrently with one shared query
+    embedding; their results are merged into one pool that is reranked once.
+
+    Unset options come from the collection's profile (see profile_service),
+    which defaults to the global settings; with several collections, from the
+    first one's. Each collection's sparse leg uses its own sparse backend.
+
     Args:
         query: The search query.
-        collection_name: Name of the collection to search.
-        limit: Maximum number of results. Defaults to settings.retrieval_limit.
-        min_score: Minimum similarity score threshold. Defaults to settings.retrieval_min_score.
-        rerank: Whether to apply cross-encoder reranking. Defaults to settings.retrieval_rerank.
-        hybrid: Whether to use hybrid search (dense + sparse). Defaults to settings.retrieval_hybrid.
+        collection_name: Name of the collection to search, or a list of collections.
+        limit: Maximum number of results. Defaults to the profile's retrieval_limit.
+        min_score: Minimum similarity score threshold. Defaults to the profile's
+            retrieval_min_score.
+        rerank: Whether to apply cross-encoder reranking. Defaults to the profile's
+            retrieval_rerank.
+        hybrid: Whether to use hybrid search (dense + sparse). Defaults to the
+            profile's retrieval_hybrid.
         return_latency: Whether to return latency breakdown.
+        rerank_mode: "cross_encoder", "late_interaction" or "cascade". Defaults to
+            the profile's rerank_mode.
 
     Returns:
         List of retrieved chunks sorted by relevance.
         If return_latency=True, returns tuple of (chunks, latency_breakdown).
     """
-    # Use config defaults if not specified
-    limit = limit if limit is not None else settings.retrieval_limit
-    min_score = min_score if min_score is not None else settings.retrieval_min_score
-    rerank = rerank if rerank is not None else settings.retrieval_rerank
-    hybrid = hybrid if hybrid is not None else settings.retrieval_hybrid
+    collection_names = (
+        [collection_name]
+        if isinstance(collection_name, str)
+        else list(dict.fromkeys(collection_name))
+    )
+
+    # Use profile defaults if not specified
+    profile = profile_service.get_profile(collection_names[0])
+    limit = limit if limit is not None else profile.retrieval_limit
+    min_score = min_score if min_score is not None else profile.retrieval_min_score
+    rerank = rerank if rerank is not None else profile.retrieval_rerank
+    hybrid = hybrid if hybrid is not None else profile.retrieval_hybrid
+    rerank_mode = rerank_mode or profile.rerank_mode
 
+    def compute() -> tuple[list[RetrievedChunk], LatencyBreakdown]:
+        return _retrieve(query, collection_names, limit, min_score, rerank, hybrid, rerank_mode)
+
+    if settings.retrieval_coalesce:
+        key = (query, tuple(collection_names), limit, min_score, rerank, hybrid, rerank_mode)
+        chunks, latency = _coalesced(key, compute)
+    else:
+        chunks, latency = compute()
+
+    if return_latency:
+        return chunks, latency
+    return chunks
+
+
+def _retrieve(
+    query: str,
+    collection_names: list[str],
+    limit: int,
+    min_score: float,
+    rerank: bool,
+    hybrid: bool,
+    rerank_mode: str = "cross_encoder",
+) -> tuple[list[RetrievedChunk], LatencyBreakdown]:
+    """Run embedding, search and optional rerank for a query (uncoalesced)."""
     # Debug logging
     logger.info("[Retrieval] === Starting retrieval ===")
-    logger.info(f"[Retrieval] Collection: {collection_name}")
+    logger.info(f"[Retrieval] Collections: {', '.join(collection_names)}")
     logger.info(f"[Retrieval] Query: {query[:100]}...")
     logger.info(
-        f"[Retrieval] Settings: min_score={min_score}, limit={limit}, rerank={rerank}, hybrid={hybrid}"
+        f"[Retrieval] Settings: min_score={min_score}, limit={limit}, rerank={rerank} "
+        f"({rerank_mode}), hybrid={hybrid}"
     )
 
     latency: LatencyBreakdown = {}
+    if len(collection_names) > 1:
+        latency["collection_count"] = len(collection_names)
     total_start = time.perf_counter()
 
     with track_latency(RETRIEVAL_LATENCY):
+        # Exact identifier fast path (order numbers, SKUs, error codes)
+        exact_chunks: list[RetrievedChunk] = []
+        identifiers = (
+            identifier_service.extract_identifiers(query)
+            if settings.retrieval_identifier_lookup
+            else []
+        )
+        if identifiers:
+            lookup_start = time.perf_counter()
+            exact_chunks = _identifier_lookup(collection_names, identifiers, limit)
+            latency["identifier_ms"] = (time.perf_counter() - lookup_start) * 1000
+            latency["identifier_hits"] = len(exact_chunks)
+            logger.info(
+                f"[Retrieval] Identifiers {identifiers}: {len(exact_chunks)} exact hits "
+                f"in {latency['identifier_ms']:.1f}ms"
+            )
+
+            # Identifier-only query answered by the index: no embedding, search or rerank
+            if exact_chunks and identifier_service.is_identifier_lookup(query, identifiers):
+                exact_chunks = _expand_neighbors(exact_chunks, latency)
+                latency["total_ms"] = (time.perf_counter() - total_start) * 1000
+                return exact_chunks, latency
+
         # Generate dense query embedding
         embed_start = time.perf_counter()
         query_dense = embedding_service.get_embedding(query)
         latency["embedding_ms"] = (time.perf_counter() - embed_start) * 1000
         logger.info(f"[Retrieval] Generated embedding in {latency['embedding_ms']:.1f}ms")
 
-        # Generate sparse query embedding if hybrid search enabled
-        query_sparse = None
-        if hybrid:
-            sparse_start = time.perf_counter()
-            query_sparse = embedding_service.get_sparse_embedding(query)
+        # Generate sparse query embeddings (one per sparse backend of the collections)
+        # if hybrid search enabled, unless the sparse model doesn't support the
+        # query's language
+        profiles = {name: profile_service.get_profile(name) for name in collection_names}
+        backends = sorted({p.sparse_backend for p in profiles.values()}) if hybrid else []
+        query_sparse: dict[str, embedding_service.SparseEmbedding] = {}
+        sparse_language: dict[str, str | None] = {}
+        language = None
+        if backends and settings.retrieval_language_routing:
+            language = language_service.detect_language(query)
+            latency["query_language"] = language
+        sparse_start = time.perf_counter()
+        for backend in backends:
+            if language is not None and not language_service.sparse_supports(language, backend):
+                latency["sparse_skipped"] = True
+                logger.info(
+                    f"[Retrieval] Skipping {backend} sparse leg for query language '{language}'"
+                )
+                continue
+            query_sparse[backend] = embedding_service.get_sparse_embedding(query, backend=backend)
+            sparse_language[backend] = (
+                language_service.sparse_filter_language(language, backend) if language else None
+            )
+        if query_sparse:
             latency["sparse_embedding_ms"] = (time.perf_counter() - sparse_start) * 1000
 
         # Search Qdrant - fetch more results if reranking
-        search_limit = limit * 4 if rerank else limit
+        search_limit = profiles[collection_names[0]].search_limit(limit, rerank)
         logger.info(f"[Retrieval] Searching Qdrant with limit={search_limit}")
 
-        search_start = time.perf_counter()
-        try:
-            if hybrid:
-                results = qdrant_service.hybrid_search(
+        def search_collection(collection_name: str) -> tuple[list[dict[str, Any]], int | None]:
+            """Search a collection; also returns the number of routed documents."""
+            # Large collections: only search chunks of the closest documents
+            document_ids = routing_service.route(collection_name, query_dense)
+            routed = len(document_ids) if document_ids is not None else None
+            profile = profiles[collection_name]
+            # Rerank pool: at most rerank_group_size chunks per document
+            group_size = profile.rerank_group_size if rerank else None
+            if profile.sparse_backend in query_sparse:
+                results = vector_store_service.hybrid_search(
                     collection_name=collection_name,
                     query_dense=query_dense,
-                    query_sparse=query_sparse,
+                    query_sparse=query_sparse[profile.sparse_backend],
                     limit=search_limit,
+                    language=sparse_language[profile.sparse_backend],
+                    sparse_backend=profile.sparse_backend,
+                    document_ids=document_ids,
+                    group_size=group_size,
                 )
             else:
-                results = qdrant_service.search(
+                results = vector_store_service.search(
                     collection_name=collection_name,
                     query_vector=query_dense,
                     limit=search_limit,
+                    document_ids=document_ids,
+                    group_size=group_size,
                 )
-        except UnexpectedResponse as e:
-            # Collection doesn't exist
-            logger.error(f"[Retrieval] COLLECTION NOT FOUND: {collection_name}")
-            logger.error(f"[Retrieval] Error: {e}")
-            if return_latency:
-                latency["search_ms"] = (time.perf_counter() - search_start) * 1000
-                latency["total_ms"] = (time.perf_counter() - total_start) * 1000
-                return [], latency
-            return []
+            return results, routed
+
+        search_start = time.perf_counter()
+        ranked: list[list[dict[str, Any]]] = []
+        for collection_name, outcome in _fan_out(collection_names, search_collection).items():
+            if isinstance(outcome, UnexpectedResponse | CollectionNotFoundError):
+                # Collection doesn't exist
+                logger.error(f"[Retrieval] COLLECTION NOT FOUND: {collection_name}")
+                logger.error(f"[Retrieval] Error: {outcome}")
+                continue
+            hits, routed = outcome
+            # Summed here: the searches run in parallel threads
+            if routed is not None:
+                latency["routed_documents"] = latency.get("routed_documents", 0) + routed
+            ranked.append([{**hit, "collection": collection_name} for hit in hits])
         latency["search_ms"] = (time.perf_counter() - search_start) * 1000
+        if not ranked:
+            latency["total_ms"] = (time.perf_counter() - total_start) * 1000
+            return [], latency
+
+        # Merge collections by rank. The pool is capped at one collection's worth
+        # so reranking cost doesn't grow with the number of collections.
+        results = _fuse_collections(ranked, search_limit) if len(ranked) > 1 else ranked[0]
 
         # Log raw results from Qdrant
         logger.info(f"[Retrieval] Raw results from Qdrant: {len(results)}")
@@ -140,6 +302,12 @@ def retrieve(
                         chunk_text=payload.get("chunk_text", ""),
                         chunk_position=payload.get("chunk_position", 0),
                         score=result["score"],
+                        collection_name=result["collection"],
+                        start_char=payload.get("start_char"),
+                        end_char=payload.get("end_char"),
+                        expand=payload.get("chunk_unit") == "small",
+                        heading_path=payload.get("heading_path") or [],
+                        point_id=str(result["id"]),
                     )
                 )
             else:
@@ -149,19 +317,39 @@ def retrieve(
             f"[Retrieval] After min_score filter ({min_score}): {len(chunks)} kept, {filtered_count} filtered out"
         )
 
-        # Apply reranking if enabled
-        if rerank and chunks:
-            from simba.services.reranker_service import rerank_chunks
+        # Exact identifier matches go first and are not reranked
+        if exact_chunks:
+            exact_keys = {(c.document_id, c.chunk_position) for c in exact_chunks}
+            chunks = [c for c in chunks if (c.document_id, c.chunk_position) not in exact_keys]
+        vector_limit = limit - len(exact_chunks)
 
-            rerank_start = time.perf_counter()
-            chunks = rerank_chunks(query, chunks, top_k=limit)
-            latency["rerank_ms"] = (time.perf_counter() - rerank_start) * 1000
-        elif rerank:
+        # Apply reranking if enabled
+        if rerank and chunks and vector_limit > 0:
+            from simba.services.reranker_service import late_interaction_rerank, rerank_chunks
+
+            latency["rerank_candidates"] = len(chunks)
+            # Late interaction alone, or as a cheap first pass that only lets the
+            # best cascade_candidates through to the cross-encoder
+            if rerank_mode in ("late_interaction", "cascade"):
+                keep = vector_limit
+                if rerank_mode == "cascade":
+                    cascade = profiles[collection_names[0]].cascade_candidates
+                    keep = max(cascade, vector_limit)
+                late_start = time.perf_counter()
+                chunks = late_interaction_rerank(query, chunks, top_k=keep)
+                latency["late_interaction_ms"] = (time.perf_counter() - late_start) * 1000
+            if rerank_mode != "late_interaction":
+                rerank_start = time.perf_counter()
+                chunks = rerank_chunks(query, chunks, top_k=vector_limit)
+                latency["rerank_ms"] = (time.perf_counter() - rerank_start) * 1000
+        elif rerank and vector_limit > 0:
             # No chunks to rerank, just return empty
             pass
         else:
             # No reranking, truncate to limit
-            chunks = chunks[:limit]
+            chunks = chunks[:vector_limit]
+
+        chunks = _expand_neighbors(exact_chunks + chunks, latency)
 
     latency["total_ms"] = (time.perf_counter() - total_start) * 1000
 
@@ -169,50 +357,391 @@ def retrieve(
         f"[Retrieval] === Completed: returning {len(chunks)} chunks in {latency['total_ms']:.1f}ms ==="
     )
 
-    if return_latency:
-        return chunks, latency
-    return chunks
+    return chunks, latency
+
+
+def _fuse_collections(ranked: list[list[dict[str, Any]]], limit: int) -> list[dict[str, Any]]:
+    """Merge the ranked results of several collections with reciprocal rank fusion.
+
+    Raw scores don't compare across collections: a collection with a sparse leg
+    returns RRF scores, one without a cosine similarity. Results are ordered by
+    1 / (position + RRF_K) of their position in their own collection's list and keep
+    their original score, which min_score still applies to.
+    """
+    fused = [
+        (1.0 / (position + RRF_K), result)
+        for results in ranked
+        for position, result in enumerate(results)
+    ]
+    fused.sort(key=lambda item: item[0], reverse=True)
+    return [result for _, result in fused[:limit]]
+
+
+def _identifier_lookup(
+    collection_names: list[str], identifiers: list[str], limit: int
+) -> list[RetrievedChunk]:
+    """Look up identifiers in the full-text index, keeping verbatim matches only."""
+    # Over-fetch: the index matches tokens, not the identifier as written
+    outcomes = _fan_out(
+        collection_names,
+        lambda name: vector_store_service.text_search(name, identifiers, limit=limit * 4),
+    )
+
+    chunks = []
+    for collection_name, outcome in outcomes.items():
+        if isinstance(outcome, UnexpectedResponse | CollectionNotFoundError):
+            logger.warning(f"[Retrieval] Identifier lookup failed for {collection_name}: {outcome}")
+            continue
+        for result in outcome:
+            payload = result["payload"]
+            text = payload.get("chunk_text", "")
+            if any(identifier_service.contains_identifier(text, i) for i in identifiers):
+                chunks.append(
+                    RetrievedChunk(
+                        document_id=payload.get("document_id", ""),
+                        document_name=payload.get("document_name", ""),
+                        chunk_text=text,
+                        chunk_position=payload.get("chunk_position", 0),
+                        score=result["score"],
+                        collection_name=collection_name,
+                        start_char=payload.get("start_char"),
+                        end_char=payload.get("end_char"),
+                        expand=payload.get("chunk_unit") == "small",
+                        heading_path=payload.get("heading_path") or [],
+                    )
+                )
+    return chunks[:limit]
+
+
+def _expand_neighbors(
+    chunks: list[RetrievedChunk], latency: LatencyBreakdown
+) -> list[RetrievedChunk]:
+    """Replace small search units with passages including their neighboring units.
+
+    Fetches retrieval_expand_neighbors units on each side of every small hit,
+    with one request per collection. Hits of the same document whose windows
+    overlap become a single passage, ranked and scored as its best hit.
+    """
+    window = settings.retrieval_expand_neighbors
+    if window <= 0 or not any(chunk.expand for chunk in chunks):
+        return chunks
+
+    expand_start = time.perf_counter()
+
+    # One entry per output passage, in rank order: [chunk, first, last] for
+    # windows to expand, [chunk, None, None] for chunks returned as is
+    passages: list[list] = []
+    for chunk in chunks:
+        if not chunk.expand:
+            passages.append([chunk, None, None])
+            continue
+        first, last = max(chunk.chunk_position - window, 0), chunk.chunk_position + window
+        for passage in passages:
+            hit = passage[0]
+            if (
+                passage[1] is not None
+                and (hit.collection_name, hit.document_id)
+                == (chunk.collection_name, chunk.document_id)
+                and first <= passage[2] + 1
+                and last >= passage[1] - 1
+            ):
+                passage[1], passage[2] = min(first, passage[1]), max(last, passage[2])
+                break
+        else:
+            passages.append([chunk, first, last])
+
+    windows: dict[str, list[tuple[str, int, int]]] = {}
+    for hit, first, last in passages:
+        if first is not None:
+            windows.setdefault(hit.collection_name, []).append((hit.document_id, first, last))
+    outcomes = _fan_out(
+        list(windows), lambda name: vector_store_service.get_chunk_windows(name, windows[name])
+    )
+
+    units: dict[tuple[str, str], list[dict[str, Any]]] = {}
+    for collection_name, outcome in outcomes.items():
+        if isinstance(outcome, UnexpectedResponse | CollectionNotFoundError):
+            continue
+        for payload in outcome:
+            units.setdefault((collection_name, payload.get("document_id", "")), []).append(payload)
+
+    expanded = []
+    for hit, first, last in passages:
+        payloads = [
+            payload
+            for payload in units.get((hit.collection_name, hit.document_id), [])
+            if first is not None and first <= payload.get("chunk_position", 0) <= last
+        ]
+        if not payloads:
+            expanded.append(replace(hit, expand=False))
+            continue
+        payloads.sort(key=lambda payload: payload.get("chunk_position", 0))
+        expanded.append(
+            replace(
+                hit,
+                chunk_text=_join_units(payloads),
+                chunk_position=payloads[0].get("chunk_position", 0),
+                start_char=payloads[0].get("start_char"),
+                end_char=payloads[-1].get("end_char"),
+                expand=False,
+            )
+        )
+
+    latency["expand_ms"] = (time.perf_counter() - expand_start) * 1000
+    logger.info(
+        f"[Retrieval] Expanded {sum(c.expand for c in chunks)} small units into "
+        f"{len(expanded)} passages in {latency['expand_ms']:.1f}ms"
+    )
+    return expanded
+
+
+def _join_units(payloads: list[dict[str, Any]]) -> str:
+    """Join consecutive units of a document, dropping text they overlap on.
+
+    Units missing from the window (near-duplicates stored under another
+    document, see dedup_service) are marked with _GAP_MARKER.
+    """
+    text = ""
+    end = None
+    position = None
+    for payload in payloads:
+        unit = payload.get("chunk_text", "")
+        start = payload.get("start_char")
+        if not text:
+            text = unit
+        elif position is not None and payload.get("chunk_position", 0) > position + 1:
+            text += _GAP_MARKER + unit
+        elif end is not None and start is not None and start <= end:
+            # Contiguous or overlapping in the source text
+            text += unit[end - start :]
+        else:
+            text += " " + unit
+        end = payload.get("end_char")
+        position = payload.get("chunk_position", 0)
+    return text
+
+
+@lru_cache
+def _get_search_executor() -> ThreadPoolExecutor:
+    """Get the thread pool that runs per-collection searches concurrently."""
+    return ThreadPoolExecutor(
+        max_workers=settings.retrieval_federated_max_workers,
+        thread_name_prefix="simba-search",
+    )
+
+
+def _fan_out(
+    collection_names: list[str], search: Callable[[str], _T]
+) -> dict[str, _T | UnexpectedResponse | CollectionNotFoundError]:
+    """Run a search on each collection, concurrently when there are several.
+
+    Missing-collection errors are returned in place of that collection's
+    results so the others still count; any other error is raised.
+    """
+
+    def run(collection_name: str):
+        try:
+            return search(collection_name)
+        except (UnexpectedResponse, CollectionNotFoundError) as e:
+            return e
+
+    if len(collection_names) == 1:
+        return {collection_names[0]: run(collection_names[0])}
+    futures = {name: _get_search_executor().submit(run, name) for name in collection_names}
+    return {name: future.result() for name, future in futures.items()}
 
 
 def retrieve_formatted(
     query: str,
-    collection_name: str,
+    collection_name: str | list[str],
     limit: int | None = None,
     return_latency: bool = False,
 ) -> str | tuple[str, LatencyBreakdown]:
     """Retrieve and format chunks as context for LLM.
 
+    Overlapping chunks are merged and the context is packed into
+    settings.context_token_budget (see context_service.assemble_context).
+
     Args:
         query: The search query.
-        collection_name: Name of the collection to search.
-        limit: Maximum number of results. Defaults to settings.retrieval_limit.
+        collection_name: Name of the collection to search, or a list of collections.
+        limit: Maximum number of results. Defaults to the profile's retrieval_limit.
         return_latency: Whether to return latency breakdown.
 
     Returns:
         Formatted string with retrieved context.
         If return_latency=True, returns tuple of (formatted_context, latency_breakdown).
     """
-    result = retrieve(query, collection_name, limit=limit, return_latency=return_latency)
+    chunks, latency = retrieve(query, collection_name, limit=limit, return_latency=True)
+
+    context = context_service.assemble_context(chunks)
+    latency = {
+        **latency,
+        "context_tokens": context.tokens,
+        "context_tokens_saved": context.saved_tokens,
+    }
 
     if return_latency:
-        chunks, latency = result
-    else:
-        chunks = result
-        latency = {}
+        return context.text, latency
+    return context.text
 
-    if not chunks:
-        output = "No relevant information found in the knowledge base."
-        if return_latency:
-            return output, latency
-        return output
 
-    # Format chunks as context
-    context_parts = []
-    for i, chunk in enumerate(chunks, 1):
-        context_parts.append(f"[Source {i}: {chunk.document_name}]\n{chunk.chunk_text}")
+# --- Request coalescing (singleflight) ---
 
-    output = "\n\n---\n\n".join(context_parts)
 
-    if return_latency:
-        return output, latency
-    return output
+@dataclass
+class _InFlight:
+    """A retrieval currently being computed by one caller, awaited by others."""
+
+    done: threading.Event = field(default_factory=threading.Event)
+    result: tuple[list[RetrievedChunk], LatencyBreakdown] | None = None
+    error: BaseException | None = None
+
+
+_inflight: dict[tuple, _InFlight] = {}
+_inflight_lock = threading.Lock()
+
+
+def _coalesced(
+    key: tuple,
+    compute: Callable[[], tuple[list[RetrievedChunk], LatencyBreakdown]],
+) -> tuple[list[RetrievedChunk], LatencyBreakdown]:
+    """Run compute once per key among concurrent callers in this process.
+
+    The first caller for a key becomes the leader and runs the computation
+    (through the Redis lock if configured); concurrent callers with the same
+    key block until the leader finishes and receive a copy of its result.
+    """
+    with _inflight_lock:
+        flight = _inflight.get(key)
+        is_leader = flight is None
+        if is_leader:
+            flight = _InFlight()
+            _inflight[key] = flight
+
+    if not is_leader:
+        RETRIEVAL_COALESCED.labels(scope="local").inc()
+        wait_start = time.perf_counter()
+        flight.done.wait()
+        if flight.error is not None:
+            raise flight.error
+        return _shared_copy(flight.result, time.perf_counter() - wait_start)
+
+    try:
+        if settings.retrieval_coalesce_redis_url:
+            flight.result = _redis_coalesced(key, compute)
+        else:
+            flight.result = compute()
+        return flight.result
+    except BaseException as e:
+        flight.error = e
+        raise
+    finally:
+        with _inflight_lock:
+            _inflight.pop(key, None)
+        flight.done.set()
+
+
+def _shared_copy(
+    result: tuple[list[RetrievedChunk], LatencyBreakdown], waited_s: float
+) -> tuple[list[RetrievedChunk], LatencyBreakdown]:
+    """Copy a shared result for a waiter, reporting its own wait as total latency."""
+    chunks, latency = result
+    waiter_latency: LatencyBreakdown = {**latency}
+    waiter_latency["total_ms"] = waited_s * 1000
+    waiter_latency["coalesced"] = True
+    return list(chunks), waiter_latency
+
+
+@lru_cache
+def _get_redis_client():
+    """Get cached Redis client used for cross-process coalescing."""
+    import redis
+
+    return redis.Redis.from_url(settings.retrieval_coalesce_redis_url)
+
+
+# Compare-and-delete: release the lock only if it still holds the caller's token
+_RELEASE_LOCK_SCRIPT = """
+if redis.call("get", KEYS[1]) == ARGV[1] then
+    return redis.call("del", KEYS[1])
+end
+return 0
+"""
+
+
+def _redis_coalesced(
+    key: tuple,
+    compute: Callable[[], tuple[list[RetrievedChunk], LatencyBreakdown]],
+) -> tuple[list[RetrievedChunk], LatencyBreakdown]:
+    """Coalesce a retrieval across processes using a Redis lock.
+
+    The process that acquires the lock computes the result and publishes it
+    under a short-lived key; other processes poll for that key until the lock
+    expires, then compute themselves. Any Redis failure falls back to compute().
+    """
+    digest = hashlib.sha1(json.dumps(key).encode()).hexdigest()
+    lock_key = f"simba:retrieval:lock:{digest}"
+    result_key = f"simba:retrieval:result:{digest}"
+
+    # Per-leader token: a leader whose lock expired must not release its successor's
+    token = uuid.uuid4().hex
+    try:
+        client = _get_redis_client()
+        acquired = client.set(lock_key, token, nx=True, px=settings.retrieval_coalesce_lock_ttl_ms)
+    except Exception as e:
+        logger.warning(f"[Retrieval] Redis coalescing unavailable, computing locally: {e}")
+        return compute()
+
+    if acquired:
+        try:
+            result = compute()
+            try:
+                client.set(
+                    result_key,
+                    _serialize_result(result),
+                    px=settings.retrieval_coalesce_result_ttl_ms,
+                )
+            except Exception as e:
+                logger.warning(f"[Retrieval] Failed to publish coalesced result: {e}")
+            return result
+        finally:
+            try:
+                client.eval(_RELEASE_LOCK_SCRIPT, 1, lock_key, token)
+            except Exception:
+                pass
+
+    # Another process is computing: wait for its result while it holds the lock
+    wait_start = time.perf_counter()
+    try:
+        while True:
+            payload = client.get(result_key)
+            if payload is not None:
+                RETRIEVAL_COALESCED.labels(scope="redis").inc()
+                return _shared_copy(_deserialize_result(payload), time.perf_counter() - wait_start)
+            if not client.exists(lock_key):
+                # Leader finished without publishing (error) or the lock expired
+                payload = client.get(result_key)
+                if payload is not None:
+                    RETRIEVAL_COALESCED.labels(scope="redis").inc()
+                    return _shared_copy(
+                        _deserialize_result(payload), time.perf_counter() - wait_start
+                    )
+                break
+            time.sleep(0.01)
+    except Exception as e:
+        logger.warning(f"[Retrieval] Redis coalescing failed while waiting: {e}")
+
+    return compute()
+
+
+def _serialize_result(result: tuple[list[RetrievedChunk], LatencyBreakdown]) -> bytes:
+    """Serialize a retrieval result for sharing through Redis."""
+    chunks, latency = result
+    return json.dumps({"chunks": [asdict(c) for c in chunks], "latency": latency}).encode()
+
+
+def _deserialize_result(payload: bytes) -> tuple[list[RetrievedChunk], LatencyBreakdown]:
+    """Deserialize a retrieval result published by another process."""
+    data = json.loads(payload)
+    return [RetrievedChunk(**c) for c in data["chunks"]], data["latency"]
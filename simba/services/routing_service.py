@@ -0,0 +1,178 @@
+"""Document-level routing for large collections.
+
+Each ingested document gets one summary vector, the normalized mean of its
+chunk embeddings, stored in a companion collection ("{collection}__documents")
+with one point per document. For collections with at least
+retrieval_routing_min_documents documents, retrieval first picks the
+retrieval_routing_documents closest documents there, then searches only their
+chunks (document_id payload index), including the near-duplicate chunks they
+share with other documents (see dedup_service). Search and rerank work then
+depend on the number of routed documents rather than on the size of the
+collection.
+"""
+
+import logging
+import threading
+import time
+
+import numpy as np
+
+from simba.core.config import settings
+from simba.services import vector_store_service
+
+logger = logging.getLogger(__name__)
+
+SUMMARY_SUFFIX = "__documents"
+
+# collection name -> (monotonic time counted, documents in the companion collection)
+_document_counts: dict[str, tuple[float, int]] = {}
+_document_counts_lock = threading.Lock()
+
+
+def summary_collection_name(collection_name: str) -> str:
+    """Name of the companion collection holding a collection's document vectors."""
+    return f"{collection_name}{SUMMARY_SUFFIX}"
+
+
+def summary_vector(embeddings: np.ndarray) -> np.ndarray:
+    """Summary vector of a document: the normalized mean of its chunk embeddings."""
+    mean = np.asarray(embeddings, dtype=np.float32).mean(axis=0)
+    norm = np.linalg.norm(mean)
+    return mean / norm if norm > 0 else mean
+
+
+def upsert_document_summary(
+    collection_name: str,
+    document_id: str,
+    document_name: str,
+    embeddings: np.ndarray,
+) -> None:
+    """Store (or replace) a document's summary vector.
+
+    Args:
+        collection_name: Name of the chunk collection.
+        document_id: ID of the document (also the point ID).
+        document_name: Name of the document.
+        embeddings: Dense embeddings of the document's chunks.
+    """
+    if len(embeddings) == 0:
+        return
+    summaries = summary_collection_name(collection_name)
+    vector_store_service.create_collection(
+        summaries, with_sparse=False, with_late_interaction=False
+    )
+    vector_store_service.upsert_vectors(
+        summaries,
+        ids=[document_id],
+        vectors=summary_vector(embeddings)[None, :],
+        payloads=[
+            {
+                "document_id": document_id,
+                "document_name": document_name,
+                "chunk_count": len(embeddings),
+            }
+        ],
+    )
+
+
+def delete_document_summary(collection_name: str, document_id: str) -> None:
+    """Delete a document's summary vector, if any."""
+    summaries = summary_collection_name(collection_name)
+    if vector_store_service.collection_exists(summaries):
+        vector_store_service.delete_by_document_id(summaries, document_id)
+
+
+def _document_count(collection_name: str) -> int:
+    """Documents with a summary vector, cached for qdrant_search_params_ttl_seconds."""
+    now = time.monotonic()
+    with _document_counts_lock:
+        cached = _document_counts.get(collection_name)
+    if cached is not None and now - cached[0] < settings.qdrant_search_params_ttl_seconds:
+        return cached[1]
+
+    summaries = summary_collection_name(collection_name)
+    try:
+        count = (
+            vector_store_service.count_points(summaries)
+            if vector_store_service.collection_exists(summaries)
+            else 0
+        )
+    except Exception as e:
+        logger.warning(f"[Routing] Could not count documents of {collection_name}: {e}")
+        count = 0
+
+    with _document_counts_lock:
+        _document_counts[collection_name] = (now, count)
+    return count
+
+
+def route(collection_name: str, query_vector: np.ndarray) -> list[str] | None:
+    """Pick the documents of a collection whose chunks should be searched.
+
+    Args:
+        collection_name: Name of the chunk collection.
+        query_vector: Dense query embedding.
+
+    Returns:
+        IDs of the closest documents, or None to search the whole collection
+        (routing disabled, or fewer than retrieval_routing_min_documents documents).
+    """
+    if not settings.retrieval_document_routing:
+        return None
+    if _document_count(collection_name) < settings.retrieval_routing_min_documents:
+        return None
+
+    results = vector_store_service.search(
+        summary_collection_name(collection_name),
+        query_vector,
+        limit=settings.retrieval_routing_documents,
+    )
+    return [result["payload"]["document_id"] for result in results]
+
+
+def rebuild_summaries(collection_name: str) -> int:
+    """Recompute the summary vectors of every document from its stored chunk vectors.
+
+    Used to enable routing on collections ingested before summaries existed.
+
+    Args:
+        collection_name: Name of the chunk collection.
+
+    Returns:
+        Number of documents summarized.
+    """
+    from simba.services import numpy_store_service, qdrant_service
+
+    source = numpy_store_service if settings.vector_store_backend == "numpy" else qdrant_service
+    sums: dict[str, np.ndarray] = {}
+    counts: dict[str, int] = {}
+    names: dict[str, str] = {}
+    for _, dense, _, payloads in source.iter_points(collection_name):
+        for vector, payload in zip(dense, payloads):
+            document_id = payload.get("document_id")
+            if not document_id:
+                continue
+            sums[document_id] = sums.get(document_id, 0) + vector
+            counts[document_id] = counts.get(document_id, 0) + 1
+            names[document_id] = payload.get("document_name", "")
+
+    summaries = summary_collection_name(collection_name)
+    if vector_store_service.collection_exists(summaries):
+        vector_store_service.delete_collection(summaries)
+    vector_store_service.create_collection(
+        summaries, with_sparse=False, with_late_interaction=False
+    )
+    if sums:
+        ids = list(sums)
+        vector_store_service.upsert_vectors(
+            summaries,
+            ids=ids,
+            vectors=np.stack([summary_vector(sums[i][None, :]) for i in ids]),
+            payloads=[
+                {"document_id": i, "document_name": names[i], "chunk_count": counts[i]} for i in ids
+            ],
+        )
+    with _document_counts_lock:
+        _document_counts.pop(collection_name, None)
+    logger.info(f"[Routing] Rebuilt {len(sums)} document summaries for {collection_name}")
+    return len(sums)
@@ -0,0 +1,323 @@
+"""Vector store facade over Qdrant and the in-process NumPy store.
+
+Callers use these functions instead of qdrant_service directly; the backend
+is chosen by settings.vector_store_backend:
+
+- "qdrant": every operation goes to Qdrant.
+- "numpy": every operation goes to numpy_store_service (no Qdrant needed).
+- "auto": Qdrant is the source of truth and receives every write. Collections
+  with at most vector_store_auto_max_points points also get a NumPy mirror,
+  kept in sync on write and rebuilt from Qdrant when missing or out of sync;
+  reads are served from the mirror when it exists.
+"""
+
+import logging
+from collections.abc import Callable
+from types import ModuleType
+from typing import TYPE_CHECKING, Any
+
+import numpy as np
+
+from simba.core.config import settings
+from simba.services import numpy_store_service, qdrant_service
+
+if TYPE_CHECKING:
+    from simba.services.embedding_service import SparseEmbedding
+
+logger = logging.getLogger(__name__)
+
+
+def _reader(collection_name: str) -> ModuleType:
+    """Backend module that serves reads for a collection."""
+    backend = settings.vector_store_backend
+    if backend == "numpy":
+        return numpy_store_service
+    if backend == "auto" and numpy_store_service.collection_exists(collection_name):
+        return numpy_store_service
+    return qdrant_service
+
+
+# --- Collections ---
+
+
+def create_collection(
+    collection_name: str, with_sparse: bool = True, with_late_interaction: bool = True
+) -> None:
+    """Create a collection if it doesn't exist (see qdrant_service.create_collection)."""
+    backend = settings.vector_store_backend
+    if backend == "numpy":
+        numpy_store_service.create_collection(collection_name, with_sparse, with_late_interaction)
+        return
+
+    existed = backend == "auto" and qdrant_service.collection_exists(collection_name)
+    qdrant_service.create_collection(collection_name, with_sparse, with_late_interaction)
+    # A new collection starts small: mirror it from the first write on
+    if backend == "auto" and not existed:
+        numpy_store_service.create_collection(collection_name, with_sparse)
+
+
+def delete_collection(collection_name: str) -> None:
+    """Delete a collection from every backend that has it."""
+    if settings.vector_store_backend != "numpy":
+        qdrant_service.delete_collection(collection_name)
+    if numpy_store_service.collection_exists(collection_name):
+        numpy_store_service.delete_collection(collection_name)
+
+
+def collection_exists(collection_name: str) -> bool:
+    """Check if a collection exists in the source-of-truth backend."""
+    if settings.vector_store_backend == "numpy":
+        return numpy_store_service.collection_exists(collection_name)
+    return qdrant_service.collection_exists(collection_name)
+
+
+def get_collection_info(collection_name: str) -> dict[str, Any]:
+    """Get information about a collection from the source-of-truth backend."""
+    if settings.vector_store_backend == "numpy":
+        return numpy_store_service.get_collection_info(collection_name)
+    return qdrant_service.get_collection_info(collection_name)
+
+
+def count_points(collection_name: str) -> int:
+    """Exact number of points in a collection."""
+    return _reader(collection_name).count_points(collection_name)
+
+
+# --- Writes ---
+
+
+def upsert_vectors(
+    collection_name: str,
+    ids: list[str],
+    vectors: np.ndarray,
+    payloads: list[dict[str, Any]],
+    sparse_vectors: list["SparseEmbedding"] | None = None,
+    sparse_backend: str | None = None,
+    multivectors: list[np.ndarray] | None = None,
+) -> None:
+    """Insert or update vectors (see qdrant_service.upsert_vectors).
+
+    NumPy mirrors ("auto" mode) don't keep late-interaction vectors; rescoring
+    always reads them from Qdrant.
+    """
+    sparse_name = qdrant_service.sparse_vector_name(sparse_backend)
+    if settings.vector_store_backend == "numpy":
+        numpy_store_service.upsert_vectors(
+            collection_name, ids, vectors, payloads, sparse_vectors, sparse_name, multivectors
+        )
+        return
+
+    qdrant_service.upsert_vectors(
+        collection_name, ids, vectors, payloads, sparse_vectors, sparse_backend, multivectors
+    )
+    if settings.vector_store_backend == "auto":
+        _sync_mirror(
+            collection_name,
+            lambda: numpy_store_service.upsert_vectors(
+                collection_name, ids, vectors, payloads, sparse_vectors, sparse_name
+            ),
+        )
+
+
+def delete_by_document_id(collection_name: str, document_id: str) -> None:
+    """Delete all vectors of a document from every backend that has them."""
+    if settings.vector_store_backend != "numpy":
+        qdrant_service.delete_by_document_id(collection_name, document_id)
+    if numpy_store_service.collection_exists(collection_name):
+        numpy_store_service.delete_by_document_id(collection_name, document_id)
+
+
+def delete_points(collection_name: str, ids: list[str]) -> None:
+    """Delete points by ID from every backend that has them."""
+    if settings.vector_store_backend != "numpy":
+        qdrant_service.delete_points(collection_name, ids)
+    if numpy_store_service.collection_exists(collection_name):
+        numpy_store_service.delete_points(collection_name, ids)
+
+
+def set_payloads(collection_name: str, payloads: dict[str, dict[str, Any]]) -> None:
+    """Overwrite payload fields of points in every backend that has them."""
+    if settings.vector_store_backend != "numpy":
+        qdrant_service.set_payloads(collection_name, payloads)
+    if numpy_store_service.collection_exists(collection_name):
+        numpy_store_service.set_payloads(collection_name, payloads)
+
+
+def _sync_mirror(collection_name: str, apply: Callable[[], None]) -> None:
+    """Apply a write to a collection's NumPy mirror, or create/drop the mirror.
+
+    Drops the mirror once the collection outgrows vector_store_auto_max_points,
+    and rebuilds it from Qdrant if it is missing or its size disagrees.
+    """
+    count = qdrant_service.count_points(collection_name)
+    if count > settings.vector_store_auto_max_points:
+        if numpy_store_service.collection_exists(collection_name):
+            logger.info(
+                f"[VectorStore] {collection_name} has {count} points, "
+                "dropping NumPy mirror (searches go to Qdrant)"
+            )
+            numpy_store_service.delete_collection(collection_name)
+        return
+
+    if numpy_store_service.collection_exists(collection_name):
+        apply()
+        if numpy_store_service.count_points(collection_name) == count:
+            return
+        logger.warning(f"[VectorStore] NumPy mirror of {collection_name} out of sync")
+
+    rebuild_numpy_store(collection_name)
+
+
+def rebuild_numpy_store(collection_name: str, reembed: bool = False) -> int:
+    """Rebuild a collection in the NumPy store from its chunk payloads.
+
+    In "qdrant"/"auto" mode the points come from Qdrant; in "numpy" mode from
+    the NumPy store itself, which is then always re-embedded.
+
+    Args:
+        collection_name: Name of the collection.
+        reembed: Recompute dense and sparse vectors (and, in "numpy" mode, the
+            late-interaction vectors the collection's rerank mode needs) from each
+            payload's chunk_text (e.g. after changing the embedding model) instead
+            of copying them.
+
+    Returns:
+        Number of points in the rebuilt collection.
+    """
+    from simba.services import embedding_service, profile_service
+
+    source = qdrant_service
+    if settings.vector_store_backend == "numpy":
+        source, reembed = numpy_store_service, True
+
+    ids: list[str] = []
+    payloads: list[dict[str, Any]] = []
+    dense_batches: list[np.ndarray] = []
+    sparse: dict[str, list[SparseEmbedding]] = {}
+    multivectors: list[np.ndarray] | None = None
+
+    profile = profile_service.get_profile(collection_name)
+    for batch_ids, batch_dense, batch_sparse, batch_payloads in source.iter_points(collection_name):
+        if reembed:
+            texts = [payload.get("chunk_text", "") for payload in batch_payloads]
+            batch_dense = embedding_service.get_embeddings(texts)
+            backend = profile.sparse_backend
+            batch_sparse = {
+                qdrant_service.sparse_vector_name(backend): embedding_service.get_sparse_embeddings(
+                    texts, backend=backend
+                )
+            }
+            # Only the NumPy backend keeps token vectors (mirrors rescore in Qdrant)
+            if profile.late_interaction and settings.vector_store_backend == "numpy":
+                multivectors = multivectors or []
+                multivectors.extend(embedding_service.get_late_interaction_embeddings(texts))
+        ids.extend(batch_ids)
+        payloads.extend(batch_payloads)
+        dense_batches.append(batch_dense)
+        for name, rows in batch_sparse.items():
+            sparse.setdefault(name, []).extend(rows)
+
+    dense = (
+        np.concatenate(dense_batches)
+        if dense_batches
+        else np.empty((0, settings.embedding_dimensions), dtype=np.float32)
+    )
+    numpy_store_service.replace_collection(
+        collection_name, ids, dense, payloads, sparse, multivectors
+    )
+    logger.info(f"[VectorStore] Rebuilt NumPy store for {collection_name}: {len(ids)} points")
+    return len(ids)
+
+
+# --- Reads ---
+
+
+def search(
+    collection_name: str,
+    query_vector: np.ndarray,
+    limit: int = 5,
+    document_id: str | None = None,
+    document_ids: list[str] | None = None,
+    group_size: int | None = None,
+) -> list[dict[str, Any]]:
+    """Dense search (see qdrant_service.search)."""
+    return _reader(collection_name).search(
+        collection_name,
+        query_vector,
+        limit,
+        document_id,
+        document_ids=document_ids,
+        group_size=group_size,
+    )
+
+
+def hybrid_search(
+    collection_name: str,
+    query_dense: np.ndarray,
+    query_sparse: "SparseEmbedding | None" = None,
+    limit: int = 5,
+    document_id: str | None = None,
+    language: str | None = None,
+    sparse_backend: str | None = None,
+    document_ids: list[str] | None = None,
+    group_size: int | None = None,
+) -> list[dict[str, Any]]:
+    """Hybrid dense + sparse search (see qdrant_service.hybrid_search)."""
+    return _reader(collection_name).hybrid_search(
+        collection_name,
+        query_dense,
+        query_sparse,
+        limit,
+        document_id,
+        language,
+        sparse_backend,
+        document_ids,
+        group_size,
+    )
+
+
+def late_interaction_rescore(
+    collection_name: str, query_multivector: np.ndarray, ids: list[str], limit: int
+) -> list[dict[str, Any]]:
+    """MaxSim rescoring of candidates (see qdrant_service.late_interaction_rescore).
+
+    Served by the source-of-truth backend: NumPy mirrors have no token vectors.
+    """
+    source = numpy_store_service if settings.vector_store_backend == "numpy" else qdrant_service
+    return source.late_interaction_rescore(collection_name, query_multivector, ids, limit)
+
+
+def text_search(collection_name: str, terms: list[str], limit: int = 5) -> list[dict[str, Any]]:
+    """Full-text lookup (see qdrant_service.text_search)."""
+    return _reader(collection_name).text_search(collection_name, terms, limit)
+
+
+def get_chunk_windows(
+    collection_name: str, windows: list[tuple[str, int, int]]
+) -> list[dict[str, Any]]:
+    """Get chunks by position ranges (see qdrant_service.get_chunk_windows)."""
+    return _reader(collection_name).get_chunk_windows(collection_name, windows)
+
+
+def lsh_candidates(
+    collection_name: str, band_keys: list[str], exclude_document_id: str | None = None
+) -> list[dict[str, Any]]:
+    """Find near-duplicate candidates (see qdrant_service.lsh_candidates)."""
+    return _reader(collection_name).lsh_candidates(collection_name, band_keys, exclude_document_id)
+
+
+def shared_points(collection_name: str, document_id: str) -> list[dict[str, Any]]:
+    """Find points a document shares with others (see qdrant_service.shared_points)."""
+    return _reader(collection_name).shared_points(collection_name, document_id)
+
+
+def get_document_chunks(
+    collection_name: str, document_id: str, limit: int = 100
+) -> list[dict[str, Any]]:
+    """Get all chunks for a document (see qdrant_service.get_document_chunks)."""
+    return _reader(collection_name).get_document_chunks(collection_name, document_id, limit)
+
+
+def sample_chunks(collection_name: str, limit: int = 50) -> list[dict[str, Any]]:
+    """Get up to `limit` chunk payloads (see qdrant_service.sample_chunks)."""
+    return _reader(collection_name).sample_chunks(collection_name, limit)
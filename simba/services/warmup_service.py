@@ -0,0 +1,115 @@
+"""Model preloading and warmup.
+
+Models are otherwise loaded lazily on first use in each process. This module
+loads them ahead of time:
+
+- preload_models() runs in the parent process before workers fork
+  (gunicorn --preload, Celery worker_init), so children share the model
+  weights copy-on-write instead of each loading a private copy.
+- warmup() runs one inference per model in each serving process, after fork,
+  so thread pools and lazy allocations are in place before real traffic.
+  /health/ready reports not-ready until it has completed.
+"""
+
+import logging
+import threading
+import time
+
+from simba.core.config import settings
+from simba.services import inference_client
+
+logger = logging.getLogger(__name__)
+
+_ready = threading.Event()
+
+
+def _uses_splade() -> bool:
+    """Whether this process is expected to run the SPLADE model.
+
+    Ingestion workers encode every chunk with it; API processes only encode
+    queries, and only for hybrid search. Collections whose profile enables
+    hybrid search or SPLADE against the defaults load it lazily.
+    """
+    if settings.retrieval_sparse_backend != "splade":
+        return False
+    return settings.process_role == "worker" or settings.retrieval_hybrid
+
+
+def preload_models() -> None:
+    """Load embedding, sparse, reranker and parser models into this process.
+
+    Models served by the inference server are not loaded locally, nor is the
+    SPLADE model where this process won't use it (see _uses_splade).
+    Failures are logged, not raised: a model that cannot load here will be
+    retried lazily on first use.
+    """
+    from simba.services import embedding_service, parser_service, reranker_service
+
+    start = time.perf_counter()
+    loaders = [("parser", parser_service.preload)]
+    if not inference_client.is_enabled():
+        loaders = [
+            ("embedding", embedding_service.get_embedding_model),
+            ("reranker", reranker_service.get_reranker),
+            *loaders,
+        ]
+        # The BM25 backend has no model to load
+        if _uses_splade():
+            loaders.insert(1, ("sparse", embedding_service.get_sparse_embedding_model))
+        if settings.retrieval_rerank_mode != "cross_encoder":
+            loaders.append(("late_interaction", embedding_service.get_late_interaction_model))
+
+    for name, load in loaders:
+        try:
+            load()
+        except Exception as e:
+            logger.warning(f"[Warmup] Failed to preload {name} model: {e}")
+
+    logger.info(f"[Warmup] Preloaded models in {(time.perf_counter() - start) * 1000:.0f}ms")
+
+
+def warmup() -> None:
+    """Run one inference per model, then mark this process ready.
+
+    The process is marked ready even if a model fails, so a broken optional
+    model cannot keep it out of the load balancer forever; errors are logged.
+    """
+    from simba.services import embedding_service, reranker_service
+    from simba.services.retrieval_service import RetrievedChunk
+
+    start = time.perf_counter()
+    text = "warmup"
+    steps = [
+        ("embedding", lambda: embedding_service.get_embeddings([text])),
+        (
+            "reranker",
+            lambda: reranker_service.rerank_chunks(
+                text, [RetrievedChunk("", "", text, 0, 0.0)], top_k=1
+            ),
+        ),
+    ]
+    if _uses_splade():
+        steps.insert(1, ("sparse", lambda: embedding_service.get_sparse_embeddings([text])))
+    if settings.retrieval_rerank_mode != "cross_encoder":
+        steps.append(
+            ("late_interaction", lambda: embedding_service.get_late_interaction_query(text))
+        )
+
+    for name, run in steps:
+        try:
+            run()
+        except Exception as e:
+            logger.warning(f"[Warmup] {name} warmup inference failed: {e}")
+
+    logger.info(f"[Warmup] Warmup completed in {(time.perf_counter() - start) * 1000:.0f}ms")
+    _ready.set()
+
+
+def mark_ready() -> None:
+    """Mark this process ready without running warmup."""
+    _ready.set()
+
+
+def is_ready() -> bool:
+    """Return True once warmup has completed in this process."""
+    return _ready.is_set()